@@ -0,0 +1,241 @@
+"""Atualização incremental das métricas do dashboard.
+
+Mantém, ao lado do arquivo de saída, o estado de agregação mergeável de
+`gerar_dados_dashboard` (acumuladores por agente, departamento e dia) e um
+índice com a contribuição de cada ticket já contado, em um banco SQLite.
+Um lote de tickets novos ou alterados (ex.: um ticket existente que passou
+de "Aberto" para "Resolvido") é incorporado retirando a contribuição antiga
+e somando a nova, então o custo de uma atualização depende do tamanho do
+lote e não do histórico. As métricas atualizadas são gravadas no layout
+por seções (DIRETORIO_SECOES), lido por `exemplo_visualizacoes`.
+
+O período dos dados (`metadata.periodo_dados`) também fica no estado e é
+ampliado quando um lote traz tickets de dias fora dele, para que volumes
+diário/mensal e médias diárias cubram todos os tickets contados.
+
+Uso:
+    python atualizacao_incremental.py --inicializar   # estado a partir do JSON completo
+    python atualizacao_incremental.py lote1.json [lote2.json ...]
+    python atualizacao_incremental.py --diretorio-saida saida/ lote1.json
+"""
+import argparse
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import gerar_dados_dashboard as gerador
+from gerar_dados_dashboard import (
+    atualizar_estado_agregacao, chave_dia, gravar_secoes, metricas_do_estado, montar_configuracao,
+    montar_metadata, novo_estado_agregacao, periodo_de_metadata
+)
+from serializacao_json import carregar_json, ler_ndjson, localizar
+
+# Campos do ticket que entram nos acumuladores (gravados no índice de tickets)
+CAMPOS_CONTRIBUICAO = (
+    "agente_id", "departamento", "data_criacao", "canal", "prioridade", "status",
+    "interacoes", "reaberto", "tempo_primeira_resposta_minutos",
+    "tempo_resolucao_minutos", "satisfacao_cliente", "sla_cumprido"
+)
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS acumuladores (
+    grupo TEXT NOT NULL, chave TEXT NOT NULL, acumulador TEXT NOT NULL,
+    PRIMARY KEY (grupo, chave)
+);
+CREATE TABLE IF NOT EXISTS tickets (id TEXT PRIMARY KEY, contribuicao TEXT NOT NULL);
+"""
+
+# Máximo de parâmetros por consulta "IN (...)" ao buscar tickets já contados
+TAMANHO_CONSULTA = 500
+
+def caminho_estado(arquivo_saida=None):
+    """Caminho do estado incremental ao lado do arquivo de saída"""
+    arquivo_saida = arquivo_saida or gerador.ARQUIVO_SAIDA
+    return os.path.splitext(arquivo_saida)[0] + ".estado.sqlite"
+
+def contribuicao(t):
+    """Campos de um ticket que determinam sua contribuição às métricas"""
+    return {campo: t[campo] for campo in CAMPOS_CONTRIBUICAO}
+
+class EstadoIncremental:
+    """Estado de agregação persistido e índice de contribuições por ticket"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._con = sqlite3.connect(caminho)
+        self._con.executescript(ESQUEMA)
+        self.agentes = self._ler_meta("agentes", [])
+        self.estado = novo_estado_agregacao()
+        for grupo, chave, acumulador in self._con.execute("SELECT grupo, chave, acumulador FROM acumuladores"):
+            self.estado[grupo][chave] = json.loads(acumulador)
+        # Período (início, fim) dos dados; estados sem ele usam os dias já contados
+        periodo = self._ler_meta("periodo")
+        self.periodo = periodo_de_metadata({"periodo_dados": periodo}) if periodo else None
+        if self.periodo is None:
+            self.estender_periodo(self.estado["dia"])
+
+    @classmethod
+    def novo(cls, caminho):
+        """Cria um estado vazio, descartando o que houver em `caminho`"""
+        if os.path.exists(caminho):
+            os.remove(caminho)
+        return cls(caminho)
+
+    def _ler_meta(self, chave, padrao=None):
+        linha = self._con.execute("SELECT valor FROM meta WHERE chave = ?", (chave,)).fetchone()
+        return json.loads(linha[0]) if linha else padrao
+
+    def estender_periodo(self, dias):
+        """Amplia o período para incluir os dias ("AAAA-MM-DD") informados"""
+        if not dias:
+            return
+        primeiro, ultimo = datetime.fromisoformat(min(dias)), datetime.fromisoformat(max(dias))
+        if self.periodo is not None:
+            primeiro, ultimo = min(primeiro, self.periodo[0]), max(ultimo, self.periodo[1])
+        self.periodo = (primeiro, ultimo)
+
+    def _contribuicoes_atuais(self, ids):
+        """Contribuições já contadas dos tickets `ids` ({id: contribuição})"""
+        atuais = {}
+        ids = list(ids)
+        for inicio in range(0, len(ids), TAMANHO_CONSULTA):
+            bloco = ids[inicio:inicio + TAMANHO_CONSULTA]
+            consulta = f"SELECT id, contribuicao FROM tickets WHERE id IN ({','.join('?' * len(bloco))})"
+            for ticket_id, valor in self._con.execute(consulta, bloco):
+                atuais[ticket_id] = json.loads(valor)
+        return atuais
+
+    def incorporar(self, tickets):
+        """Incorpora um lote de tickets novos ou alterados
+
+        Um ticket cujo id já foi contado tem a contribuição anterior retirada
+        antes de a nova ser somada; tickets de dias fora do período o ampliam.
+        Retorna (novos, alterados).
+        """
+        self.estender_periodo({chave_dia(t) for t in tickets})
+        atuais = self._contribuicoes_atuais({t["id"] for t in tickets})
+        novos = alterados = 0
+        for t in tickets:
+            anterior = atuais.get(t["id"])
+            if anterior is None:
+                novos += 1
+            else:
+                atualizar_estado_agregacao(self.estado, [anterior], peso=-1)
+                alterados += 1
+            atuais[t["id"]] = contribuicao(t)
+            atualizar_estado_agregacao(self.estado, [atuais[t["id"]]])
+
+        self._con.executemany(
+            "INSERT OR REPLACE INTO tickets (id, contribuicao) VALUES (?, ?)",
+            ((ticket_id, json.dumps(valor, ensure_ascii=False)) for ticket_id, valor in atuais.items())
+        )
+        return novos, alterados
+
+    def total_tickets(self):
+        return sum(acc["total_tickets"] for acc in self.estado["departamento"].values())
+
+    def metricas(self):
+        """Métricas completas montadas a partir dos acumuladores"""
+        return metricas_do_estado(self.agentes, self.estado, self.periodo)
+
+    def salvar(self):
+        """Grava agentes, período e acumuladores (proporcionais a agentes e dias) e confirma o índice"""
+        self._con.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES ('agentes', ?)",
+                          (json.dumps(self.agentes, ensure_ascii=False, default=str),))
+        if self.periodo is not None:
+            inicio, fim = self.periodo
+            self._con.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES ('periodo', ?)",
+                              (json.dumps({"inicio": inicio.isoformat(), "fim": fim.isoformat()}),))
+        self._con.execute("DELETE FROM acumuladores")
+        self._con.executemany(
+            "INSERT INTO acumuladores (grupo, chave, acumulador) VALUES (?, ?, ?)",
+            ((grupo, chave, json.dumps(acc, ensure_ascii=False))
+             for grupo, grupos in self.estado.items() for chave, acc in grupos.items())
+        )
+        self._con.commit()
+
+    def fechar(self):
+        self._con.close()
+
+class EscritorEstado:
+    """Saída adicional do gerador: cria o estado incremental junto com os dados"""
+
+    def __init__(self, caminho):
+        self._estado = EstadoIncremental.novo(caminho)
+
+    def escrever_lote(self, tickets):
+        self._estado.incorporar(tickets)
+
+    def finalizar(self, agentes, metricas, metadata, configuracao):
+        self._estado.agentes = agentes
+        self._estado.periodo = periodo_de_metadata(metadata)
+        self._estado.salvar()
+        self._estado.fechar()
+
+def ler_lote(caminho):
+    """Lê um lote de tickets: NDJSON (.ndjson), lista JSON ou objeto com a chave "tickets" """
+    if ".ndjson" in os.path.basename(caminho):
+        return list(ler_ndjson(caminho))
+    dados = carregar_json(caminho)
+    return dados["tickets"] if isinstance(dados, dict) else dados
+
+def publicar_metricas(estado, diretorio=None):
+    """Grava as métricas atuais no layout por seções (exceto `tickets`)"""
+    gravar_secoes(diretorio or gerador.DIRETORIO_SECOES, {
+        "metadata": montar_metadata(estado.agentes, estado.total_tickets(), estado.periodo),
+        "configuracao": montar_configuracao(),
+        "agentes": estado.agentes,
+        **estado.metricas()
+    })
+
+def parse_args(argv=None):
+    """Lê as opções de linha de comando"""
+    parser = argparse.ArgumentParser(description="Atualiza as métricas do dashboard incrementalmente")
+    parser.add_argument("lotes", nargs="*", help="arquivos JSON ou NDJSON com tickets novos ou alterados")
+    parser.add_argument(
+        "--inicializar", action="store_true",
+        help=f"recria o estado a partir do arquivo completo ({gerador.ARQUIVO_SAIDA})"
+    )
+    parser.add_argument(
+        "--diretorio-saida", metavar="DIR",
+        help="diretório dos dados gerados com --diretorio-saida (padrão: caminhos padrão do gerador)"
+    )
+    args = parser.parse_args(argv)
+    if not args.lotes and not args.inicializar:
+        parser.error("informe ao menos um lote ou --inicializar")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    saidas = gerador.definir_diretorio_saida(args.diretorio_saida)
+    caminho = caminho_estado(saidas.arquivo)
+
+    if args.inicializar:
+        arquivo_dados = localizar(saidas.arquivo)
+        print(f"Inicializando estado a partir de {os.path.basename(arquivo_dados)}...")
+        dados = carregar_json(arquivo_dados)
+        estado = EstadoIncremental.novo(caminho)
+        estado.agentes = dados["agentes"]
+        estado.periodo = periodo_de_metadata(dados["metadata"])
+        estado.incorporar(dados["tickets"])
+        del dados
+    elif not os.path.exists(caminho):
+        raise SystemExit(f"Estado não encontrado em {caminho}; rode com --inicializar "
+                         "ou gere os dados com --estado")
+    else:
+        estado = EstadoIncremental(caminho)
+
+    for lote in args.lotes:
+        novos, alterados = estado.incorporar(ler_lote(lote))
+        print(f"   • {os.path.basename(lote)}: {novos} tickets novos, {alterados} alterados")
+
+    estado.salvar()
+    publicar_metricas(estado, saidas.secoes)
+    print(f"✅ Métricas atualizadas: {estado.total_tickets()} tickets")
+    print(f"💾 Estado: {os.path.basename(caminho)}")
+    estado.fechar()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""Benchmark do pipeline de geração e visualização em diferentes escalas.
+
+Executa as etapas de `gerar_dados_dashboard` (agentes, tickets, métricas,
+volume temporal, gravação do JSON) e os relatórios `criar_*` de
+`exemplo_visualizacoes` para cada escala pedida (dias, tickets por dia e
+agentes) e mede, por etapa, o tempo de parede, o pico de memória alocada
+e a vazão em tickets/s, além da memória retida por ticket gerado (lista
+de dicts ou, com `--tickets-compactos`, TicketsCompactos). Roda offline; os arquivos gerados vão para um
+diretório temporário.
+
+Cada escala roda duas vezes com a mesma semente: uma passada só
+cronometrada (a menor de `--repeticoes`) e outra sob tracemalloc, que
+mede o pico de memória sem distorcer os tempos. O resultado é gravado em
+JSON e pode ser comparado com uma execução anterior:
+
+    python benchmark_pipeline.py --escala pequena --escala padrao
+    python benchmark_pipeline.py --comparar resultados_anteriores.json
+
+Com `--linearidade`, multiplica separadamente os dias, os tickets por dia e
+os agentes da escala base e verifica que o tempo de cada etapa de agregação
+por unidade de trabalho (tickets + agentes + dias) não cresce, ou seja, que
+as agregações são lineares no volume e não em tickets × agentes ou
+tickets × dias (tests/test_linearidade.py verifica o mesmo contando
+leituras dos tickets, sem depender de tempo):
+
+    python benchmark_pipeline.py --linearidade --repeticoes 3
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import gerar_dados_dashboard as gerador
+
+# Escalas predefinidas (a "padrao" equivale à configuração original do gerador)
+ESCALAS = {
+    "pequena": {"dias": 30, "tickets_por_dia": 80, "agentes": 35},
+    "padrao": {"dias": 188, "tickets_por_dia": 80, "agentes": 35},
+    "grande": {"dias": 365, "tickets_por_dia": 400, "agentes": 140}
+}
+
+ETAPAS_VISUALIZACAO = (
+    "criar_dashboard_executivo", "criar_analise_agentes",
+    "criar_analise_temporal", "criar_analise_departamental"
+)
+
+ARQUIVO_RESULTADOS = 'resultados_benchmark.json'
+
+# Aumento relativo de tempo ou memória tolerado antes de acusar regressão
+TOLERANCIA_PADRAO = 0.2
+
+# Verificação de linearidade: quanto cada dimensão é multiplicada e o aumento
+# relativo tolerado no custo por unidade (um custo quadrático cresceria ~FATOR vezes)
+FATOR_LINEARIDADE = 4
+TOLERANCIA_LINEARIDADE = 0.5
+
+# Escala base da verificação: com muitos tickets por dia, percorrer os tickets
+# uma vez por agente ou por dia custa bem mais que o trabalho linear por agente/dia
+ESCALA_LINEARIDADE = {"dias": 30, "tickets_por_dia": 400, "agentes": 35}
+
+# Etapas cronometradas na verificação: as que agregam os tickets por agente,
+# departamento ou dia (a geração, linear e mais cara, esconderia um termo quadrático)
+ETAPAS_AGREGACAO = (
+    "calcular_metricas_agentes", "calcular_metricas_departamento",
+    "gerar_dados_volume_temporal", "calcular_resumo_geral"
+)
+
+def executar_pipeline(diretorio, semente, visualizacoes, medir_memoria=False, compacto=False,
+                      escala=gerador.ESCALA_PADRAO):
+    """Executa todas as etapas uma vez e devolve ({etapa: medida}, total_tickets, bytes_por_ticket)
+
+    A medida é o tempo em segundos ou, com `medir_memoria`, o pico de
+    memória alocada (bytes) durante a etapa. `bytes_por_ticket` é a memória
+    que continua alocada após gerar os tickets, dividida pelo total (só
+    com `medir_memoria`; senão None).
+    """
+    random.seed(semente)
+    gerador.fake.seed_instance(semente)
+    medidas = {}
+    retidos = {}
+
+    def etapa(nome, funcao, *args, **kwargs):
+        if medir_memoria:
+            tracemalloc.reset_peak()
+            antes = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        valor = funcao(*args, **kwargs)
+        fim = time.perf_counter()
+        if medir_memoria:
+            atual, pico = tracemalloc.get_traced_memory()
+            medidas[nome] = pico - antes
+            retidos[nome] = atual - antes
+        else:
+            medidas[nome] = fim - inicio
+        return valor
+
+    periodo = escala.periodo
+    agentes = etapa("gerar_agentes", gerador.gerar_agentes, escala)
+    tickets = etapa("gerar_tickets", gerador.gerar_tickets, agentes, semente=semente, compacto=compacto,
+                    escala=escala)
+    metricas_agentes = etapa("calcular_metricas_agentes", gerador.calcular_metricas_agentes, agentes, tickets, periodo)
+    metricas_departamentos = etapa("calcular_metricas_departamento", gerador.calcular_metricas_departamento,
+                                   tickets, periodo)
+    dados_volume = etapa("gerar_dados_volume_temporal", gerador.gerar_dados_volume_temporal, tickets,
+                         periodo=periodo)
+    resumo_geral = etapa("calcular_resumo_geral", gerador.calcular_resumo_geral, agentes, tickets)
+
+    dados_dashboard = {
+        "metadata": gerador.montar_metadata(agentes, len(tickets), periodo),
+        "configuracao": gerador.montar_configuracao(),
+        "agentes": agentes,
+        "tickets": tickets,
+        "metricas_agentes": metricas_agentes,
+        "metricas_departamentos": metricas_departamentos,
+        "dados_volume": dados_volume,
+        "resumo_geral": resumo_geral
+    }
+    etapa("salvar_json", gerador.salvar_dados, dados_dashboard, os.path.join(diretorio, "dados.json"))
+
+    if visualizacoes:
+        import exemplo_visualizacoes
+        exemplo_visualizacoes.DIRETORIO_RELATORIOS = diretorio
+        for nome in ETAPAS_VISUALIZACAO:
+            etapa(nome, getattr(exemplo_visualizacoes, nome), dados_dashboard)
+        # Os quatro relatórios de novo, em paralelo e com plotly.js compartilhado
+        # (a memória dos processos filhos não entra no tracemalloc)
+        etapa("renderizar_relatorios_em_lote", exemplo_visualizacoes.renderizar_relatorios, dados_dashboard)
+
+    bytes_por_ticket = retidos["gerar_tickets"] / len(tickets) if medir_memoria and tickets else None
+    return medidas, len(tickets), bytes_por_ticket
+
+def medir_escala(nome, dias, tickets_por_dia, agentes, semente=gerador.SEMENTE_PADRAO,
+                 repeticoes=1, visualizacoes=True, compacto=False):
+    """Mede todas as etapas em uma escala e devolve o resultado do cenário"""
+    escala = gerador.definir_escala(dias, tickets_por_dia, agentes)
+    with tempfile.TemporaryDirectory(prefix="benchmark_dashboard_") as diretorio:
+        tempos = None
+        for _ in range(repeticoes):
+            medidas, total_tickets, _ = executar_pipeline(diretorio, semente, visualizacoes, compacto=compacto,
+                                                          escala=escala)
+            tempos = medidas if tempos is None else {k: min(v, tempos[k]) for k, v in medidas.items()}
+
+        tracemalloc.start()
+        try:
+            picos, _, bytes_por_ticket = executar_pipeline(diretorio, semente, visualizacoes,
+                                                           medir_memoria=True, compacto=compacto, escala=escala)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "nome": nome,
+        "dias": dias,
+        "tickets_por_dia": tickets_por_dia,
+        "agentes": agentes,
+        "total_tickets": total_tickets,
+        "tickets_compactos": compacto,
+        "bytes_por_ticket": round(bytes_por_ticket) if bytes_por_ticket is not None else None,
+        "etapas": {
+            etapa: {
+                "segundos": round(segundos, 4),
+                "pico_memoria_mb": round(picos[etapa] / 1024 ** 2, 2),
+                "tickets_por_segundo": round(total_tickets / segundos) if segundos else None
+            }
+            for etapa, segundos in tempos.items()
+        }
+    }
+
+def cronometrar_agregacao(dias, tickets_por_dia, agentes, semente=gerador.SEMENTE_PADRAO,
+                          repeticoes=1, compacto=False):
+    """Tempo de cada etapa de agregação em uma escala (o menor de `repeticoes`) e o total de tickets
+
+    Agentes e tickets são gerados uma vez, fora da medição.
+    """
+    escala = gerador.definir_escala(dias, tickets_por_dia, agentes)
+    periodo = escala.periodo
+    random.seed(semente)
+    gerador.fake.seed_instance(semente)
+    lista_agentes = gerador.gerar_agentes(escala)
+    tickets = gerador.gerar_tickets(lista_agentes, semente=semente, compacto=compacto, escala=escala)
+    argumentos = {
+        "calcular_metricas_agentes": (lista_agentes, tickets, periodo),
+        "calcular_metricas_departamento": (tickets, periodo),
+        "gerar_dados_volume_temporal": (tickets, None, periodo),
+        "calcular_resumo_geral": (lista_agentes, tickets)
+    }
+    tempos = {}
+    for etapa in ETAPAS_AGREGACAO:
+        funcao = getattr(gerador, etapa)
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao(*argumentos[etapa])
+            segundos = time.perf_counter() - inicio
+            tempos[etapa] = min(segundos, tempos.get(etapa, segundos))
+    return tempos, len(tickets)
+
+def verificar_linearidade(base, fator=FATOR_LINEARIDADE, tolerancia=TOLERANCIA_LINEARIDADE, **opcoes):
+    """Multiplica cada dimensão da escala `base` por `fator` e compara o custo por unidade
+
+    O custo por unidade de uma etapa de agregação é o seu tempo dividido por
+    tickets + agentes + dias. Em uma etapa linear ele se mantém ao crescer
+    qualquer dimensão; se ela fosse proporcional a tickets × agentes ou
+    tickets × dias, ele cresceria perto de `fator` vezes. Devolve uma linha
+    por dimensão com a razão de cada etapa e "linear" False quando alguma
+    passa de `tolerancia`.
+    """
+    def custos(escala):
+        tempos, total_tickets = cronometrar_agregacao(**escala, **opcoes)
+        unidades = total_tickets + escala["agentes"] + escala["dias"]
+        return tempos, total_tickets, {etapa: segundos / unidades for etapa, segundos in tempos.items()}
+
+    _, tickets_base, custos_base = custos(base)
+    linhas = []
+    for dimensao in ("dias", "tickets_por_dia", "agentes"):
+        escala = {**base, dimensao: base[dimensao] * fator}
+        tempos, total_tickets, custos_escala = custos(escala)
+        razoes = {etapa: round(custos_escala[etapa] / custos_base[etapa], 3) for etapa in ETAPAS_AGREGACAO}
+        pior = max(razoes, key=razoes.get)
+        linhas.append({
+            "dimensao": dimensao,
+            "escala": escala,
+            "total_tickets": total_tickets,
+            "segundos": round(sum(tempos.values()), 4),
+            "razao_por_etapa": razoes,
+            "etapa_pior_razao": pior,
+            "razao_custo_por_unidade": razoes[pior],
+            "linear": razoes[pior] <= 1 + tolerancia
+        })
+    return {"base": base, "total_tickets_base": tickets_base, "fator": fator,
+            "tolerancia": tolerancia, "dimensoes": linhas}
+
+def comparar(resultados, referencia, tolerancia=TOLERANCIA_PADRAO):
+    """Lista as regressões (tempo ou memória acima da tolerância) em relação à referência"""
+    cenarios_ref = {c["nome"]: c for c in referencia["cenarios"]}
+    regressoes = []
+    for cenario in resultados["cenarios"]:
+        ref = cenarios_ref.get(cenario["nome"])
+        if ref is None or ref["total_tickets"] != cenario["total_tickets"]:
+            continue
+        for etapa, medida in cenario["etapas"].items():
+            medida_ref = ref["etapas"].get(etapa)
+            if medida_ref is None:
+                continue
+            for campo in ("segundos", "pico_memoria_mb"):
+                if medida_ref[campo] and medida[campo] > medida_ref[campo] * (1 + tolerancia):
+                    regressoes.append({
+                        "cenario": cenario["nome"],
+                        "etapa": etapa,
+                        "medida": campo,
+                        "referencia": medida_ref[campo],
+                        "atual": medida[campo],
+                        "variacao_pct": round((medida[campo] / medida_ref[campo] - 1) * 100, 1)
+                    })
+    return regressoes
+
+def imprimir_cenario(cenario):
+    print(f"\n📏 {cenario['nome']}: {cenario['dias']} dias, ~{cenario['tickets_por_dia']} tickets/dia, "
+          f"{cenario['agentes']} agentes ({cenario['total_tickets']} tickets)")
+    representacao = "TicketsCompactos" if cenario["tickets_compactos"] else "lista de dicts"
+    print(f"   memória por ticket ({representacao}): {cenario['bytes_por_ticket']} bytes")
+    print(f"   {'etapa':<32}{'segundos':>10}{'pico MB':>10}{'tickets/s':>12}")
+    for etapa, medida in cenario["etapas"].items():
+        vazao = medida["tickets_por_segundo"]
+        print(f"   {etapa:<32}{medida['segundos']:>10.3f}{medida['pico_memoria_mb']:>10.1f}"
+              f"{vazao if vazao is not None else '-':>12}")
+
+def imprimir_linearidade(linearidade):
+    base = linearidade["base"]
+    print(f"\n📐 Linearidade (base: {base['dias']} dias, ~{base['tickets_por_dia']} tickets/dia, "
+          f"{base['agentes']} agentes; cada dimensão ×{linearidade['fator']})")
+    print(f"   {'dimensão':<18}{'tickets':>10}{'segundos':>10}{'custo/unid.':>13}  pior etapa")
+    for linha in linearidade["dimensoes"]:
+        marca = "✅" if linha["linear"] else "❌"
+        print(f"   {linha['dimensao']:<18}{linha['total_tickets']:>10}{linha['segundos']:>10.3f}"
+              f"{linha['razao_custo_por_unidade']:>12.2f}x {marca} {linha['etapa_pior_razao']}")
+
+def parse_args(argv=None):
+    """Lê as opções de linha de comando"""
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline do dashboard de atendimento")
+    parser.add_argument(
+        "--escala", action="append", choices=list(ESCALAS),
+        help="escala predefinida (pode ser repetida; padrão: pequena e padrao)"
+    )
+    parser.add_argument("--dias", type=int, help="cenário personalizado: dias do período")
+    parser.add_argument("--tickets-por-dia", type=int, help="cenário personalizado: média de tickets por dia")
+    parser.add_argument("--agentes", type=int, help="cenário personalizado: número de agentes")
+    parser.add_argument("--repeticoes", type=int, default=1, help="execuções cronometradas por escala (vale a menor)")
+    parser.add_argument("--semente", type=int, default=gerador.SEMENTE_PADRAO, help="semente dos dados gerados")
+    parser.add_argument(
+        "--sem-visualizacoes", action="store_true",
+        help="não mede os relatórios de exemplo_visualizacoes (dispensa plotly)"
+    )
+    parser.add_argument(
+        "--tickets-compactos", action="store_true",
+        help="guarda os tickets em TicketsCompactos em vez de uma lista de dicts"
+    )
+    parser.add_argument(
+        "--linearidade", action="store_true",
+        help=f"verifica que o tempo das agregações cresce linearmente ao multiplicar por {FATOR_LINEARIDADE} "
+             "os dias, os tickets por dia e os agentes da escala base (a personalizada, a primeira --escala "
+             f"ou {ESCALA_LINEARIDADE})"
+    )
+    parser.add_argument("--saida", default=ARQUIVO_RESULTADOS, help=f"arquivo de resultados (padrão: {ARQUIVO_RESULTADOS})")
+    parser.add_argument("--comparar", metavar="REFERENCIA", help="resultados anteriores para detectar regressões")
+    parser.add_argument(
+        "--tolerancia", type=float, default=TOLERANCIA_PADRAO,
+        help=f"aumento relativo tolerado na comparação (padrão: {TOLERANCIA_PADRAO})"
+    )
+    args = parser.parse_args(argv)
+    personalizado = (args.dias, args.tickets_por_dia, args.agentes)
+    if any(v is not None for v in personalizado) and any(v is None for v in personalizado):
+        parser.error("o cenário personalizado exige --dias, --tickets-por-dia e --agentes")
+    if any(v is not None and v < 1 for v in personalizado):
+        parser.error("--dias, --tickets-por-dia e --agentes devem ser positivos")
+    if args.repeticoes < 1:
+        parser.error("--repeticoes deve ser positivo")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.linearidade:
+        if args.dias is not None:
+            base = {"dias": args.dias, "tickets_por_dia": args.tickets_por_dia, "agentes": args.agentes}
+        else:
+            base = ESCALAS[args.escala[0]] if args.escala else ESCALA_LINEARIDADE
+        linearidade = verificar_linearidade(
+            base, tolerancia=TOLERANCIA_LINEARIDADE, semente=args.semente, repeticoes=args.repeticoes,
+            compacto=args.tickets_compactos
+        )
+        imprimir_linearidade(linearidade)
+        if not all(linha["linear"] for linha in linearidade["dimensoes"]):
+            print(f"\n⚠️  Custo por unidade de alguma agregação cresceu mais de {TOLERANCIA_LINEARIDADE:.0%}")
+            sys.exit(1)
+        print(f"\n✅ Agregações lineares em tickets, agentes e dias (tolerância de {TOLERANCIA_LINEARIDADE:.0%})")
+        return
+
+    cenarios = {nome: ESCALAS[nome] for nome in (args.escala or [])}
+    if args.dias is not None:
+        cenarios["personalizada"] = {"dias": args.dias, "tickets_por_dia": args.tickets_por_dia, "agentes": args.agentes}
+    if not cenarios:
+        cenarios = {nome: ESCALAS[nome] for nome in ("pequena", "padrao")}
+
+    resultados = {
+        "versao": 1,
+        "data_execucao": datetime.now().isoformat(),
+        "ambiente": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count()
+        },
+        "semente": args.semente,
+        "repeticoes": args.repeticoes,
+        "cenarios": []
+    }
+    for nome, escala in cenarios.items():
+        cenario = medir_escala(nome, **escala, semente=args.semente, repeticoes=args.repeticoes,
+                               visualizacoes=not args.sem_visualizacoes, compacto=args.tickets_compactos)
+        resultados["cenarios"].append(cenario)
+        imprimir_cenario(cenario)
+
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Resultados salvos em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            regressoes = comparar(resultados, json.load(f), args.tolerancia)
+        if regressoes:
+            print(f"\n⚠️  {len(regressoes)} regressões acima de {args.tolerancia:.0%}:")
+            for r in regressoes:
+                print(f"   • {r['cenario']}/{r['etapa']} {r['medida']}: {r['referencia']} → {r['atual']} "
+                      f"(+{r['variacao_pct']}%)")
+            sys.exit(1)
+        print(f"\n✅ Nenhuma regressão acima de {args.tolerancia:.0%} em relação a {args.comparar}")
+
+if __name__ == "__main__":
+    main()
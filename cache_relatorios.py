@@ -0,0 +1,99 @@
+"""Cache em disco, com tamanho máximo, das figuras de exemplo_visualizacoes.
+
+Cada entrada é um arquivo `<chave>.json` com o conteúdo guardado (o JSON
+de uma figura Plotly). A chave vem de `impressao_digital`, um SHA-256 do
+conteúdo que determina a figura, então dados iguais reaproveitam a
+entrada e qualquer mudança gera uma chave nova. Ler uma entrada atualiza
+seu mtime; ao gravar, as entradas usadas há mais tempo são removidas até
+o diretório caber em `tamanho_maximo` (LRU).
+"""
+import hashlib
+import os
+import tempfile
+
+from serializacao_json import para_bytes
+
+EXTENSAO = ".json"
+
+# Tamanho máximo padrão do diretório do cache
+TAMANHO_MAXIMO_PADRAO = 64 * 1024 ** 2
+
+def impressao_digital(*valores):
+    """SHA-256 (hex) do JSON compacto de cada valor, em ordem"""
+    h = hashlib.sha256()
+    for valor in valores:
+        h.update(para_bytes(valor))
+    return h.hexdigest()
+
+class CacheRelatorios:
+    """Entradas (bytes) indexadas por chave em um diretório, com remoção LRU"""
+
+    def __init__(self, diretorio, tamanho_maximo=TAMANHO_MAXIMO_PADRAO):
+        self.diretorio = diretorio
+        self.tamanho_maximo = tamanho_maximo
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave + EXTENSAO)
+
+    def obter(self, chave):
+        """Conteúdo guardado sob `chave`, ou None (marca a entrada como usada agora)"""
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, "rb") as f:
+                conteudo = f.read()
+            os.utime(caminho)
+        except FileNotFoundError:
+            # Ausente, ou removida por outro processo entre a leitura e o utime
+            return None
+        return conteudo
+
+    def guardar(self, chave, conteudo):
+        """Grava a entrada (de forma atômica) e remove as mais antigas se passar do limite"""
+        fd, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(conteudo)
+        os.replace(temporario, self._caminho(chave))
+        self.podar()
+
+    def _entradas(self):
+        """(mtime, bytes, caminho) de cada entrada"""
+        entradas = []
+        for nome in os.listdir(self.diretorio):
+            if not nome.endswith(EXTENSAO):
+                continue
+            caminho = os.path.join(self.diretorio, nome)
+            try:
+                info = os.stat(caminho)
+            except FileNotFoundError:
+                continue
+            entradas.append((info.st_mtime, info.st_size, caminho))
+        return entradas
+
+    def tamanho(self):
+        """Bytes ocupados pelas entradas"""
+        return sum(tamanho for _, tamanho, _ in self._entradas())
+
+    def podar(self):
+        """Remove as entradas usadas há mais tempo até caber em `tamanho_maximo`; devolve quantas saíram"""
+        entradas = sorted(self._entradas())
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        removidas = 0
+        for _, tamanho, caminho in entradas:
+            if total <= self.tamanho_maximo:
+                break
+            try:
+                os.remove(caminho)
+                removidas += 1
+            except FileNotFoundError:
+                pass
+            total -= tamanho
+        return removidas
+
+    def limpar(self):
+        """Remove todas as entradas"""
+        for _, _, caminho in self._entradas():
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
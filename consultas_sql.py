@@ -0,0 +1,203 @@
+"""Camada de consultas SQL (SQLite embutido) sobre os dados gerados.
+
+Carrega agentes e tickets nas tabelas indexadas de `carregar_banco` e
+calcula as métricas do dashboard com GROUP BY: cada consulta devolve, por
+agente, departamento ou dia, os mesmos acumuladores de
+`gerar_dados_dashboard` (contagens, somas, contagens por categoria e
+sketches de quantis), que são montados nas estruturas finais pelas mesmas
+funções do gerador, com o período gravado na tabela `periodo_dados`. Assim
+`metricas_agentes`, `metricas_departamentos`, `dados_volume` e
+`resumo_geral` saem idênticos aos do gerador, e novos recortes (ex.: SLA
+por canal por mês) são uma consulta SQL em `consultar()`.
+
+Uso:
+    python consultas_sql.py --banco dashboard.db
+    python consultas_sql.py --banco dashboard.db "SELECT canal, AVG(sla_cumprido) FROM tickets GROUP BY canal"
+"""
+import argparse
+import os
+import sqlite3
+import time
+
+import gerar_dados_dashboard as gerador
+from carregar_banco import carregar_no_banco
+from gerar_dados_dashboard import (
+    STATUS_RESOLVIDOS, _completar_indice_temporal, _dados_volume, _metricas_agentes,
+    _metricas_departamento, _resumo_geral, adicionar_ao_sketch, mesclar_acumuladores, novo_acumulador,
+    periodo_de_metadata
+)
+from serializacao_json import carregar_json, localizar
+
+# Expressões SQL das chaves de agrupamento
+CHAVES = {
+    "agente": "agente_id",
+    "departamento": "departamento",
+    "dia": "substr(data_criacao, 1, 10)"
+}
+
+# Colunas contadas por categoria em cada acumulador (campo do acumulador -> coluna)
+CONTAGENS = {
+    "por_departamento": "departamento",
+    "por_canal": "canal",
+    "por_prioridade": "prioridade",
+    "por_status": "status"
+}
+
+_RESOLVIDO = "status IN (" + ", ".join(f"'{s}'" for s in STATUS_RESOLVIDOS) + ")"
+
+# Somas e contagens do acumulador, com os mesmos critérios de acumular_ticket
+SQL_ACUMULADOR = f"""
+SELECT {{chave}} AS chave,
+    COUNT(*) AS total_tickets,
+    SUM(CASE WHEN {_RESOLVIDO} THEN 1 ELSE 0 END) AS tickets_resolvidos,
+    SUM(CASE WHEN {_RESOLVIDO} AND tempo_resolucao_minutos <> 0 THEN tempo_resolucao_minutos ELSE 0 END) AS soma_resolucao,
+    SUM(CASE WHEN {_RESOLVIDO} AND tempo_resolucao_minutos <> 0 THEN 1 ELSE 0 END) AS n_resolucao,
+    SUM(CASE WHEN {_RESOLVIDO} AND satisfacao_cliente <> 0 THEN satisfacao_cliente ELSE 0 END) AS soma_satisfacao,
+    SUM(CASE WHEN {_RESOLVIDO} AND satisfacao_cliente <> 0 THEN 1 ELSE 0 END) AS n_satisfacao,
+    SUM(CASE WHEN {_RESOLVIDO} AND sla_cumprido IS NOT NULL THEN 1 ELSE 0 END) AS n_sla,
+    SUM(CASE WHEN {_RESOLVIDO} AND sla_cumprido THEN 1 ELSE 0 END) AS sla_cumprido,
+    SUM(CASE WHEN tempo_primeira_resposta_minutos <> 0 THEN tempo_primeira_resposta_minutos ELSE 0 END) AS soma_primeira_resposta,
+    SUM(CASE WHEN tempo_primeira_resposta_minutos <> 0 THEN 1 ELSE 0 END) AS n_primeira_resposta,
+    SUM(interacoes) AS soma_interacoes,
+    SUM(CASE WHEN reaberto THEN 1 ELSE 0 END) AS tickets_reabertos
+FROM tickets
+GROUP BY 1
+"""
+
+SQL_CONTAGEM = "SELECT {chave} AS chave, {coluna} AS valor, COUNT(*) FROM tickets GROUP BY 1, 2"
+
+# Valores distintos dos tempos por grupo, para os sketches de quantis (campo do acumulador -> consulta)
+SQL_SKETCHES = {
+    "sketch_resolucao": f"""
+        SELECT {{chave}}, tempo_resolucao_minutos, COUNT(*) FROM tickets
+        WHERE {_RESOLVIDO} AND tempo_resolucao_minutos <> 0 GROUP BY 1, 2""",
+    "sketch_primeira_resposta": """
+        SELECT {chave}, tempo_primeira_resposta_minutos, COUNT(*) FROM tickets
+        WHERE tempo_primeira_resposta_minutos <> 0 GROUP BY 1, 2"""
+}
+
+class ConsultasDashboard:
+    """Consultas analíticas sobre um banco SQLite carregado por carregar_banco"""
+
+    def __init__(self, con):
+        self.con = con
+
+    @classmethod
+    def de_dados(cls, dados, caminho=":memory:"):
+        """Cria o banco (em memória, por padrão) a partir da estrutura do gerador"""
+        con = sqlite3.connect(caminho)
+        carregar_no_banco(con, "sqlite", dados)
+        return cls(con)
+
+    @classmethod
+    def abrir(cls, caminho):
+        """Abre um banco já carregado (ex.: `carregar_banco.py --sqlite`)"""
+        return cls(sqlite3.connect(caminho))
+
+    def consultar(self, sql, parametros=()):
+        """Executa uma consulta arbitrária e devolve as linhas como dicts"""
+        cur = self.con.execute(sql, parametros)
+        colunas = [c[0] for c in cur.description]
+        return [dict(zip(colunas, linha)) for linha in cur]
+
+    def agentes(self):
+        return self.consultar("SELECT * FROM agentes ORDER BY rowid")
+
+    def periodo(self):
+        """Período (início, fim) dos dados carregados (metadata.periodo_dados)"""
+        linha, = self.consultar("SELECT inicio, fim FROM periodo_dados")
+        return periodo_de_metadata({"periodo_dados": linha})
+
+    def acumuladores(self, agrupamento):
+        """Acumuladores por agente, departamento ou dia ({chave: acumulador})"""
+        chave = CHAVES[agrupamento]
+        grupos = {}
+        cur = self.con.execute(SQL_ACUMULADOR.format(chave=chave))
+        campos = [c[0] for c in cur.description][1:]
+        for linha in cur:
+            acc = grupos[linha[0]] = novo_acumulador()
+            acc.update(zip(campos, linha[1:]))
+        for campo, coluna in CONTAGENS.items():
+            for k, valor, n in self.con.execute(SQL_CONTAGEM.format(chave=chave, coluna=coluna)):
+                grupos[k][campo][valor] = n
+        for campo, sql in SQL_SKETCHES.items():
+            for k, valor, n in self.con.execute(sql.format(chave=chave)):
+                adicionar_ao_sketch(grupos[k][campo], valor, n=n)
+        return grupos
+
+    def metricas_agentes(self):
+        return _metricas_agentes(self.agentes(), self.acumuladores("agente"), self.periodo())
+
+    def metricas_departamentos(self):
+        return _metricas_departamento(self.acumuladores("departamento"), self.periodo())
+
+    def dados_volume(self):
+        return _dados_volume(_completar_indice_temporal(self.acumuladores("dia")), periodo=self.periodo())
+
+    def resumo_geral(self):
+        geral = novo_acumulador()
+        for acc in self.acumuladores("departamento").values():
+            mesclar_acumuladores(geral, acc)
+        return _resumo_geral(self.agentes(), geral)
+
+    def metricas(self):
+        """Todas as estruturas de métricas do dashboard"""
+        return {
+            "metricas_agentes": self.metricas_agentes(),
+            "metricas_departamentos": self.metricas_departamentos(),
+            "dados_volume": self.dados_volume(),
+            "resumo_geral": self.resumo_geral()
+        }
+
+    def fechar(self):
+        self.con.close()
+
+def _imprimir(linhas):
+    if not linhas:
+        print("(nenhuma linha)")
+        return
+    colunas = list(linhas[0])
+    larguras = [max(len(str(c)), *(len(str(l[c])) for l in linhas)) for c in colunas]
+    print("  ".join(str(c).ljust(w) for c, w in zip(colunas, larguras)))
+    for linha in linhas:
+        print("  ".join(str(linha[c]).ljust(w) for c, w in zip(colunas, larguras)))
+
+def parse_args(argv=None):
+    """Lê as opções de linha de comando"""
+    parser = argparse.ArgumentParser(description="Consultas SQL sobre os dados do dashboard")
+    parser.add_argument("sql", nargs="?", help="consulta a executar (sem ela, calcula todas as métricas)")
+    parser.add_argument(
+        "--banco", default=":memory:",
+        help="arquivo SQLite; se não existir, é criado a partir do JSON gerado (padrão: em memória)"
+    )
+    parser.add_argument(
+        "--entrada", help=f"arquivo JSON gerado (padrão: {gerador.ARQUIVO_SAIDA}, ou sua versão comprimida)"
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.banco != ":memory:" and os.path.exists(args.banco):
+        consultas = ConsultasDashboard.abrir(args.banco)
+    else:
+        entrada = args.entrada or localizar(gerador.ARQUIVO_SAIDA)
+        print(f"Carregando {os.path.basename(entrada)} no SQLite...")
+        consultas = ConsultasDashboard.de_dados(carregar_json(entrada), args.banco)
+
+    inicio = time.perf_counter()
+    if args.sql:
+        linhas = consultas.consultar(args.sql)
+        _imprimir(linhas)
+        print(f"\n⏱️  {len(linhas)} linhas em {(time.perf_counter() - inicio) * 1000:.1f} ms")
+    else:
+        metricas = consultas.metricas()
+        resumo = metricas["resumo_geral"]
+        print(f"⏱️  Métricas calculadas em {(time.perf_counter() - inicio) * 1000:.1f} ms")
+        print(f"   • Tickets: {resumo['total_tickets']} ({resumo['taxa_resolucao_geral']:.1f}% resolvidos)")
+        print(f"   • Agentes: {len(metricas['metricas_agentes'])}, "
+              f"departamentos: {len(metricas['metricas_departamentos'])}, "
+              f"dias: {len(metricas['dados_volume']['volume_diario'])}")
+    consultas.fechar()
+
+if __name__ == "__main__":
+    main()
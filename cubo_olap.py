@@ -0,0 +1,155 @@
+"""Cubo pré-agregado (dia × departamento × canal × prioridade × status).
+
+Cada célula do cubo guarda as contagens e somas dos tickets daquela
+combinação: as medidas escalares dos acumuladores de
+`gerar_dados_dashboard`, com a contribuição de cada ticket dada pela mesma
+função (`medidas_escalares`). Como somas e contagens são aditivas, qualquer filtro ou
+intervalo de datas é respondido somando células e as médias saem de
+soma / n, sem percorrer os tickets.
+
+O cubo é gravado em um diretório com um arquivo por mês
+(`cubo_AAAA-MM.json`) e um `indice.json` com as dimensões, as medidas e a
+lista de meses, para que o dashboard baixe só os meses do período
+escolhido. Só as células com tickets são gravadas, como listas
+`[dia, departamento, canal, prioridade, status, *medidas]` em que as
+dimensões são índices nos vocabulários do índice (e `dia` na lista `dias`
+do próprio mês).
+"""
+import os
+
+from gerar_dados_dashboard import (
+    CANAIS, DEPARTAMENTOS, MEDIDAS_ESCALARES, PRIORIDADES, STATUS_TICKETS, chave_dia, medidas_escalares
+)
+from serializacao_json import carregar_json, salvar_json
+
+# Dimensões de cada célula (além do dia) e seus vocabulários
+DIMENSOES = {
+    "departamento": list(DEPARTAMENTOS),
+    "canal": CANAIS,
+    "prioridade": PRIORIDADES,
+    "status": STATUS_TICKETS
+}
+
+# Medidas aditivas de cada célula (as escalares dos acumuladores do gerador)
+MEDIDAS = list(MEDIDAS_ESCALARES)
+
+# Médias e taxas derivadas na consulta: nome -> (numerador, denominador, fator),
+# com os mesmos nomes das métricas do gerador
+DERIVADAS = {
+    "taxa_resolucao_pct": ("tickets_resolvidos", "total_tickets", 100),
+    "tempo_medio_resolucao_minutos": ("soma_resolucao", "n_resolucao", 1),
+    "tempo_medio_primeira_resposta_minutos": ("soma_primeira_resposta", "n_primeira_resposta", 1),
+    "satisfacao_media": ("soma_satisfacao", "n_satisfacao", 1),
+    "taxa_sla_pct": ("sla_cumprido", "n_sla", 100),
+    "media_interacoes_por_ticket": ("soma_interacoes", "total_tickets", 1)
+}
+
+ARQUIVO_INDICE = "indice.json"
+
+def caminho_mes(diretorio, mes):
+    return os.path.join(diretorio, f"cubo_{mes}.json")
+
+# Contribuição de um ticket às medidas da sua célula (na ordem de MEDIDAS)
+medidas_ticket = medidas_escalares
+
+class CuboOLAP:
+    """Células do cubo em memória ({(dia, dep, canal, prioridade, status): medidas})"""
+
+    def __init__(self):
+        self.celulas = {}
+        self._codigos = {dim: {v: i for i, v in enumerate(vocab)} for dim, vocab in DIMENSOES.items()}
+
+    def acumular(self, tickets):
+        dep, canal, prioridade, status = (self._codigos[dim] for dim in DIMENSOES)
+        celulas = self.celulas
+        for t in tickets:
+            chave = (chave_dia(t), dep[t["departamento"]], canal[t["canal"]],
+                     prioridade[t["prioridade"]], status[t["status"]])
+            contribuicao = medidas_ticket(t)
+            celula = celulas.get(chave)
+            if celula is None:
+                celulas[chave] = list(contribuicao)
+            else:
+                for i, valor in enumerate(contribuicao):
+                    celula[i] += valor
+
+    def gravar(self, diretorio):
+        """Grava um arquivo por mês e o índice; devolve o índice"""
+        os.makedirs(diretorio, exist_ok=True)
+        por_mes = {}
+        for chave in sorted(self.celulas):
+            por_mes.setdefault(chave[0][:7], []).append(chave)
+
+        meses = {}
+        for mes, chaves in por_mes.items():
+            dias = sorted({chave[0] for chave in chaves})
+            indice_dia = {dia: i for i, dia in enumerate(dias)}
+            celulas = []
+            for chave in chaves:
+                medidas = self.celulas[chave]
+                # Somas de satisfação (1 casa decimal) sem ruído de ponto flutuante
+                celulas.append([indice_dia[chave[0]], *chave[1:], *medidas[:4], round(medidas[4], 1), *medidas[5:]])
+            salvar_json({"mes": mes, "dias": dias, "celulas": celulas}, caminho_mes(diretorio, mes))
+            meses[mes] = {"arquivo": os.path.basename(caminho_mes(diretorio, mes)),
+                          "inicio": dias[0], "fim": dias[-1], "celulas": len(celulas)}
+
+        indice = {"dimensoes": DIMENSOES, "medidas": MEDIDAS, "derivadas": DERIVADAS, "meses": meses}
+        salvar_json(indice, os.path.join(diretorio, ARQUIVO_INDICE), indentar=True)
+        return indice
+
+class EscritorCubo:
+    """Saída adicional do gerador: cubo pré-agregado para o dashboard Next.js"""
+
+    def __init__(self, diretorio):
+        self.diretorio = diretorio
+        self._cubo = CuboOLAP()
+
+    def escrever_lote(self, tickets):
+        self._cubo.acumular(tickets)
+
+    def finalizar(self, agentes, metricas, metadata, configuracao):
+        self._cubo.gravar(self.diretorio)
+
+def consultar_cubo(diretorio, inicio=None, fim=None, agrupar_por=(), **filtros):
+    """Agrega o cubo gravado em `diretorio` para um período e filtros
+
+    `inicio` e `fim` são datas "AAAA-MM-DD" (inclusive); só os meses do
+    intervalo são lidos. `filtros` restringe dimensões a listas de valores
+    (ex.: canal=["Chat", "Email"]) e `agrupar_por` lista as dimensões
+    ("dia", "departamento"...) pelas quais o resultado é separado. Devolve
+    {chave: medidas e derivadas}, com chave = tupla dos valores agrupados.
+    """
+    indice = carregar_json(os.path.join(diretorio, ARQUIVO_INDICE))
+    dimensoes = ["dia"] + list(indice["dimensoes"])
+    permitidos = {
+        dimensoes.index(dim): {indice["dimensoes"][dim].index(v) for v in valores}
+        for dim, valores in filtros.items()
+    }
+    posicoes = [dimensoes.index(dim) for dim in agrupar_por]
+    n_dim = len(dimensoes)
+
+    grupos = {}
+    for mes, info in indice["meses"].items():
+        if (inicio and info["fim"] < inicio) or (fim and info["inicio"] > fim):
+            continue
+        dados = carregar_json(os.path.join(diretorio, info["arquivo"]))
+        for celula in dados["celulas"]:
+            dia = dados["dias"][celula[0]]
+            if (inicio and dia < inicio) or (fim and dia > fim):
+                continue
+            if any(celula[pos] not in valores for pos, valores in permitidos.items()):
+                continue
+            chave = tuple(dia if pos == 0 else indice["dimensoes"][dimensoes[pos]][celula[pos]]
+                          for pos in posicoes)
+            soma = grupos.setdefault(chave, [0] * len(indice["medidas"]))
+            for i, valor in enumerate(celula[n_dim:]):
+                soma[i] += valor
+
+    resultado = {}
+    for chave, somas in grupos.items():
+        medidas = dict(zip(indice["medidas"], somas))
+        for nome, (numerador, denominador, fator) in indice["derivadas"].items():
+            medidas[nome] = (round(medidas[numerador] / medidas[denominador] * fator, 2)
+                             if medidas[denominador] else 0)
+        resultado[chave] = medidas
+    return resultado
@@ -1,5 +1,10 @@
 
-import { DashboardData, Ticket, Agente, KPIData, FilterState } from './types';
+import { tableFromIPC } from 'apache-arrow';
+import {
+  DashboardData, Ticket, Agente, KPIData, FilterState,
+  CubeIndex, CubeMonth, CubeFilter, CubeDimension, CubeAggregate,
+  PrefixSums, PrefixSumsFilter
+} from './types';
 
 export async function loadDashboardData(): Promise<DashboardData> {
   const response = await fetch('/dados.json');
@@ -9,6 +14,150 @@ export async function loadDashboardData(): Promise<DashboardData> {
   return response.json();
 }
 
+// Lê uma tabela da exportação colunar (gerar_dados_dashboard.py --colunar arrow),
+// servida em /dados/<tabela>.arrow, mantendo apenas as colunas pedidas.
+export async function loadColumnarTable<T = Record<string, unknown>>(
+  tabela: string,
+  colunas?: string[]
+): Promise<T[]> {
+  const response = await fetch(`/dados/${tabela}.arrow`);
+  if (!response?.ok) {
+    throw new Error(`Falha ao carregar a tabela ${tabela}`);
+  }
+  const table = tableFromIPC(new Uint8Array(await response.arrayBuffer()));
+  const selected = colunas?.length ? table.select(colunas) : table;
+  return selected.toArray().map(row => row.toJSON() as T);
+}
+
+// Cubo pré-agregado (gerar_dados_dashboard.py --cubo), servido em /cubo/:
+// um índice com dimensões e medidas e um arquivo por mês com as células
+// [dia, departamento, canal, prioridade, status, ...medidas].
+export async function loadCubeIndex(): Promise<CubeIndex> {
+  const response = await fetch('/cubo/indice.json');
+  if (!response?.ok) {
+    throw new Error('Falha ao carregar o índice do cubo');
+  }
+  return response.json();
+}
+
+function toDateKey(date: Date): string {
+  return date.toISOString().split('T')[0];
+}
+
+// Baixa apenas os meses do cubo que se sobrepõem ao período pedido
+export async function loadCubeMonths(
+  indice: CubeIndex,
+  periodo?: CubeFilter['periodo']
+): Promise<CubeMonth[]> {
+  const inicio = periodo ? toDateKey(periodo.inicio) : null;
+  const fim = periodo ? toDateKey(periodo.fim) : null;
+  const meses = Object.values(indice?.meses ?? {}).filter(mes =>
+    (!inicio || mes.fim >= inicio) && (!fim || mes.inicio <= fim)
+  );
+  return Promise.all(meses.map(async mes => {
+    const response = await fetch(`/cubo/${mes.arquivo}`);
+    if (!response?.ok) {
+      throw new Error(`Falha ao carregar ${mes.arquivo}`);
+    }
+    return response.json() as Promise<CubeMonth>;
+  }));
+}
+
+// Soma as células que passam pelos filtros, agrupando pelas dimensões pedidas
+// (chave: valores unidos por "|", ou "total" sem agrupamento), e calcula as
+// médias e taxas derivadas (tempo_medio_resolucao_minutos, taxa_sla_pct...).
+export function queryCube(
+  indice: CubeIndex,
+  meses: CubeMonth[],
+  filtros: CubeFilter = {},
+  agruparPor: CubeDimension[] = []
+): Record<string, CubeAggregate> {
+  const dimensoes: CubeDimension[] = ['dia', 'departamento', 'canal', 'prioridade', 'status'];
+  const selecionados: Partial<Record<CubeDimension, string[] | undefined>> = {
+    departamento: filtros.departamentos,
+    canal: filtros.canais,
+    prioridade: filtros.prioridades,
+    status: filtros.status
+  };
+  const permitidos = dimensoes.flatMap((dim, pos) => {
+    const valores = selecionados[dim];
+    if (dim === 'dia' || !valores?.length) return [];
+    const vocabulario = indice.dimensoes[dim];
+    return [{ pos, codigos: new Set(valores.map(v => vocabulario.indexOf(v))) }];
+  });
+  const inicio = filtros.periodo ? toDateKey(filtros.periodo.inicio) : null;
+  const fim = filtros.periodo ? toDateKey(filtros.periodo.fim) : null;
+  const nMedidas = indice.medidas.length;
+  const somas: Record<string, number[]> = {};
+
+  for (const mes of meses) {
+    for (const celula of mes.celulas) {
+      const dia = mes.dias[celula[0]];
+      if ((inicio && dia < inicio) || (fim && dia > fim)) continue;
+      if (permitidos.some(({ pos, codigos }) => !codigos.has(celula[pos]))) continue;
+
+      const chave = agruparPor.length === 0 ? 'total' : agruparPor.map(dim => {
+        const pos = dimensoes.indexOf(dim);
+        return dim === 'dia' ? dia : indice.dimensoes[dim][celula[pos]];
+      }).join('|');
+      const soma = somas[chave] ?? (somas[chave] = new Array(nMedidas).fill(0));
+      for (let i = 0; i < nMedidas; i++) {
+        soma[i] += celula[dimensoes.length + i];
+      }
+    }
+  }
+
+  const resultado: Record<string, CubeAggregate> = {};
+  for (const [chave, soma] of Object.entries(somas)) {
+    const agregado: CubeAggregate = {};
+    indice.medidas.forEach((medida, i) => { agregado[medida] = soma[i]; });
+    for (const [nome, [numerador, denominador, fator]] of Object.entries(indice.derivadas)) {
+      agregado[nome] = agregado[denominador] ? (agregado[numerador] / agregado[denominador]) * fator : 0;
+    }
+    resultado[chave] = agregado;
+  }
+  return resultado;
+}
+
+// Somas de prefixo diárias (gerar_dados_dashboard.py --somas-prefixo),
+// servidas em /somas_prefixo.json.
+export async function loadPrefixSums(): Promise<PrefixSums> {
+  const response = await fetch('/somas_prefixo.json');
+  if (!response?.ok) {
+    throw new Error('Falha ao carregar as somas de prefixo');
+  }
+  return response.json();
+}
+
+const MS_POR_DIA = 24 * 60 * 60 * 1000;
+
+// Posição de uma data nas séries (dias desde `inicio`), limitada ao período
+function prefixPosition(prefixos: PrefixSums, data: Date, deslocamento = 0): number {
+  const dias = Math.round((Date.parse(toDateKey(data)) - Date.parse(prefixos.inicio)) / MS_POR_DIA);
+  return Math.min(Math.max(dias + deslocamento, 0), prefixos.dias);
+}
+
+// Medidas e KPIs derivados de um período (inclusive) em O(1) por série:
+// s[fim + 1] - s[inicio], no total ou de um departamento ou canal.
+export function queryPrefixSums(prefixos: PrefixSums, filtros: PrefixSumsFilter = {}): CubeAggregate {
+  const series = filtros.departamento
+    ? prefixos.series.departamento[filtros.departamento]
+    : filtros.canal
+      ? prefixos.series.canal[filtros.canal]
+      : prefixos.series.geral;
+  const a = filtros.periodo ? prefixPosition(prefixos, filtros.periodo.inicio) : 0;
+  const b = Math.max(a, filtros.periodo ? prefixPosition(prefixos, filtros.periodo.fim, 1) : prefixos.dias);
+
+  const agregado: CubeAggregate = {};
+  for (const medida of prefixos.medidas) {
+    agregado[medida] = series ? series[medida][b] - series[medida][a] : 0;
+  }
+  for (const [nome, [numerador, denominador, fator]] of Object.entries(prefixos.derivadas)) {
+    agregado[nome] = agregado[denominador] ? (agregado[numerador] / agregado[denominador]) * fator : 0;
+  }
+  return agregado;
+}
+
 export function calculateKPIs(tickets: Ticket[], filterState?: FilterState): KPIData {
   const filteredTickets = filterState ? applyFilters(tickets, filterState) : tickets;
   
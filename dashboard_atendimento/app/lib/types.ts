@@ -115,3 +115,63 @@ export interface KPIData {
   ticketsAbertos: number;
   ticketsVencidos: number;
 }
+
+// Cubo pré-agregado (gerar_dados_dashboard.py --cubo), servido em /cubo/
+export type CubeDimension = 'dia' | 'departamento' | 'canal' | 'prioridade' | 'status';
+
+export interface CubeIndex {
+  dimensoes: Record<Exclude<CubeDimension, 'dia'>, string[]>;
+  medidas: string[];
+  derivadas: Record<string, [string, string, number]>;
+  meses: Record<string, {
+    arquivo: string;
+    inicio: string;
+    fim: string;
+    celulas: number;
+  }>;
+}
+
+export interface CubeMonth {
+  mes: string;
+  dias: string[];
+  celulas: number[][];
+}
+
+export interface CubeFilter {
+  periodo?: {
+    inicio: Date;
+    fim: Date;
+  };
+  departamentos?: string[];
+  canais?: string[];
+  prioridades?: string[];
+  status?: string[];
+}
+
+export type CubeAggregate = Record<string, number>;
+
+// Somas de prefixo diárias (gerar_dados_dashboard.py --somas-prefixo): cada
+// série tem dias + 1 valores acumulados desde `inicio`, começando em 0.
+export type PrefixSeries = Record<string, number[]>;
+
+export interface PrefixSums {
+  inicio: string;
+  fim: string;
+  dias: number;
+  medidas: string[];
+  derivadas: Record<string, [string, string, number]>;
+  series: {
+    geral: PrefixSeries;
+    departamento: Record<string, PrefixSeries>;
+    canal: Record<string, PrefixSeries>;
+  };
+}
+
+export interface PrefixSumsFilter {
+  periodo?: {
+    inicio: Date;
+    fim: Date;
+  };
+  departamento?: string;
+  canal?: string;
+}
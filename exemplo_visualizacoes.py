@@ -1,15 +1,259 @@
-import json
+import argparse
+import inspect
+import os
+import time
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+from cache_relatorios import TAMANHO_MAXIMO_PADRAO, CacheRelatorios, impressao_digital
+from serializacao_json import carregar_json, de_bytes, ler_ndjson, localizar
+import plotly
 import plotly.graph_objects as go
+import plotly.io as pio
 import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
 from datetime import datetime
 import numpy as np
 
+ARQUIVO_DADOS = '/home/ubuntu/dados_dashboard_atendimento.json'
+DIRETORIO_COLUNAR = '/home/ubuntu/dados_dashboard_colunar'
+DIRETORIO_SECOES = '/home/ubuntu/dados_dashboard_secoes'
+ARQUIVO_TICKETS_NDJSON = '/home/ubuntu/tickets_atendimento.ndjson'
+DIRETORIO_RELATORIOS = '/home/ubuntu'
+DIRETORIO_CACHE = '/home/ubuntu/cache_relatorios'
+
+# Como o plotly.js entra em cada HTML: True embute o bundle inteiro (~4,5 MB por
+# arquivo); "directory" referencia o plotly.min.js local do diretório dos relatórios
+PLOTLYJS = True
+ARQUIVO_PLOTLYJS = 'plotly.min.js'
+
+# Relatórios gerados por main(), na ordem, com o arquivo de cada um
+RELATORIOS = {
+    "criar_dashboard_executivo": "dashboard_executivo.html",
+    "criar_analise_agentes": "analise_agentes.html",
+    "criar_analise_temporal": "analise_temporal.html",
+    "criar_analise_departamental": "analise_departamental.html"
+}
+
+# Seções lidas pelos relatórios (carregadas uma vez antes da renderização em lote)
+SECOES_RELATORIOS = [
+    "metadata", "resumo_geral", "metricas_agentes", "metricas_departamentos",
+    "dados_volume"
+]
+
+# Seções de que cada figura depende: a chave do cache de um relatório só
+# muda quando alguma delas muda
+SECOES_POR_RELATORIO = {
+    "criar_dashboard_executivo": ["resumo_geral", "metricas_departamentos", "dados_volume"],
+    "criar_analise_agentes": ["metricas_agentes"],
+    "criar_analise_temporal": ["dados_volume"],
+    "criar_analise_departamental": ["metricas_departamentos"]
+}
+
+# Seções de primeiro nível dos dados do dashboard
+SECOES = [
+    "metadata", "configuracao", "agentes", "tickets", "metricas_agentes",
+    "metricas_departamentos", "dados_volume", "resumo_geral"
+]
+
+# Colunas de cada tabela colunar efetivamente usadas pelos relatórios
+COLUNAS_RELATORIOS = {
+    "metricas_agentes": ["agente_nome", "total_tickets", "satisfacao_media",
+                         "produtividade_diaria", "taxa_resolucao_pct"],
+    "metricas_departamentos": ["departamento", "total_tickets", "taxa_resolucao_pct",
+                               "satisfacao_media", "tempo_medio_resolucao_minutos",
+                               "tickets_por_prioridade", "tickets_por_status"],
+    "volume_diario": ["data", "dia_semana", "total_tickets", "tickets_por_canal"],
+    "volume_mensal": ["mes", "total_tickets"],
+    "agentes": ["id"],
+    "tickets": ["id"]
+}
+
+class DadosDashboard(Mapping):
+    """Dados do dashboard carregados sob demanda, uma seção por vez
+    
+    Cada seção de primeiro nível só é lida na primeira vez em que é
+    acessada (`dados['resumo_geral']`), então um relatório que não usa
+    `tickets` não paga pela leitura da tabela de tickets.
+    """
+    
+    def __init__(self, carregar_secao, secoes=SECOES):
+        self._carregar_secao = carregar_secao
+        self._secoes = list(secoes)
+        self._carregadas = {}
+    
+    def __getitem__(self, secao):
+        if secao not in self._carregadas:
+            if secao not in self._secoes:
+                raise KeyError(secao)
+            self._carregadas[secao] = self._carregar_secao(secao)
+        return self._carregadas[secao]
+    
+    def __iter__(self):
+        return iter(self._secoes)
+    
+    def __len__(self):
+        return len(self._secoes)
+    
+    def secoes_carregadas(self):
+        """Seções já lidas do disco"""
+        return list(self._carregadas)
+
 def carregar_dados():
-    """Carrega os dados do dashboard"""
-    with open('/home/ubuntu/dados_dashboard_atendimento.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Carrega os dados do dashboard (JSON simples, .gz ou .zst, o mais recente)"""
+    return carregar_json(localizar(ARQUIVO_DADOS))
+
+def carregar_dados_secoes(diretorio=DIRETORIO_SECOES):
+    """Abre os dados gravados com `--secoes` (um JSON por seção), sob demanda"""
+    def carregar_secao(secao):
+        return carregar_json(os.path.join(diretorio, f"{secao}.json"))
+    
+    return DadosDashboard(carregar_secao)
+
+class RegistroParcial(dict):
+    """Registro de uma tabela colunar lida só com parte das colunas
+    
+    Uma coluna que não foi lida levanta KeyError dizendo a tabela, as
+    colunas lidas e como ler todas, em vez de um KeyError sem contexto.
+    """
+    
+    def __init__(self, tabela, valores):
+        super().__init__(valores)
+        self.tabela = tabela
+    
+    def __missing__(self, coluna):
+        raise KeyError(f"coluna {coluna!r} não lida da tabela colunar {self.tabela!r} "
+                       f"(lidas: {', '.join(self)}); use carregar_dados_colunares(colunas=None)")
+
+def carregar_dados_colunares(diretorio=DIRETORIO_COLUNAR, colunas=COLUNAS_RELATORIOS):
+    """Abre os dados da exportação colunar, sob demanda (requer pyarrow)
+    
+    Cada tabela lê só as colunas listadas em `colunas` ({tabela: [colunas]};
+    padrão: as usadas pelos relatórios) e seus registros levantam KeyError
+    nas demais; tabelas fora de `colunas`, ou todas com `colunas=None`, são
+    lidas por inteiro. As seções seguem as de `carregar_dados`, mas as
+    datas de agentes e tickets vêm como date/datetime, não como texto.
+    """
+    from exportar_colunar import ler_metadados, ler_tabela
+    
+    meta = ler_metadados(diretorio)
+    
+    def registros(nome):
+        lidas = (colunas or {}).get(nome)
+        linhas = ler_tabela(diretorio, nome, lidas, meta["formato"]).to_pylist()
+        return linhas if lidas is None else [RegistroParcial(nome, linha) for linha in linhas]
+    
+    def carregar_secao(secao):
+        if secao in ("metadata", "configuracao"):
+            return meta[secao]
+        if secao == "dados_volume":
+            return {
+                "volume_diario": {d["data"]: d for d in registros("volume_diario")},
+                "volume_semanal": {s["semana"]: s for s in registros("volume_semanal")},
+                "volume_mensal": {m["mes"]: m for m in registros("volume_mensal")}
+            }
+        if secao == "resumo_geral":
+            return registros("resumo_geral")[0]
+        return registros(secao)
+    
+    return DadosDashboard(carregar_secao)
+
+def iterar_tickets(caminho=None, seguir=False):
+    """Lê os tickets do NDJSON gravado com `--ndjson`, um por vez
+    
+    Usa memória constante; com `seguir=True` acompanha o arquivo enquanto o
+    gerador (ou outro produtor) acrescenta tickets, como `tail -f`.
+    """
+    return ler_ndjson(localizar(caminho or ARQUIVO_TICKETS_NDJSON), seguir)
+
+def abrir_dados():
+    """Escolhe a fonte mais barata e atualizada para os relatórios
+    
+    Prefere o layout por seções e depois o colunar, que são lidos seção a
+    seção, desde que não sejam mais antigos que o JSON único: o gerador os
+    grava depois do JSON na mesma execução, então seções ou tabelas
+    deixadas por uma execução anterior (sem `--secoes`/`--colunar`) são
+    ignoradas. Sem eles, recai no JSON único, lido por inteiro uma só vez.
+    """
+    arquivo = localizar(ARQUIVO_DADOS)
+    mtime_json = os.path.getmtime(arquivo) if os.path.exists(arquivo) else 0
+    for diretorio, carregar in ((DIRETORIO_SECOES, carregar_dados_secoes),
+                                (DIRETORIO_COLUNAR, carregar_dados_colunares)):
+        metadata = os.path.join(diretorio, 'metadata.json')
+        if os.path.exists(metadata) and os.path.getmtime(metadata) >= mtime_json:
+            return carregar(diretorio)
+    return carregar_dados()
+
+def salvar_relatorio(fig, arquivo):
+    """Grava a figura (ou o dict de uma figura já validada) em HTML no diretório dos relatórios"""
+    pio.write_html(fig, os.path.join(DIRETORIO_RELATORIOS, arquivo), include_plotlyjs=PLOTLYJS,
+                   validate=not isinstance(fig, dict))
+
+def chave_relatorio(relatorio, dados):
+    """Chave do cache de um relatório: código da função, versão do plotly e seções lidas"""
+    return impressao_digital(
+        inspect.getsource(globals()[relatorio]), plotly.__version__,
+        *(dados[secao] for secao in SECOES_POR_RELATORIO[relatorio])
+    )
+
+def gerar_relatorio(relatorio, dados, cache=None):
+    """Gera um relatório, reaproveitando a figura do cache se as seções que ele lê não mudaram
+    
+    Com um CacheRelatorios, uma figura em cache é regravada direto do seu
+    JSON, sem montar DataFrames nem validar a figura; senão o relatório é
+    criado e o JSON da figura é guardado. Retorna True se veio do cache.
+    """
+    if cache is None:
+        globals()[relatorio](dados)
+        return False
+    chave = chave_relatorio(relatorio, dados)
+    figura = cache.obter(chave)
+    if figura is not None:
+        salvar_relatorio(de_bytes(figura), RELATORIOS[relatorio])
+        return True
+    fig = globals()[relatorio](dados)
+    cache.guardar(chave, fig.to_json().encode("utf-8"))
+    return False
+
+def gravar_plotlyjs(diretorio=None):
+    """Grava o bundle local do plotly.js compartilhado pelos relatórios em lote"""
+    from plotly.offline import get_plotlyjs
+    with open(os.path.join(diretorio or DIRETORIO_RELATORIOS, ARQUIVO_PLOTLYJS), 'w', encoding='utf-8') as f:
+        f.write(get_plotlyjs())
+
+# Dados e cache compartilhados pelos processos de renderização (definidos em _iniciar_worker)
+_dados_worker = None
+_cache_worker = None
+
+def _iniciar_worker(dados, diretorio, cache):
+    global _dados_worker, _cache_worker, DIRETORIO_RELATORIOS, PLOTLYJS
+    _dados_worker = dados
+    _cache_worker = cache
+    DIRETORIO_RELATORIOS = diretorio
+    PLOTLYJS = "directory"
+
+def _renderizar(relatorio):
+    inicio = time.perf_counter()
+    em_cache = gerar_relatorio(relatorio, _dados_worker, _cache_worker)
+    return relatorio, (time.perf_counter() - inicio, em_cache)
+
+def renderizar_relatorios(dados, workers=None, diretorio=None, cache=None):
+    """Renderiza os relatórios em paralelo, com um único plotly.js local
+    
+    As seções usadas são lidas uma vez e repassadas aos processos na
+    inicialização; cada HTML referencia o plotly.min.js gravado no
+    diretório em vez de embutir sua própria cópia. Com `cache`, cada
+    processo reaproveita as figuras em cache (ver `gerar_relatorio`).
+    Retorna {relatório: (segundos, veio do cache)}.
+    """
+    diretorio = diretorio or DIRETORIO_RELATORIOS
+    secoes = {secao: dados[secao] for secao in SECOES_RELATORIOS}
+    gravar_plotlyjs(diretorio)
+    workers = workers or min(len(RELATORIOS), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker,
+                             initargs=(secoes, diretorio, cache)) as executor:
+        return dict(executor.map(_renderizar, RELATORIOS))
 
 def criar_dashboard_executivo(dados):
     """Cria dashboard executivo com KPIs principais"""
@@ -97,7 +341,7 @@ def criar_dashboard_executivo(dados):
     )
     
     # Salvar
-    fig.write_html('/home/ubuntu/dashboard_executivo.html')
+    salvar_relatorio(fig, 'dashboard_executivo.html')
     return fig
 
 def criar_analise_agentes(dados):
@@ -183,7 +427,7 @@ def criar_analise_agentes(dados):
     fig.update_xaxes(tickangle=45, row=1, col=1)
     fig.update_xaxes(tickangle=45, row=1, col=2)
     
-    fig.write_html('/home/ubuntu/analise_agentes.html')
+    salvar_relatorio(fig, 'analise_agentes.html')
     return fig
 
 def criar_analise_temporal(dados):
@@ -271,18 +515,16 @@ def criar_analise_temporal(dados):
         showlegend=False
     )
     
-    fig.write_html('/home/ubuntu/analise_temporal.html')
+    salvar_relatorio(fig, 'analise_temporal.html')
     return fig
 
 def criar_analise_departamental(dados):
     """Cria análise por departamento"""
     
     metricas_dept = dados['metricas_departamentos']
-    tickets = dados['tickets']
     
     # Preparar dados
     df_dept = pd.DataFrame(metricas_dept)
-    df_tickets = pd.DataFrame(tickets)
     
     # Criar subplot
     fig = make_subplots(
@@ -371,37 +613,74 @@ def criar_analise_departamental(dados):
     fig.update_xaxes(tickangle=45, row=2, col=1)
     fig.update_xaxes(tickangle=45, row=2, col=2)
     
-    fig.write_html('/home/ubuntu/analise_departamental.html')
+    salvar_relatorio(fig, 'analise_departamental.html')
     return fig
 
-def main():
+def parse_args(argv=None):
+    """Lê as opções de linha de comando"""
+    parser = argparse.ArgumentParser(description="Gera os relatórios HTML de exemplo do dashboard")
+    parser.add_argument(
+        "--lote", action="store_true",
+        help=f"renderiza os relatórios em paralelo, todos usando um único {ARQUIVO_PLOTLYJS} "
+             "local em vez de embutir o plotly.js em cada arquivo"
+    )
+    parser.add_argument(
+        "--workers", type=int,
+        help="processos da renderização em lote (padrão: um por relatório, até o número de CPUs)"
+    )
+    parser.add_argument(
+        "--sem-cache", action="store_true",
+        help=f"recria todas as figuras, sem ler nem gravar o cache em {DIRETORIO_CACHE}"
+    )
+    parser.add_argument(
+        "--tamanho-cache", type=float, default=TAMANHO_MAXIMO_PADRAO / 1024 ** 2,
+        help="tamanho máximo do cache de figuras em MB; as usadas há mais tempo saem primeiro "
+             f"(padrão: {TAMANHO_MAXIMO_PADRAO / 1024 ** 2:.0f})"
+    )
+    args = parser.parse_args(argv)
+    if args.tamanho_cache <= 0:
+        parser.error("--tamanho-cache deve ser positivo")
+    if args.workers is not None and not args.lote:
+        parser.error("--workers requer --lote")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers deve ser positivo")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
     print("Carregando dados do dashboard...")
-    dados = carregar_dados()
+    dados = abrir_dados()
     
-    print("Criando visualizações...")
-    
-    print("1. Dashboard Executivo...")
-    criar_dashboard_executivo(dados)
+    cache = None if args.sem_cache else CacheRelatorios(DIRETORIO_CACHE, int(args.tamanho_cache * 1024 ** 2))
     
-    print("2. Análise de Agentes...")
-    criar_analise_agentes(dados)
-    
-    print("3. Análise Temporal...")
-    criar_analise_temporal(dados)
+    print("Criando visualizações...")
     
-    print("4. Análise Departamental...")
-    criar_analise_departamental(dados)
+    inicio = time.perf_counter()
+    if args.lote:
+        resultados = renderizar_relatorios(dados, args.workers, cache=cache)
+        for relatorio, (segundos, em_cache) in resultados.items():
+            print(f"   • {RELATORIOS[relatorio]}: {segundos:.2f}s{' (cache)' if em_cache else ''}")
+        reaproveitados = sum(em_cache for _, em_cache in resultados.values())
+    else:
+        titulos = ["Dashboard Executivo", "Análise de Agentes", "Análise Temporal", "Análise Departamental"]
+        reaproveitados = 0
+        for i, (relatorio, titulo) in enumerate(zip(RELATORIOS, titulos), 1):
+            print(f"{i}. {titulo}...")
+            reaproveitados += gerar_relatorio(relatorio, dados, cache)
+    print(f"⏱️  Relatórios em {time.perf_counter() - inicio:.2f}s"
+          + (f" ({reaproveitados} de {len(RELATORIOS)} do cache)" if cache else ""))
     
     print("\n✅ Visualizações criadas com sucesso!")
     print("📊 Arquivos HTML gerados:")
-    print("   • dashboard_executivo.html")
-    print("   • analise_agentes.html") 
-    print("   • analise_temporal.html")
-    print("   • analise_departamental.html")
+    for arquivo in RELATORIOS.values():
+        print(f"   • {arquivo}")
+    if args.lote:
+        print(f"   • {ARQUIVO_PLOTLYJS} (compartilhado)")
     
     print(f"\n📈 Resumo dos dados:")
-    print(f"   • Total de agentes: {len(dados['agentes'])}")
-    print(f"   • Total de tickets: {len(dados['tickets'])}")
+    total_registros = dados['metadata']['total_registros']
+    print(f"   • Total de agentes: {total_registros['agentes']}")
+    print(f"   • Total de tickets: {total_registros['tickets']}")
     print(f"   • Período: {dados['metadata']['periodo_dados']['inicio'][:10]} a {dados['metadata']['periodo_dados']['fim'][:10]}")
     print(f"   • Taxa de resolução: {dados['resumo_geral']['taxa_resolucao_geral']:.1f}%")
     print(f"   • Satisfação média: {dados['resumo_geral']['satisfacao_geral']:.1f}/5.0")
@@ -0,0 +1,189 @@
+"""Exportação colunar (Parquet ou Arrow IPC) dos dados do dashboard.
+
+Grava tickets, agentes e cada tabela de métricas em arquivos separados
+dentro de um diretório, com as colunas categóricas (status, canal,
+prioridade, departamento...) codificadas por dicionário. Os dicionários são
+os vocabulários fixos de `gerar_dados_dashboard`, então todos os lotes de
+tickets compartilham os mesmos códigos (o que permite gravar em streaming,
+inclusive no formato Arrow IPC). Metadados e configuração ficam em
+`metadata.json`.
+
+Requer pyarrow; só é importado quando a exportação colunar é pedida.
+"""
+import os
+
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from gerar_dados_dashboard import (
+    DEPARTAMENTOS, TIPOS_TICKETS, STATUS_TICKETS, PRIORIDADES, CANAIS, SUBCATEGORIAS
+)
+from serializacao_json import carregar_json, salvar_json
+
+FORMATOS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# Vocabulários fixos das colunas categóricas dos tickets
+VOCABULARIOS_TICKETS = {
+    "status": STATUS_TICKETS,
+    "canal": CANAIS,
+    "prioridade": PRIORIDADES,
+    "departamento": list(DEPARTAMENTOS),
+    "categoria": list(DEPARTAMENTOS),
+    "subcategoria": SUBCATEGORIAS,
+    "tipo": [tipo for tipos in TIPOS_TICKETS.values() for tipo in tipos]
+}
+
+# Colunas categóricas de agentes e métricas (dicionário calculado na gravação)
+CATEGORICAS_AGENTES = ("departamento", "codigo_departamento", "nivel_experiencia", "turno")
+CATEGORICAS_METRICAS = ("departamento", "codigo", "dia_semana")
+
+COLUNAS_DATA_TICKETS = ("data_criacao", "data_primeira_resposta", "data_resolucao")
+COLUNAS_DATA_AGENTES = ("data_admissao",)
+
+def _categorica(vocabulario):
+    """Tipo Arrow de uma coluna categórica com o vocabulário dado"""
+    return pa.dictionary(pa.int8() if len(vocabulario) < 128 else pa.int16(), pa.string())
+
+SCHEMA_TICKETS = pa.schema([
+    ("id", pa.string()),
+    ("numero_ticket", pa.int32()),
+    ("titulo", pa.string()),
+    ("descricao", pa.string()),
+    ("tipo", _categorica(VOCABULARIOS_TICKETS["tipo"])),
+    ("categoria", _categorica(VOCABULARIOS_TICKETS["categoria"])),
+    ("subcategoria", _categorica(VOCABULARIOS_TICKETS["subcategoria"])),
+    ("prioridade", _categorica(VOCABULARIOS_TICKETS["prioridade"])),
+    ("status", _categorica(VOCABULARIOS_TICKETS["status"])),
+    ("canal", _categorica(VOCABULARIOS_TICKETS["canal"])),
+    ("cliente_id", pa.string()),
+    ("cliente_nome", pa.string()),
+    ("agente_id", pa.string()),
+    ("agente_nome", pa.string()),
+    ("departamento", _categorica(VOCABULARIOS_TICKETS["departamento"])),
+    ("data_criacao", pa.timestamp("s")),
+    ("data_primeira_resposta", pa.timestamp("s")),
+    ("data_resolucao", pa.timestamp("s")),
+    ("tempo_resolucao_minutos", pa.int32()),
+    ("tempo_primeira_resposta_minutos", pa.int32()),
+    ("satisfacao_cliente", pa.float64()),
+    ("tags", pa.list_(pa.string())),
+    ("interacoes", pa.int8()),
+    ("reaberto", pa.bool_()),
+    ("sla_cumprido", pa.bool_())
+])
+
+def caminho_tabela(diretorio, nome, formato):
+    """Caminho do arquivo de uma tabela no diretório colunar"""
+    return os.path.join(diretorio, nome + FORMATOS[formato])
+
+def tabela_tickets(tickets):
+    """Converte um lote de tickets (dicts) em uma tabela Arrow com SCHEMA_TICKETS"""
+    colunas = []
+    for campo in SCHEMA_TICKETS:
+        valores = [t[campo.name] for t in tickets]
+        if campo.name in VOCABULARIOS_TICKETS:
+            vocabulario = VOCABULARIOS_TICKETS[campo.name]
+            codigos = {v: i for i, v in enumerate(vocabulario)}
+            colunas.append(pa.DictionaryArray.from_arrays(
+                pa.array([codigos[v] for v in valores], type=campo.type.index_type),
+                pa.array(vocabulario, type=pa.string())
+            ))
+        elif campo.name in COLUNAS_DATA_TICKETS:
+            colunas.append(pa.array(valores, type=pa.string()).cast(campo.type))
+        else:
+            colunas.append(pa.array(valores, type=campo.type))
+    return pa.Table.from_arrays(colunas, schema=SCHEMA_TICKETS)
+
+def _tabela(registros, categoricas=(), datas=()):
+    """Converte uma lista de dicts em tabela Arrow, codificando as categóricas
+    
+    As colunas em `datas` (strings ISO "AAAA-MM-DD") viram date32.
+    """
+    tabela = pa.Table.from_pylist(registros)
+    for nome in categoricas:
+        if nome in tabela.column_names:
+            indice = tabela.schema.get_field_index(nome)
+            tabela = tabela.set_column(indice, nome, tabela.column(nome).dictionary_encode())
+    for nome in datas:
+        if nome in tabela.column_names:
+            indice = tabela.schema.get_field_index(nome)
+            tabela = tabela.set_column(indice, nome, tabela.column(nome).cast(pa.date32()))
+    return tabela
+
+def _gravar(tabela, caminho, formato):
+    """Grava uma tabela completa no formato escolhido"""
+    if formato == "parquet":
+        pq.write_table(tabela, caminho)
+    else:
+        feather.write_feather(tabela, caminho, compression="uncompressed")
+
+def abrir_escritor_tickets(diretorio, formato="parquet"):
+    """Abre o arquivo de tickets para gravação em lotes (write_table/close)"""
+    os.makedirs(diretorio, exist_ok=True)
+    caminho = caminho_tabela(diretorio, "tickets", formato)
+    if formato == "parquet":
+        return pq.ParquetWriter(caminho, SCHEMA_TICKETS)
+    return ipc.new_file(caminho, SCHEMA_TICKETS)
+
+def escrever_lote_tickets(escritor, tickets):
+    """Grava um lote de tickets no escritor aberto por abrir_escritor_tickets"""
+    if tickets:
+        escritor.write_table(tabela_tickets(tickets))
+
+def exportar_tabelas(diretorio, formato, agentes, metricas, metadata, configuracao):
+    """Grava agentes, tabelas de métricas e metadados (tudo exceto os tickets)"""
+    os.makedirs(diretorio, exist_ok=True)
+    dados_volume = metricas["dados_volume"]
+    tabelas = {
+        "agentes": _tabela(agentes, CATEGORICAS_AGENTES, COLUNAS_DATA_AGENTES),
+        "metricas_agentes": _tabela(metricas["metricas_agentes"], CATEGORICAS_METRICAS),
+        "metricas_departamentos": _tabela(metricas["metricas_departamentos"], CATEGORICAS_METRICAS),
+        "volume_diario": _tabela(list(dados_volume["volume_diario"].values()), CATEGORICAS_METRICAS),
+        "volume_semanal": _tabela(list(dados_volume["volume_semanal"].values())),
+        "volume_mensal": _tabela(list(dados_volume["volume_mensal"].values())),
+        "resumo_geral": _tabela([metricas["resumo_geral"]])
+    }
+    for nome, tabela in tabelas.items():
+        _gravar(tabela, caminho_tabela(diretorio, nome, formato), formato)
+
+    salvar_json({"formato": formato, "metadata": metadata, "configuracao": configuracao},
+                os.path.join(diretorio, "metadata.json"), indentar=True)
+
+class EscritorColunar:
+    """Saída adicional do gerador: tickets em lotes e, ao final, as demais tabelas"""
+
+    def __init__(self, diretorio, formato="parquet"):
+        self.diretorio = diretorio
+        self.formato = formato
+        self._escritor = abrir_escritor_tickets(diretorio, formato)
+
+    def escrever_lote(self, tickets):
+        escrever_lote_tickets(self._escritor, tickets)
+
+    def finalizar(self, agentes, metricas, metadata, configuracao):
+        self._escritor.close()
+        exportar_tabelas(self.diretorio, self.formato, agentes, metricas, metadata, configuracao)
+
+def exportar_colunar(diretorio, dados_dashboard, formato="parquet"):
+    """Exporta a estrutura completa gerada por `main()` para o formato colunar"""
+    escritor = EscritorColunar(diretorio, formato)
+    escritor.escrever_lote(dados_dashboard["tickets"])
+    escritor.finalizar(
+        dados_dashboard["agentes"], dados_dashboard,
+        dados_dashboard["metadata"], dados_dashboard["configuracao"]
+    )
+
+def ler_metadados(diretorio):
+    """Lê metadata.json (formato, metadados e configuração)"""
+    return carregar_json(os.path.join(diretorio, "metadata.json"))
+
+def ler_tabela(diretorio, nome, colunas=None, formato=None):
+    """Lê uma tabela do diretório colunar, carregando só as `colunas` pedidas"""
+    if formato is None:
+        formato = ler_metadados(diretorio)["formato"]
+    caminho = caminho_tabela(diretorio, nome, formato)
+    if formato == "parquet":
+        return pq.read_table(caminho, columns=colunas)
+    return feather.read_table(caminho, columns=colunas, memory_map=True)
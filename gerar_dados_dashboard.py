@@ -1,12 +1,23 @@
-import json
+import argparse
+import math
+import os
 import random
-from datetime import datetime, timedelta
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import accumulate, islice
 from faker import Faker
-import uuid
+
+from perfil_etapas import MODOS_DETALHE, PerfilEtapas
+from serializacao_json import COMPRESSOES, abrir, com_compressao, para_texto, salvar_json, salvar_json_em_blocos
+from tickets_compactos import TicketsCompactos
+
+# Semente padrão para reprodutibilidade
+SEMENTE_PADRAO = 42
 
 # Configurar faker para português brasileiro
 fake = Faker('pt_BR')
-random.seed(42)  # Para reprodutibilidade
+random.seed(SEMENTE_PADRAO)  # Para reprodutibilidade
 
 # Configurações gerais
 START_DATE = datetime(2024, 2, 1)
@@ -88,21 +99,153 @@ PRIORIDADES = ["Baixa", "Normal", "Alta", "Crítica"]
 # Canais de atendimento
 CANAIS = ["Email", "Chat", "Telefone", "WhatsApp", "Portal", "Presencial"]
 
-def gerar_agentes():
-    """Gera dados dos agentes de atendimento"""
-    agentes = []
+# Tickets sorteados por dia (mínimo, máximo): mais tickets em dias úteis
+TICKETS_DIA_UTIL = (80, 120)
+TICKETS_FIM_DE_SEMANA = (20, 40)
+
+# Distribuição de agentes por departamento
+DISTRIBUICAO_AGENTES = {
+    "Suporte Técnico": 8,
+    "Atendimento Comercial": 12,
+    "Financeiro": 6,
+    "Onboarding": 5,
+    "Relacionamento": 4
+}
+
+# Arquivo de saída e tamanho padrão dos lotes no modo streaming
+ARQUIVO_SAIDA = '/home/ubuntu/dados_dashboard_atendimento.json'
+DIRETORIO_COLUNAR = '/home/ubuntu/dados_dashboard_colunar'
+DIRETORIO_SECOES = '/home/ubuntu/dados_dashboard_secoes'
+ARQUIVO_TICKETS_NDJSON = '/home/ubuntu/tickets_atendimento.ndjson'
+DIRETORIO_CUBO = '/home/ubuntu/dados_dashboard_cubo'
+ARQUIVO_SOMAS_PREFIXO = '/home/ubuntu/dados_dashboard_somas_prefixo.json'
+ARQUIVO_EVENTOS = '/home/ubuntu/eventos_tickets.ndjson'
+TAMANHO_LOTE_PADRAO = 10000
+
+# Caminhos das saídas de uma geração (ver definir_diretorio_saida)
+Saidas = namedtuple("Saidas", "arquivo colunar secoes tickets_ndjson cubo somas_prefixo eventos")
+SAIDAS_PADRAO = Saidas(ARQUIVO_SAIDA, DIRETORIO_COLUNAR, DIRETORIO_SECOES, ARQUIVO_TICKETS_NDJSON,
+                       DIRETORIO_CUBO, ARQUIVO_SOMAS_PREFIXO, ARQUIVO_EVENTOS)
+
+# Seções de primeiro nível do arquivo de saída
+SECOES = [
+    "metadata", "configuracao", "agentes", "tickets", "metricas_agentes",
+    "metricas_departamentos", "dados_volume", "resumo_geral"
+]
+
+# Etapas de main() (o número no início de cada mensagem) que --profile-etapa pode detalhar
+ETAPAS_PERFIL = ("1", "2", "2b", "3", "4", "5", "6", "7")
+ETAPAS_PERFIL_STREAMING = ("1", "2-5")
+
+# Dias de calendário gerados por tarefa no modo paralelo
+DIAS_POR_TAREFA = 7
+
+# Pools de textos pré-gerados: entradas por pool e quantas são renovadas por dia
+TAMANHO_POOL_TEXTOS = 1000
+RENOVACAO_POOL_DIA = 0
+
+# Quantidade de clientes (CLI0001 a CLI0500)
+NUM_CLIENTES = 500
+
+# Status considerados como ticket resolvido
+STATUS_RESOLVIDOS = ("Resolvido", "Fechado")
+
+# Medidas escalares (aditivas) dos acumuladores, na ordem de medidas_escalares();
+# também são as medidas das células do cubo OLAP e das somas de prefixo
+MEDIDAS_ESCALARES = (
+    "total_tickets", "tickets_resolvidos", "soma_resolucao", "n_resolucao",
+    "soma_satisfacao", "n_satisfacao", "n_sla", "sla_cumprido",
+    "soma_primeira_resposta", "n_primeira_resposta", "soma_interacoes", "tickets_reabertos"
+)
+
+# Subcategorias dos tickets
+SUBCATEGORIAS = ["Dúvida", "Problema", "Solicitação", "Reclamação"]
+
+# Pesos dos sorteios do laço de geração, já acumulados para random.choices(cum_weights=...)
+PESOS_ACUMULADOS = {
+    "hora_dia_util": list(accumulate([1,1,1,1,1,1,2,3,8,12,15,18,20,18,15,12,8,5,3,2,1,1,1,1])),
+    "prioridade_critica": list(accumulate([10, 30, 40, 20])),
+    "prioridade_padrao": list(accumulate([30, 50, 15, 5])),
+    "status_mais_de_30_dias": list(accumulate([5, 10, 5, 5, 35, 35, 5])),
+    "status_mais_de_7_dias": list(accumulate([10, 20, 15, 10, 25, 15, 5])),
+    "status_recente": list(accumulate([25, 30, 20, 15, 5, 3, 2])),
+    "canal": list(accumulate([30, 25, 20, 15, 8, 2])),
+    "sla_cumprido": list(accumulate([85, 15]))
+}
+
+# Faixas de resolução (fração do tempo médio do departamento) por prioridade
+FAIXAS_RESOLUCAO = {
+    "Crítica": (0.3, 0.7),
+    "Alta": (0.6, 1.2),
+    "Normal": (0.8, 1.5),
+    "Baixa": (1.2, 2.0)
+}
+
+# Sketches de quantis dos tempos: erro relativo máximo de cada quantil estimado
+# e percentis publicados nas métricas
+PRECISAO_SKETCH = 0.01
+PERCENTIS = (50, 90, 99)
+_GAMMA_SKETCH = (1 + PRECISAO_SKETCH) / (1 - PRECISAO_SKETCH)
+
+class Escala(namedtuple("Escala", "inicio fim tickets_dia_util tickets_fim_de_semana distribuicao_agentes")):
+    """Escala de uma geração: período (último dia incluído), faixas de tickets por dia e agentes por departamento"""
+    __slots__ = ()
     
-    # Distribuição de agentes por departamento
-    distribuicao = {
-        "Suporte Técnico": 8,
-        "Atendimento Comercial": 12,
-        "Financeiro": 6,
-        "Onboarding": 5,
-        "Relacionamento": 4
-    }
+    @property
+    def periodo(self):
+        """Período (início, fim) da escala"""
+        return self.inicio, self.fim
+
+# Escala padrão, a das configurações gerais acima
+ESCALA_PADRAO = Escala(START_DATE, END_DATE, TICKETS_DIA_UTIL, TICKETS_FIM_DE_SEMANA, DISTRIBUICAO_AGENTES)
+
+def volume_medio_diario(dia_util=TICKETS_DIA_UTIL, fim_de_semana=TICKETS_FIM_DE_SEMANA):
+    """Média esperada de tickets por dia para as faixas dadas (ou as padrão)"""
+    return (sum(dia_util) / 2 * 5 + sum(fim_de_semana) / 2 * 2) / 7
+
+def definir_escala(dias=None, tickets_por_dia=None, agentes=None):
+    """Devolve a Escala com o período, o volume médio diário e o número de agentes dados
+    
+    Cada parâmetro omitido fica com o valor de ESCALA_PADRAO. O volume escala
+    proporcionalmente as faixas de dias úteis e fins de semana; os agentes
+    mantêm a proporção entre departamentos de DISTRIBUICAO_AGENTES.
+    """
+    inicio, fim, dia_util, fim_de_semana, distribuicao = ESCALA_PADRAO
+    if dias is not None:
+        fim = inicio + timedelta(days=dias)
+    
+    if tickets_por_dia is not None:
+        fator = tickets_por_dia / volume_medio_diario(dia_util, fim_de_semana)
+        dia_util = tuple(max(1, round(n * fator)) for n in dia_util)
+        fim_de_semana = tuple(max(1, round(n * fator)) for n in fim_de_semana)
+    
+    if agentes is not None:
+        total = sum(distribuicao.values())
+        cotas = {dept: agentes * n / total for dept, n in distribuicao.items()}
+        distribuicao = {dept: int(cota) for dept, cota in cotas.items()}
+        # Maiores restos recebem os agentes que faltam
+        for dept in sorted(cotas, key=lambda d: cotas[d] - int(cotas[d]), reverse=True)[:agentes - sum(distribuicao.values())]:
+            distribuicao[dept] += 1
+    
+    return Escala(inicio, fim, dia_util, fim_de_semana, distribuicao)
+
+def definir_diretorio_saida(diretorio=None):
+    """Devolve as Saidas com todos os caminhos em `diretorio`, com os nomes de arquivo padrão
+    
+    Cria o diretório; sem `diretorio`, devolve SAIDAS_PADRAO. Permite várias
+    gerações em paralelo, cada uma no seu diretório.
+    """
+    if diretorio is None:
+        return SAIDAS_PADRAO
+    os.makedirs(diretorio, exist_ok=True)
+    return Saidas(*(os.path.join(diretorio, os.path.basename(c)) for c in SAIDAS_PADRAO))
+
+def gerar_agentes(escala=ESCALA_PADRAO):
+    """Gera dados dos agentes de atendimento (quantos por departamento a `escala` define)"""
+    agentes = []
     
     agent_id = 1
-    for dept, quantidade in distribuicao.items():
+    for dept, quantidade in escala.distribuicao_agentes.items():
         for i in range(quantidade):
             agente = {
                 "id": f"AGT{agent_id:03d}",
@@ -114,7 +257,7 @@ def gerar_agentes():
                     ["Junior", "Pleno", "Senior", "Especialista"],
                     weights=[30, 40, 25, 5]
                 )[0],
-                "data_admissao": fake.date_between(start_date='-3y', end_date='-6m'),
+                "data_admissao": fake.date_between(start_date='-3y', end_date='-6m').isoformat(),
                 "ativo": random.choices([True, False], weights=[95, 5])[0],
                 "turno": random.choice(["Manhã", "Tarde", "Noite"]),
                 "meta_tickets_dia": random.randint(15, 35),
@@ -126,336 +269,1159 @@ def gerar_agentes():
             agentes.append(agente)
             agent_id += 1
     
+    # Os tickets só vão para agentes ativos: com poucos agentes, o sorteio pode inativar todos
+    if agentes and not any(a["ativo"] for a in agentes):
+        agentes[0]["ativo"] = True
+    
     return agentes
 
-def gerar_tickets(agentes):
-    """Gera histórico de tickets"""
-    tickets = []
-    ticket_id = 1
+def novo_pool_textos(fake, tamanho=TAMANHO_POOL_TEXTOS, renovacao_dia=RENOVACAO_POOL_DIA, num_clientes=NUM_CLIENTES):
+    """Pré-gera pools limitados de frases de título, descrições e nomes de clientes
     
-    # Gerar tickets para cada dia do período
-    current_date = START_DATE
-    while current_date <= END_DATE:
-        # Variação sazonal (mais tickets em dias úteis)
-        if current_date.weekday() < 5:  # Segunda a sexta
-            base_tickets = random.randint(80, 120)
-        else:  # Fim de semana
-            base_tickets = random.randint(20, 40)
+    Cada cliente_id recebe um nome de empresa fixo. `renovacao_dia` define
+    quantas entradas de cada pool são substituídas por textos novos no
+    início de cada dia (0 mantém os pools fixos).
+    """
+    return {
+        "frases": [fake.catch_phrase() for _ in range(tamanho)],
+        "descricoes": [fake.text(max_nb_chars=200) for _ in range(tamanho)],
+        "clientes": [fake.company() for _ in range(num_clientes)],
+        "renovacao_dia": renovacao_dia
+    }
+
+def copiar_pool_textos(textos):
+    """Cópia rasa dos pools, para renovar sem alterar o original"""
+    return {k: list(v) if isinstance(v, list) else v for k, v in textos.items()}
+
+def renovar_pool_textos(textos, fake):
+    """Substitui entradas aleatórias das frases e descrições por textos novos"""
+    for chave, gerar in (("frases", fake.catch_phrase),
+                         ("descricoes", lambda: fake.text(max_nb_chars=200))):
+        itens = textos[chave]
+        for _ in range(min(textos["renovacao_dia"], len(itens))):
+            itens[fake.random.randrange(len(itens))] = gerar()
+
+def novo_amostrador(agentes):
+    """Pré-computa o que o laço de geração sorteia a cada ticket
+    
+    Guarda a lista de agentes ativos, os tipos de ticket de prioridade
+    crítica e as faixas inteiras de tempo de resolução por departamento e
+    prioridade.
+    """
+    return {
+        "agentes_ativos": [a for a in agentes if a["ativo"]],
+        "tipos_criticos": {
+            tipo for tipos in TIPOS_TICKETS.values() for tipo in tipos
+            if "Crítica" in tipo or "Bug" in tipo
+        },
+        "faixas_resolucao": {
+            (dept, prioridade): (int(info["tempo_medio_resolucao"] * fator_min), int(info["tempo_medio_resolucao"] * fator_max))
+            for dept, info in DEPARTAMENTOS.items()
+            for prioridade, (fator_min, fator_max) in FAIXAS_RESOLUCAO.items()
+        }
+    }
+
+def gerar_tickets_do_dia(agentes, current_date, primeiro_id=1, rng=random, fake=fake, textos=None, amostrador=None,
+                         escala=ESCALA_PADRAO):
+    """Gera os tickets de um único dia
+    
+    `rng` e `fake` permitem usar geradores próprios (ex.: semeados por dia no
+    modo paralelo); por padrão usam o `random` e o Faker globais do módulo.
+    Os textos são sorteados de `textos` (ver `novo_pool_textos`) com o
+    gerador do próprio Faker, sem alterar a sequência numérica de `rng`.
+    Os campos independentes entre si são sorteados em lote para o dia
+    inteiro, com os pesos acumulados de `PESOS_ACUMULADOS`. O volume do dia e
+    a idade dos tickets vêm de `escala`.
+    """
+    if textos is None:
+        textos = novo_pool_textos(fake)
+    if amostrador is None:
+        amostrador = novo_amostrador(agentes)
+    if textos["renovacao_dia"]:
+        renovar_pool_textos(textos, fake)
+    sortear = fake.random.choice
+    ticket_id = primeiro_id
+    dia_util = current_date.weekday() < 5  # Segunda a sexta
+    
+    # Variação sazonal (mais tickets em dias úteis)
+    if dia_util:
+        base_tickets = rng.randint(*escala.tickets_dia_util)
+    else:  # Fim de semana
+        base_tickets = rng.randint(*escala.tickets_fim_de_semana)
+    
+    # Sorteios em lote para o dia: agente (ativo), horário, canal, cliente...
+    # Horário comercial tem mais tickets em dias úteis
+    agentes_dia = rng.choices(amostrador["agentes_ativos"], k=base_tickets)
+    if dia_util:
+        horas = rng.choices(range(24), cum_weights=PESOS_ACUMULADOS["hora_dia_util"], k=base_tickets)
+    else:
+        horas = rng.choices(range(24), k=base_tickets)
+    minutos = rng.choices(range(60), k=base_tickets)
+    segundos = rng.choices(range(60), k=base_tickets)
+    subcategorias = rng.choices(SUBCATEGORIAS, k=base_tickets)
+    canais = rng.choices(CANAIS, cum_weights=PESOS_ACUMULADOS["canal"], k=base_tickets)
+    clientes = rng.choices(range(1, NUM_CLIENTES + 1), k=base_tickets)
+    interacoes = rng.choices(range(1, 9), k=base_tickets)
+    
+    for i in range(base_tickets):
+        agente = agentes_dia[i]
+        departamento = agente["departamento"]
         
-        # Variação por hora do dia
-        for _ in range(base_tickets):
-            # Escolher agente aleatório (ativo)
-            agente = random.choice([a for a in agentes if a["ativo"]])
-            departamento = agente["departamento"]
-            
-            # Hora de criação (horário comercial tem mais tickets)
-            if current_date.weekday() < 5:
-                hora_criacao = random.choices(
-                    range(24),
-                    weights=[1,1,1,1,1,1,2,3,8,12,15,18,20,18,15,12,8,5,3,2,1,1,1,1]
-                )[0]
-            else:
-                hora_criacao = random.randint(0, 23)
-            
-            data_criacao = current_date.replace(
-                hour=hora_criacao,
-                minute=random.randint(0, 59),
-                second=random.randint(0, 59)
-            )
-            
-            # Tipo de ticket baseado no departamento
-            tipo_ticket = random.choice(TIPOS_TICKETS[departamento])
-            
-            # Prioridade baseada no tipo e departamento
-            if "Crítica" in tipo_ticket or "Bug" in tipo_ticket:
-                prioridade = random.choices(PRIORIDADES, weights=[10, 30, 40, 20])[0]
-            else:
-                prioridade = random.choices(PRIORIDADES, weights=[30, 50, 15, 5])[0]
-            
-            # Status baseado na data (tickets mais antigos têm maior chance de estar fechados)
-            dias_desde_criacao = (END_DATE - data_criacao).days
-            if dias_desde_criacao > 30:
-                status = random.choices(STATUS_TICKETS, weights=[5, 10, 5, 5, 35, 35, 5])[0]
-            elif dias_desde_criacao > 7:
-                status = random.choices(STATUS_TICKETS, weights=[10, 20, 15, 10, 25, 15, 5])[0]
-            else:
-                status = random.choices(STATUS_TICKETS, weights=[25, 30, 20, 15, 5, 3, 2])[0]
-            
-            # Tempo de resolução baseado no departamento e prioridade
-            tempo_base = DEPARTAMENTOS[departamento]["tempo_medio_resolucao"]
-            if prioridade == "Crítica":
-                tempo_resolucao = random.randint(int(tempo_base * 0.3), int(tempo_base * 0.7))
-            elif prioridade == "Alta":
-                tempo_resolucao = random.randint(int(tempo_base * 0.6), int(tempo_base * 1.2))
-            elif prioridade == "Normal":
-                tempo_resolucao = random.randint(int(tempo_base * 0.8), int(tempo_base * 1.5))
-            else:  # Baixa
-                tempo_resolucao = random.randint(int(tempo_base * 1.2), int(tempo_base * 2.0))
-            
-            # Data de resolução (se aplicável)
-            data_resolucao = None
-            if status in ["Resolvido", "Fechado"]:
-                data_resolucao = data_criacao + timedelta(minutes=tempo_resolucao)
-                if data_resolucao > END_DATE:
-                    data_resolucao = END_DATE
-            
-            # Satisfação do cliente (apenas para tickets resolvidos/fechados)
-            satisfacao = None
-            if status in ["Resolvido", "Fechado"]:
-                # Satisfação baseada no tempo de resolução e agente
-                base_satisfacao = 4.0
-                if tempo_resolucao < tempo_base * 0.8:
-                    base_satisfacao = 4.5
-                elif tempo_resolucao > tempo_base * 1.5:
-                    base_satisfacao = 3.5
-                
-                satisfacao = round(random.uniform(base_satisfacao - 0.5, base_satisfacao + 0.5), 1)
-                satisfacao = max(1.0, min(5.0, satisfacao))
-            
-            ticket = {
-                "id": f"TKT{ticket_id:06d}",
-                "numero_ticket": ticket_id,
-                "titulo": f"{tipo_ticket} - {fake.catch_phrase()}",
-                "descricao": fake.text(max_nb_chars=200),
-                "tipo": tipo_ticket,
-                "categoria": departamento,
-                "subcategoria": random.choice(["Dúvida", "Problema", "Solicitação", "Reclamação"]),
-                "prioridade": prioridade,
-                "status": status,
-                "canal": random.choices(CANAIS, weights=[30, 25, 20, 15, 8, 2])[0],
-                "cliente_id": f"CLI{random.randint(1, 500):04d}",
-                "cliente_nome": fake.company(),
-                "agente_id": agente["id"],
-                "agente_nome": agente["nome"],
-                "departamento": departamento,
-                "data_criacao": data_criacao.isoformat(),
-                "data_primeira_resposta": (data_criacao + timedelta(minutes=random.randint(5, 120))).isoformat() if status != "Aberto" else None,
-                "data_resolucao": data_resolucao.isoformat() if data_resolucao else None,
-                "tempo_resolucao_minutos": tempo_resolucao if data_resolucao else None,
-                "tempo_primeira_resposta_minutos": random.randint(5, 120) if status != "Aberto" else None,
-                "satisfacao_cliente": satisfacao,
-                "tags": random.sample(["urgente", "vip", "recorrente", "escalado", "complexo", "simples"], k=random.randint(0, 3)),
-                "interacoes": random.randint(1, 8),
-                "reaberto": random.choice([True, False]) if status in ["Resolvido", "Fechado"] else False,
-                "sla_cumprido": random.choices([True, False], weights=[85, 15])[0] if data_resolucao else None
-            }
+        data_criacao = current_date.replace(
+            hour=horas[i],
+            minute=minutos[i],
+            second=segundos[i]
+        )
+        
+        # Tipo de ticket baseado no departamento
+        tipo_ticket = rng.choice(TIPOS_TICKETS[departamento])
+        
+        # Prioridade baseada no tipo e departamento
+        if tipo_ticket in amostrador["tipos_criticos"]:
+            prioridade = rng.choices(PRIORIDADES, cum_weights=PESOS_ACUMULADOS["prioridade_critica"])[0]
+        else:
+            prioridade = rng.choices(PRIORIDADES, cum_weights=PESOS_ACUMULADOS["prioridade_padrao"])[0]
+        
+        # Status baseado na data (tickets mais antigos têm maior chance de estar fechados)
+        dias_desde_criacao = (escala.fim - data_criacao).days
+        if dias_desde_criacao > 30:
+            status = rng.choices(STATUS_TICKETS, cum_weights=PESOS_ACUMULADOS["status_mais_de_30_dias"])[0]
+        elif dias_desde_criacao > 7:
+            status = rng.choices(STATUS_TICKETS, cum_weights=PESOS_ACUMULADOS["status_mais_de_7_dias"])[0]
+        else:
+            status = rng.choices(STATUS_TICKETS, cum_weights=PESOS_ACUMULADOS["status_recente"])[0]
+        resolvido = status in STATUS_RESOLVIDOS
+        
+        # Tempo de resolução baseado no departamento e prioridade
+        tempo_base = DEPARTAMENTOS[departamento]["tempo_medio_resolucao"]
+        tempo_resolucao = rng.randint(*amostrador["faixas_resolucao"][(departamento, prioridade)])
+        
+        # Data de resolução (se aplicável)
+        data_resolucao = None
+        if resolvido:
+            data_resolucao = data_criacao + timedelta(minutes=tempo_resolucao)
+            if data_resolucao > escala.fim:
+                data_resolucao = escala.fim
+        
+        # Satisfação do cliente (apenas para tickets resolvidos/fechados)
+        satisfacao = None
+        if resolvido:
+            # Satisfação baseada no tempo de resolução e agente
+            base_satisfacao = 4.0
+            if tempo_resolucao < tempo_base * 0.8:
+                base_satisfacao = 4.5
+            elif tempo_resolucao > tempo_base * 1.5:
+                base_satisfacao = 3.5
             
-            tickets.append(ticket)
-            ticket_id += 1
+            satisfacao = round(rng.uniform(base_satisfacao - 0.5, base_satisfacao + 0.5), 1)
+            satisfacao = max(1.0, min(5.0, satisfacao))
         
-        current_date += timedelta(days=1)
+        cliente_num = clientes[i]
+        
+        ticket = {
+            "id": f"TKT{ticket_id:06d}",
+            "numero_ticket": ticket_id,
+            "titulo": f"{tipo_ticket} - {sortear(textos['frases'])}",
+            "descricao": sortear(textos["descricoes"]),
+            "tipo": tipo_ticket,
+            "categoria": departamento,
+            "subcategoria": subcategorias[i],
+            "prioridade": prioridade,
+            "status": status,
+            "canal": canais[i],
+            "cliente_id": f"CLI{cliente_num:04d}",
+            "cliente_nome": textos["clientes"][(cliente_num - 1) % len(textos["clientes"])],
+            "agente_id": agente["id"],
+            "agente_nome": agente["nome"],
+            "departamento": departamento,
+            "data_criacao": data_criacao.isoformat(),
+            "data_primeira_resposta": (data_criacao + timedelta(minutes=rng.randint(5, 120))).isoformat() if status != "Aberto" else None,
+            "data_resolucao": data_resolucao.isoformat() if data_resolucao else None,
+            "tempo_resolucao_minutos": tempo_resolucao if data_resolucao else None,
+            "tempo_primeira_resposta_minutos": rng.randint(5, 120) if status != "Aberto" else None,
+            "satisfacao_cliente": satisfacao,
+            "tags": rng.sample(["urgente", "vip", "recorrente", "escalado", "complexo", "simples"], k=rng.randint(0, 3)),
+            "interacoes": interacoes[i],
+            "reaberto": rng.choice([True, False]) if resolvido else False,
+            "sla_cumprido": rng.choices([True, False], cum_weights=PESOS_ACUMULADOS["sla_cumprido"])[0] if data_resolucao else None
+        }
+        
+        yield ticket
+        ticket_id += 1
+
+def semente_do_dia(semente, dia):
+    """Semente de um dia, derivada só da semente base e da data"""
+    return f"{semente}-{dia.strftime('%Y-%m-%d')}"
+
+def gerar_tickets_do_dia_semeado(agentes, dia, semente, fake_dia, textos, amostrador, primeiro_id=1,
+                                 escala=ESCALA_PADRAO):
+    """Gera os tickets de um dia com geradores semeados por `semente_do_dia`
     
+    `fake_dia` é um Faker próprio, ressemeado aqui. Usado pelos modos
+    sequencial e paralelo, que assim produzem os mesmos tickets.
+    """
+    semente_dia = semente_do_dia(semente, dia)
+    fake_dia.seed_instance(semente_dia)
+    # Com renovação, cada dia parte dos pools originais (independe da ordem e da divisão em blocos)
+    textos = copiar_pool_textos(textos) if textos["renovacao_dia"] else textos
+    return gerar_tickets_do_dia(agentes, dia, primeiro_id, rng=random.Random(semente_dia), fake=fake_dia,
+                                textos=textos, amostrador=amostrador, escala=escala)
+
+def iterar_tickets(agentes, textos=None, semente=SEMENTE_PADRAO, escala=ESCALA_PADRAO):
+    """Gera o histórico de tickets do período de `escala` sob demanda, um ticket por vez
+    
+    Cada dia usa geradores semeados por `semente_do_dia`, como no modo
+    paralelo, então a saída não depende do número de processos.
+    """
+    if textos is None:
+        textos = novo_pool_textos(fake)
+    amostrador = novo_amostrador(agentes)
+    fake_dia = Faker('pt_BR')
+    ticket_id = 1
+    
+    # Gerar tickets para cada dia do período
+    for current_date in dias_do_periodo(escala.periodo):
+        for ticket in gerar_tickets_do_dia_semeado(agentes, current_date, semente, fake_dia, textos,
+                                                   amostrador, ticket_id, escala):
+            yield ticket
+            ticket_id += 1
+
+# Estado de cada processo do modo paralelo (preenchido por _iniciar_worker)
+_agentes_worker = None
+_semente_worker = None
+_fake_worker = None
+_textos_worker = None
+_amostrador_worker = None
+_escala_worker = None
+
+def _iniciar_worker(agentes, semente, textos, escala):
+    """Prepara um processo do pool com os agentes, a semente, os textos e a escala"""
+    global _agentes_worker, _semente_worker, _fake_worker, _textos_worker, _amostrador_worker, _escala_worker
+    _agentes_worker = agentes
+    _amostrador_worker = novo_amostrador(agentes)
+    _semente_worker = semente
+    _fake_worker = Faker('pt_BR')
+    _textos_worker = textos
+    _escala_worker = escala
+
+def _gerar_bloco_de_dias(dias):
+    """Gera os tickets de um bloco de dias, cada dia com sua própria semente"""
+    tickets = []
+    for dia in dias:
+        tickets.extend(gerar_tickets_do_dia_semeado(
+            _agentes_worker, dia, _semente_worker, _fake_worker, _textos_worker, _amostrador_worker,
+            escala=_escala_worker
+        ))
     return tickets
 
-def calcular_metricas_agentes(agentes, tickets):
-    """Calcula métricas de performance por agente"""
-    metricas = []
+def iterar_tickets_paralelo(agentes, workers, semente=SEMENTE_PADRAO, dias_por_tarefa=DIAS_POR_TAREFA, textos=None,
+                            escala=ESCALA_PADRAO):
+    """Gera o histórico de tickets do período de `escala` em um pool de processos
+    
+    O período é dividido em blocos de `dias_por_tarefa` dias e cada dia usa
+    geradores semeados por `semente_do_dia`, então a saída é a mesma para
+    qualquer número de processos. Os blocos são consumidos em ordem e os
+    ids TKT contíguos são reatribuídos aqui. No máximo 2 blocos por processo
+    ficam pendentes, mantendo a memória limitada no modo streaming.
+    Os pools de textos são gerados uma vez aqui e compartilhados.
+    """
+    if textos is None:
+        textos = novo_pool_textos(fake)
+    dias = list(dias_do_periodo(escala.periodo))
+    blocos = iter([dias[i:i + dias_por_tarefa] for i in range(0, len(dias), dias_por_tarefa)])
+    ticket_id = 1
+    
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_iniciar_worker,
+        initargs=(agentes, semente, textos, escala)
+    ) as executor:
+        pendentes = deque(executor.submit(_gerar_bloco_de_dias, bloco) for bloco in islice(blocos, workers * 2))
+        while pendentes:
+            tickets = pendentes.popleft().result()
+            proximo = next(blocos, None)
+            if proximo is not None:
+                pendentes.append(executor.submit(_gerar_bloco_de_dias, proximo))
+            
+            for ticket in tickets:
+                ticket["id"] = f"TKT{ticket_id:06d}"
+                ticket["numero_ticket"] = ticket_id
+                yield ticket
+                ticket_id += 1
+
+def _fonte_tickets(agentes, workers, semente, textos, escala):
+    """Escolhe o gerador de tickets sequencial ou paralelo"""
+    if workers:
+        return iterar_tickets_paralelo(agentes, workers, semente, textos=textos, escala=escala)
+    return iterar_tickets(agentes, textos, semente, escala)
+
+def gerar_tickets(agentes, workers=0, semente=SEMENTE_PADRAO, textos=None, compacto=False, escala=ESCALA_PADRAO):
+    """Gera histórico de tickets
+    
+    Com `workers` > 0 a geração é feita em paralelo; com ou sem processos,
+    cada dia usa sua própria semente e a saída é a mesma.
+    Com `compacto` os tickets são guardados em um TicketsCompactos (arrays
+    tipados, convertidos em dicts só quando lidos) em vez de uma lista.
+    """
+    if compacto:
+        return TicketsCompactos.de_tickets(_fonte_tickets(agentes, workers, semente, textos, escala))
+    return list(_fonte_tickets(agentes, workers, semente, textos, escala))
+
+def gerar_tickets_em_lotes(agentes, tamanho_lote=TAMANHO_LOTE_PADRAO, workers=0, semente=SEMENTE_PADRAO, textos=None,
+                           escala=ESCALA_PADRAO):
+    """Gera o histórico de tickets em lotes de até `tamanho_lote` tickets"""
+    lote = []
+    for ticket in _fonte_tickets(agentes, workers, semente, textos, escala):
+        lote.append(ticket)
+        if len(lote) >= tamanho_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+def novo_acumulador():
+    """Cria um acumulador vazio de contadores, somas e contagens de tickets"""
+    return {
+        **dict.fromkeys(MEDIDAS_ESCALARES, 0),
+        "sketch_resolucao": {},
+        "sketch_primeira_resposta": {},
+        "por_departamento": dict.fromkeys(DEPARTAMENTOS, 0),
+        "por_canal": dict.fromkeys(CANAIS, 0),
+        "por_prioridade": dict.fromkeys(PRIORIDADES, 0),
+        "por_status": dict.fromkeys(STATUS_TICKETS, 0)
+    }
+
+def medidas_escalares(t):
+    """Contribuição de um ticket às medidas escalares (na ordem de MEDIDAS_ESCALARES)
+    
+    Única definição dos critérios das métricas: tempo de resolução,
+    satisfação e SLA só contam em tickets resolvidos, e tempos ou notas
+    zerados/ausentes ficam fora das médias.
+    """
+    if t["status"] in STATUS_RESOLVIDOS:
+        resolvido = 1
+        resolucao = t["tempo_resolucao_minutos"] or 0
+        satisfacao = t["satisfacao_cliente"] or 0
+        n_sla = 0 if t["sla_cumprido"] is None else 1
+        sla_cumprido = 1 if t["sla_cumprido"] else 0
+    else:
+        resolvido = resolucao = satisfacao = n_sla = sla_cumprido = 0
+    primeira_resposta = t["tempo_primeira_resposta_minutos"] or 0
+    return (
+        1, resolvido, resolucao, 1 if resolucao else 0,
+        satisfacao, 1 if satisfacao else 0, n_sla, sla_cumprido,
+        primeira_resposta, 1 if primeira_resposta else 0, t["interacoes"], 1 if t["reaberto"] else 0
+    )
+
+def acumular_ticket(acc, t, peso=1, medidas=None):
+    """Incorpora um ticket ao acumulador (critérios de `medidas_escalares`)
+    
+    Com `peso=-1` retira a contribuição de um ticket já incorporado, o que
+    permite atualizar o acumulador quando o ticket muda (ex.: de status).
+    `medidas` evita recalcular `medidas_escalares(t)` quando o mesmo ticket
+    entra em vários acumuladores.
+    """
+    (total, resolvidos, soma_resolucao, n_resolucao, soma_satisfacao, n_satisfacao, n_sla, sla_cumprido,
+     soma_primeira_resposta, n_primeira_resposta, soma_interacoes, reabertos) = medidas or medidas_escalares(t)
+    acc["total_tickets"] += peso * total
+    acc["tickets_resolvidos"] += peso * resolvidos
+    acc["soma_resolucao"] += peso * soma_resolucao
+    acc["n_resolucao"] += peso * n_resolucao
+    acc["soma_satisfacao"] += peso * soma_satisfacao
+    acc["n_satisfacao"] += peso * n_satisfacao
+    acc["n_sla"] += peso * n_sla
+    acc["sla_cumprido"] += peso * sla_cumprido
+    acc["soma_primeira_resposta"] += peso * soma_primeira_resposta
+    acc["n_primeira_resposta"] += peso * n_primeira_resposta
+    acc["soma_interacoes"] += peso * soma_interacoes
+    acc["tickets_reabertos"] += peso * reabertos
+    if n_resolucao:
+        adicionar_ao_sketch(acc["sketch_resolucao"], soma_resolucao, peso)
+    if n_primeira_resposta:
+        adicionar_ao_sketch(acc["sketch_primeira_resposta"], soma_primeira_resposta, peso)
+    acc["por_departamento"][t["departamento"]] = acc["por_departamento"].get(t["departamento"], 0) + peso
+    acc["por_canal"][t["canal"]] = acc["por_canal"].get(t["canal"], 0) + peso
+    acc["por_prioridade"][t["prioridade"]] = acc["por_prioridade"].get(t["prioridade"], 0) + peso
+    acc["por_status"][t["status"]] = acc["por_status"].get(t["status"], 0) + peso
+
+def agrupar_tickets(tickets, chave):
+    """Percorre os tickets uma única vez e devolve {valor_da_chave: acumulador}
     
+    `chave` pode ser o nome de um campo do ticket ou uma função ticket -> chave.
+    """
+    extrair = chave if callable(chave) else (lambda t: t[chave])
+    grupos = {}
+    for t in tickets:
+        k = extrair(t)
+        acc = grupos.get(k)
+        if acc is None:
+            acc = grupos[k] = novo_acumulador()
+        acumular_ticket(acc, t)
+    return grupos
+
+def mesclar_acumuladores(destino, origem):
+    """Soma o acumulador `origem` em `destino` (acumuladores são mergeáveis)"""
+    for k, v in origem.items():
+        if isinstance(v, dict):
+            contagens = destino[k]
+            for kk, vv in v.items():
+                contagens[kk] = contagens.get(kk, 0) + vv
+        else:
+            destino[k] += v
+    return destino
+
+def media(soma, n):
+    """Média arredondada em 2 casas (0 quando não há amostras)"""
+    return round(soma / n, 2) if n else 0
+
+def balde_sketch(valor):
+    """Balde logarítmico de um valor positivo no sketch de quantis
+    
+    O balde i cobre (gamma^(i-1), gamma^i]; como chave de dict usa a string
+    do índice, para o sketch sobreviver a uma ida e volta por JSON.
+    """
+    return str(math.ceil(math.log(valor, _GAMMA_SKETCH)))
+
+def adicionar_ao_sketch(sketch, valor, peso=1, n=1):
+    """Conta `n` ocorrências de `valor` no sketch (`peso=-1` as retira)
+    
+    O sketch é um histograma de baldes logarítmicos (estilo DDSketch):
+    ocupa memória proporcional ao log da faixa de valores, não ao número de
+    tickets, e dois sketches se combinam somando as contagens (como os
+    demais contadores em mesclar_acumuladores).
+    """
+    balde = balde_sketch(valor)
+    sketch[balde] = sketch.get(balde, 0) + peso * n
+
+def percentis_sketch(sketch, percentis=PERCENTIS):
+    """Estimativas de {"p50": ..., "p90": ..., "p99": ...} (0 quando vazio)
+    
+    Cada estimativa fica a no máximo PRECISAO_SKETCH (relativo) do valor real.
+    """
+    baldes = sorted((int(balde), n) for balde, n in sketch.items() if n > 0)
+    total = sum(n for _, n in baldes)
+    resultado = {}
+    acumulado = 0
+    posicao = iter(baldes)
+    for p in percentis:
+        if not total:
+            resultado[f"p{p}"] = 0
+            continue
+        alvo = round(p / 100 * (total - 1))
+        while acumulado <= alvo:
+            balde, n = next(posicao)
+            acumulado += n
+        resultado[f"p{p}"] = round(2 * _GAMMA_SKETCH ** balde / (_GAMMA_SKETCH + 1), 2)
+    return resultado
+
+def calcular_metricas_agentes(agentes, tickets, periodo=None):
+    """Calcula métricas de performance por agente no `periodo` (início, fim) dos tickets"""
+    return _metricas_agentes(agentes, agrupar_tickets(tickets, "agente_id"), periodo)
+
+def _metricas_agentes(agentes, grupos, periodo=None):
+    """Monta as métricas por agente a partir dos acumuladores por agente_id
+    
+    `periodo` é o (início, fim) dos dados (padrão: o de ESCALA_PADRAO).
+    """
+    inicio, fim = periodo or ESCALA_PADRAO.periodo
+    dias = total_dias(periodo)
+    metricas = []
     for agente in agentes:
-        tickets_agente = [t for t in tickets if t["agente_id"] == agente["id"]]
-        tickets_resolvidos = [t for t in tickets_agente if t["status"] in ["Resolvido", "Fechado"]]
-        tickets_com_satisfacao = [t for t in tickets_resolvidos if t["satisfacao_cliente"]]
+        acc = grupos.get(agente["id"]) or novo_acumulador()
         
         # Métricas básicas
-        total_tickets = len(tickets_agente)
-        tickets_resolvidos_count = len(tickets_resolvidos)
+        total_tickets = acc["total_tickets"]
+        tickets_resolvidos_count = acc["tickets_resolvidos"]
         taxa_resolucao = (tickets_resolvidos_count / total_tickets * 100) if total_tickets > 0 else 0
         
-        # Tempo médio de resolução
-        tempos_resolucao = [t["tempo_resolucao_minutos"] for t in tickets_resolvidos if t["tempo_resolucao_minutos"]]
-        tempo_medio_resolucao = sum(tempos_resolucao) / len(tempos_resolucao) if tempos_resolucao else 0
-        
-        # Satisfação média
-        satisfacoes = [t["satisfacao_cliente"] for t in tickets_com_satisfacao]
-        satisfacao_media = sum(satisfacoes) / len(satisfacoes) if satisfacoes else 0
-        
         # SLA
-        tickets_com_sla = [t for t in tickets_resolvidos if t["sla_cumprido"] is not None]
-        sla_cumprido = sum(1 for t in tickets_com_sla if t["sla_cumprido"])
-        taxa_sla = (sla_cumprido / len(tickets_com_sla) * 100) if tickets_com_sla else 0
-        
-        # Tickets por canal
-        canais_count = {}
-        for canal in CANAIS:
-            canais_count[canal] = len([t for t in tickets_agente if t["canal"] == canal])
-        
-        # Tickets por prioridade
-        prioridades_count = {}
-        for prioridade in PRIORIDADES:
-            prioridades_count[prioridade] = len([t for t in tickets_agente if t["prioridade"] == prioridade])
+        taxa_sla = (acc["sla_cumprido"] / acc["n_sla"] * 100) if acc["n_sla"] else 0
         
         metrica = {
             "agente_id": agente["id"],
             "agente_nome": agente["nome"],
             "departamento": agente["departamento"],
-            "periodo": f"{START_DATE.strftime('%Y-%m-%d')} a {END_DATE.strftime('%Y-%m-%d')}",
+            "periodo": f"{inicio.strftime('%Y-%m-%d')} a {fim.strftime('%Y-%m-%d')}",
             "total_tickets": total_tickets,
             "tickets_resolvidos": tickets_resolvidos_count,
-            "tickets_abertos": len([t for t in tickets_agente if t["status"] == "Aberto"]),
-            "tickets_em_andamento": len([t for t in tickets_agente if t["status"] == "Em Andamento"]),
+            "tickets_abertos": acc["por_status"]["Aberto"],
+            "tickets_em_andamento": acc["por_status"]["Em Andamento"],
             "taxa_resolucao_pct": round(taxa_resolucao, 2),
-            "tempo_medio_resolucao_minutos": round(tempo_medio_resolucao, 2),
-            "tempo_medio_primeira_resposta_minutos": round(sum([t["tempo_primeira_resposta_minutos"] for t in tickets_agente if t["tempo_primeira_resposta_minutos"]]) / len([t for t in tickets_agente if t["tempo_primeira_resposta_minutos"]]), 2) if any(t["tempo_primeira_resposta_minutos"] for t in tickets_agente) else 0,
-            "satisfacao_media": round(satisfacao_media, 2),
+            "tempo_medio_resolucao_minutos": media(acc["soma_resolucao"], acc["n_resolucao"]),
+            "tempo_medio_primeira_resposta_minutos": media(acc["soma_primeira_resposta"], acc["n_primeira_resposta"]),
+            "satisfacao_media": media(acc["soma_satisfacao"], acc["n_satisfacao"]),
             "taxa_sla_pct": round(taxa_sla, 2),
-            "tickets_reabertos": len([t for t in tickets_agente if t["reaberto"]]),
-            "media_interacoes_por_ticket": round(sum([t["interacoes"] for t in tickets_agente]) / len(tickets_agente), 2) if tickets_agente else 0,
-            "tickets_por_canal": canais_count,
-            "tickets_por_prioridade": prioridades_count,
-            "produtividade_diaria": round(total_tickets / TOTAL_DAYS, 2),
-            "meta_atingida": total_tickets >= (agente["meta_tickets_dia"] * TOTAL_DAYS * 0.8)
+            "tickets_reabertos": acc["tickets_reabertos"],
+            "percentis_resolucao_minutos": percentis_sketch(acc["sketch_resolucao"]),
+            "percentis_primeira_resposta_minutos": percentis_sketch(acc["sketch_primeira_resposta"]),
+            "media_interacoes_por_ticket": media(acc["soma_interacoes"], total_tickets),
+            "tickets_por_canal": {canal: acc["por_canal"][canal] for canal in CANAIS},
+            "tickets_por_prioridade": {p: acc["por_prioridade"][p] for p in PRIORIDADES},
+            "produtividade_diaria": round(total_tickets / dias, 2),
+            "meta_atingida": total_tickets >= (agente["meta_tickets_dia"] * dias * 0.8)
         }
         
         metricas.append(metrica)
     
     return metricas
 
-def calcular_metricas_departamento(tickets):
-    """Calcula métricas por departamento"""
+def calcular_metricas_departamento(tickets, periodo=None):
+    """Calcula métricas por departamento no `periodo` (início, fim) dos tickets"""
+    return _metricas_departamento(agrupar_tickets(tickets, "departamento"), periodo)
+
+def _metricas_departamento(grupos, periodo=None):
+    """Monta as métricas por departamento a partir dos acumuladores por departamento"""
+    dias = total_dias(periodo)
     metricas_dept = []
-    
     for dept_nome in DEPARTAMENTOS.keys():
-        tickets_dept = [t for t in tickets if t["departamento"] == dept_nome]
-        tickets_resolvidos = [t for t in tickets_dept if t["status"] in ["Resolvido", "Fechado"]]
-        
-        total_tickets = len(tickets_dept)
-        if total_tickets == 0:
+        acc = grupos.get(dept_nome)
+        if acc is None:
             continue
-            
+        
+        total_tickets = acc["total_tickets"]
         metrica = {
             "departamento": dept_nome,
             "codigo": DEPARTAMENTOS[dept_nome]["codigo"],
             "total_tickets": total_tickets,
-            "tickets_resolvidos": len(tickets_resolvidos),
-            "taxa_resolucao_pct": round(len(tickets_resolvidos) / total_tickets * 100, 2),
-            "tempo_medio_resolucao_minutos": round(sum([t["tempo_resolucao_minutos"] for t in tickets_resolvidos if t["tempo_resolucao_minutos"]]) / len([t for t in tickets_resolvidos if t["tempo_resolucao_minutos"]]), 2) if any(t["tempo_resolucao_minutos"] for t in tickets_resolvidos) else 0,
-            "satisfacao_media": round(sum([t["satisfacao_cliente"] for t in tickets_resolvidos if t["satisfacao_cliente"]]) / len([t for t in tickets_resolvidos if t["satisfacao_cliente"]]), 2) if any(t["satisfacao_cliente"] for t in tickets_resolvidos) else 0,
-            "tickets_por_prioridade": {p: len([t for t in tickets_dept if t["prioridade"] == p]) for p in PRIORIDADES},
-            "tickets_por_status": {s: len([t for t in tickets_dept if t["status"] == s]) for s in STATUS_TICKETS},
-            "volume_diario_medio": round(total_tickets / TOTAL_DAYS, 2)
+            "tickets_resolvidos": acc["tickets_resolvidos"],
+            "taxa_resolucao_pct": round(acc["tickets_resolvidos"] / total_tickets * 100, 2),
+            "tempo_medio_resolucao_minutos": media(acc["soma_resolucao"], acc["n_resolucao"]),
+            "satisfacao_media": media(acc["soma_satisfacao"], acc["n_satisfacao"]),
+            "percentis_resolucao_minutos": percentis_sketch(acc["sketch_resolucao"]),
+            "percentis_primeira_resposta_minutos": percentis_sketch(acc["sketch_primeira_resposta"]),
+            "tickets_por_prioridade": {p: acc["por_prioridade"][p] for p in PRIORIDADES},
+            "tickets_por_status": {s: acc["por_status"][s] for s in STATUS_TICKETS},
+            "volume_diario_medio": round(total_tickets / dias, 2)
         }
         
         metricas_dept.append(metrica)
     
     return metricas_dept
 
-def gerar_dados_volume_temporal(tickets):
-    """Gera dados de volume por período"""
+def periodo_de_metadata(metadata):
+    """Período (início, fim) de dados já gerados, lido de `metadata["periodo_dados"]`
+    
+    Quem monta métricas fora do gerador (estado incremental, banco SQL...)
+    passa esse período às funções `_metricas_*`/`_dados_volume` em vez de
+    depender do período padrão deste módulo.
+    """
+    periodo = metadata["periodo_dados"]
+    return datetime.fromisoformat(periodo["inicio"]), datetime.fromisoformat(periodo["fim"])
+
+def total_dias(periodo=None):
+    """Dias entre o início e o fim do período (TOTAL_DAYS no período padrão)"""
+    inicio, fim = periodo or ESCALA_PADRAO.periodo
+    return (fim - inicio).days
+
+def dias_do_periodo(periodo=None):
+    """Itera as datas (datetime) do período (padrão: START_DATE a END_DATE), inclusive"""
+    inicio, fim = periodo or ESCALA_PADRAO.periodo
+    current_date = inicio
+    while current_date <= fim:
+        yield current_date
+        current_date += timedelta(days=1)
+
+def meses_do_periodo(periodo=None):
+    """Lista os meses ("AAAA-MM") cobertos pelo período"""
+    meses = []
+    for dia in dias_do_periodo(periodo):
+        mes_str = dia.strftime('%Y-%m')
+        if not meses or meses[-1] != mes_str:
+            meses.append(mes_str)
+    return meses
+
+def chave_semana(data):
+    """Chave da semana ISO ("AAAA-Www") de uma data"""
+    ano, semana, _ = data.isocalendar()
+    return f"{ano}-W{semana:02d}"
+
+def construir_indice_temporal(tickets):
+    """Indexa os tickets em baldes por dia, semana ISO e mês
+    
+    Os tickets são percorridos uma única vez e acumulados no balde do dia;
+    as semanas e os meses são obtidos mesclando os acumuladores diários.
+    """
+    return _completar_indice_temporal(agrupar_tickets(tickets, chave_dia))
+
+def chave_dia(t):
+    """Chave do dia ("AAAA-MM-DD") de criação de um ticket"""
+    return t["data_criacao"][:10]
+
+def _completar_indice_temporal(por_dia):
+    """Deriva os baldes semanais e mensais a partir dos acumuladores diários"""
+    por_semana = {}
+    por_mes = {}
+    for dia in sorted(por_dia):
+        data = date.fromisoformat(dia)
+        for baldes, k in ((por_semana, chave_semana(data)), (por_mes, dia[:7])):
+            if k not in baldes:
+                baldes[k] = novo_acumulador()
+            mesclar_acumuladores(baldes[k], por_dia[dia])
+    
+    return {"dia": por_dia, "semana": por_semana, "mes": por_mes}
+
+def _volume_mensal(indice, periodo=None):
+    """Monta o volume mensal a partir do índice temporal"""
+    volume_mensal = {}
+    for mes_str in meses_do_periodo(periodo):
+        acc = indice["mes"].get(mes_str) or novo_acumulador()
+        
+        volume_mensal[mes_str] = {
+            "mes": mes_str,
+            "total_tickets": acc["total_tickets"],
+            "tickets_resolvidos": acc["tickets_resolvidos"],
+            "satisfacao_media": media(acc["soma_satisfacao"], acc["n_satisfacao"]),
+            "tempo_medio_resolucao": media(acc["soma_resolucao"], acc["n_resolucao"]),
+            "percentis_resolucao_minutos": percentis_sketch(acc["sketch_resolucao"]),
+            "percentis_primeira_resposta_minutos": percentis_sketch(acc["sketch_primeira_resposta"])
+        }
+    
+    return volume_mensal
+
+def calcular_volume_mensal(tickets, periodo=None):
+    """Calcula o volume mensal de tickets nos meses do `periodo`"""
+    return _volume_mensal(construir_indice_temporal(tickets), periodo)
+
+def gerar_dados_volume_temporal(tickets, volume_mensal=None, periodo=None):
+    """Gera dados de volume por período (diário, semanal e mensal) nos dias do `periodo`
+    
+    `volume_mensal` pode ser passado já calculado (ex.: pelo backend colunar).
+    """
+    return _dados_volume(construir_indice_temporal(tickets), volume_mensal, periodo)
+
+def _dados_volume(indice, volume_mensal=None, periodo=None):
+    """Monta os volumes diário, semanal e mensal do período a partir do índice temporal"""
     volume_diario = {}
     volume_semanal = {}
-    volume_mensal = {}
     
-    # Volume diário
-    current_date = START_DATE
-    while current_date <= END_DATE:
+    # Volume diário e semanal
+    for current_date in dias_do_periodo(periodo):
         date_str = current_date.strftime('%Y-%m-%d')
-        tickets_dia = [t for t in tickets if t["data_criacao"].startswith(date_str)]
+        acc = indice["dia"].get(date_str) or novo_acumulador()
         
         volume_diario[date_str] = {
             "data": date_str,
             "dia_semana": current_date.strftime('%A'),
-            "total_tickets": len(tickets_dia),
-            "tickets_por_departamento": {dept: len([t for t in tickets_dia if t["departamento"] == dept]) for dept in DEPARTAMENTOS.keys()},
-            "tickets_por_canal": {canal: len([t for t in tickets_dia if t["canal"] == canal]) for canal in CANAIS},
-            "tickets_por_prioridade": {p: len([t for t in tickets_dia if t["prioridade"] == p]) for p in PRIORIDADES}
+            "total_tickets": acc["total_tickets"],
+            "tickets_por_departamento": {dept: acc["por_departamento"][dept] for dept in DEPARTAMENTOS.keys()},
+            "tickets_por_canal": {canal: acc["por_canal"][canal] for canal in CANAIS},
+            "tickets_por_prioridade": {p: acc["por_prioridade"][p] for p in PRIORIDADES}
         }
         
-        current_date += timedelta(days=1)
+        semana_str = chave_semana(current_date)
+        if semana_str not in volume_semanal:
+            acc_semana = indice["semana"].get(semana_str) or novo_acumulador()
+            inicio_semana = current_date - timedelta(days=current_date.weekday())
+            volume_semanal[semana_str] = {
+                "semana": semana_str,
+                "inicio": inicio_semana.strftime('%Y-%m-%d'),
+                "fim": (inicio_semana + timedelta(days=6)).strftime('%Y-%m-%d'),
+                "total_tickets": acc_semana["total_tickets"],
+                "tickets_resolvidos": acc_semana["tickets_resolvidos"],
+                "satisfacao_media": media(acc_semana["soma_satisfacao"], acc_semana["n_satisfacao"]),
+                "tempo_medio_resolucao": media(acc_semana["soma_resolucao"], acc_semana["n_resolucao"]),
+                "tickets_por_departamento": {dept: acc_semana["por_departamento"][dept] for dept in DEPARTAMENTOS.keys()},
+                "tickets_por_canal": {canal: acc_semana["por_canal"][canal] for canal in CANAIS},
+                "tickets_por_prioridade": {p: acc_semana["por_prioridade"][p] for p in PRIORIDADES}
+            }
     
     # Volume mensal
-    for mes in range(2, 9):  # Fevereiro a Agosto
-        if mes > 8:
-            break
-        mes_str = f"2024-{mes:02d}"
-        tickets_mes = [t for t in tickets if t["data_criacao"].startswith(mes_str)]
-        
-        volume_mensal[mes_str] = {
-            "mes": mes_str,
-            "total_tickets": len(tickets_mes),
-            "tickets_resolvidos": len([t for t in tickets_mes if t["status"] in ["Resolvido", "Fechado"]]),
-            "satisfacao_media": round(sum([t["satisfacao_cliente"] for t in tickets_mes if t["satisfacao_cliente"]]) / len([t for t in tickets_mes if t["satisfacao_cliente"]]), 2) if any(t["satisfacao_cliente"] for t in tickets_mes) else 0,
-            "tempo_medio_resolucao": round(sum([t["tempo_resolucao_minutos"] for t in tickets_mes if t["tempo_resolucao_minutos"]]) / len([t for t in tickets_mes if t["tempo_resolucao_minutos"]]), 2) if any(t["tempo_resolucao_minutos"] for t in tickets_mes) else 0
-        }
+    if volume_mensal is None:
+        volume_mensal = _volume_mensal(indice, periodo)
     
     return {
         "volume_diario": volume_diario,
+        "volume_semanal": volume_semanal,
         "volume_mensal": volume_mensal
     }
 
-def main():
-    print("Gerando dados fictícios para dashboard de atendimento...")
+def calcular_resumo_geral(agentes, tickets):
+    """Calcula o resumo geral (KPIs consolidados)"""
+    acc = novo_acumulador()
+    for t in tickets:
+        acumular_ticket(acc, t)
+    return _resumo_geral(agentes, acc)
+
+def _resumo_geral(agentes, acc):
+    """Monta o resumo geral a partir do acumulador de todos os tickets"""
+    return {
+        "total_tickets": acc["total_tickets"],
+        "tickets_resolvidos": acc["tickets_resolvidos"],
+        "taxa_resolucao_geral": round(acc["tickets_resolvidos"] / acc["total_tickets"] * 100, 2) if acc["total_tickets"] else 0,
+        "satisfacao_geral": media(acc["soma_satisfacao"], acc["n_satisfacao"]),
+        "tempo_medio_resolucao_geral": media(acc["soma_resolucao"], acc["n_resolucao"]),
+        "agentes_ativos": len([a for a in agentes if a["ativo"]]),
+        "departamentos_ativos": len(DEPARTAMENTOS)
+    }
+
+def novo_estado_agregacao():
+    """Cria o estado mergeável usado para agregar tickets lote a lote"""
+    return {"agente": {}, "departamento": {}, "dia": {}}
+
+def atualizar_estado_agregacao(estado, tickets, peso=1):
+    """Incorpora um lote de tickets ao estado de agregação
     
-    # Gerar dados
-    print("1. Gerando agentes...")
-    agentes = gerar_agentes()
-    
-    print("2. Gerando tickets...")
-    tickets = gerar_tickets(agentes)
-    
-    print("3. Calculando métricas por agente...")
-    metricas_agentes = calcular_metricas_agentes(agentes, tickets)
-    
-    print("4. Calculando métricas por departamento...")
-    metricas_departamentos = calcular_metricas_departamento(tickets)
-    
-    print("5. Gerando dados de volume temporal...")
-    dados_volume = gerar_dados_volume_temporal(tickets)
-    
-    # Estrutura final dos dados
-    dados_dashboard = {
-        "metadata": {
-            "data_geracao": datetime.now().isoformat(),
-            "periodo_dados": {
-                "inicio": START_DATE.isoformat(),
-                "fim": END_DATE.isoformat()
-            },
-            "total_registros": {
-                "agentes": len(agentes),
-                "tickets": len(tickets),
-                "departamentos": len(DEPARTAMENTOS)
-            },
-            "versao": "1.0"
+    Com `peso=-1` retira os tickets; grupos que ficam vazios são descartados.
+    """
+    for t in tickets:
+        medidas = medidas_escalares(t)
+        for grupos, k in ((estado["agente"], t["agente_id"]),
+                          (estado["departamento"], t["departamento"]),
+                          (estado["dia"], chave_dia(t))):
+            acc = grupos.get(k)
+            if acc is None:
+                acc = grupos[k] = novo_acumulador()
+            acumular_ticket(acc, t, peso, medidas)
+            if acc["total_tickets"] == 0:
+                del grupos[k]
+    return estado
+
+def metricas_do_estado(agentes, estado, periodo=None):
+    """Monta todas as estruturas de métricas do período a partir do estado de agregação"""
+    indice = _completar_indice_temporal(estado["dia"])
+    geral = novo_acumulador()
+    for acc in indice["mes"].values():
+        mesclar_acumuladores(geral, acc)
+    
+    return {
+        "metricas_agentes": _metricas_agentes(agentes, estado["agente"], periodo),
+        "metricas_departamentos": _metricas_departamento(estado["departamento"], periodo),
+        "dados_volume": _dados_volume(indice, periodo=periodo),
+        "resumo_geral": _resumo_geral(agentes, geral)
+    }
+
+def montar_metadata(agentes, total_tickets, periodo=None):
+    """Monta o bloco de metadados do arquivo de saída"""
+    inicio, fim = periodo or ESCALA_PADRAO.periodo
+    return {
+        "data_geracao": datetime.now().isoformat(),
+        "periodo_dados": {
+            "inicio": inicio.isoformat(),
+            "fim": fim.isoformat()
         },
-        "configuracao": {
-            "departamentos": DEPARTAMENTOS,
-            "tipos_tickets": TIPOS_TICKETS,
-            "status_possiveis": STATUS_TICKETS,
-            "prioridades": PRIORIDADES,
-            "canais_atendimento": CANAIS
+        "total_registros": {
+            "agentes": len(agentes),
+            "tickets": total_tickets,
+            "departamentos": len(DEPARTAMENTOS)
         },
-        "agentes": agentes,
-        "tickets": tickets,
-        "metricas_agentes": metricas_agentes,
-        "metricas_departamentos": metricas_departamentos,
-        "dados_volume": dados_volume,
-        "resumo_geral": {
-            "total_tickets": len(tickets),
-            "tickets_resolvidos": len([t for t in tickets if t["status"] in ["Resolvido", "Fechado"]]),
-            "taxa_resolucao_geral": round(len([t for t in tickets if t["status"] in ["Resolvido", "Fechado"]]) / len(tickets) * 100, 2),
-            "satisfacao_geral": round(sum([t["satisfacao_cliente"] for t in tickets if t["satisfacao_cliente"]]) / len([t for t in tickets if t["satisfacao_cliente"]]), 2) if any(t["satisfacao_cliente"] for t in tickets) else 0,
-            "tempo_medio_resolucao_geral": round(sum([t["tempo_resolucao_minutos"] for t in tickets if t["tempo_resolucao_minutos"]]) / len([t for t in tickets if t["tempo_resolucao_minutos"]]), 2) if any(t["tempo_resolucao_minutos"] for t in tickets) else 0,
-            "agentes_ativos": len([a for a in agentes if a["ativo"]]),
-            "departamentos_ativos": len(DEPARTAMENTOS)
-        }
+        "versao": "1.0"
+    }
+
+def montar_configuracao():
+    """Monta o bloco de configuração do arquivo de saída"""
+    return {
+        "departamentos": DEPARTAMENTOS,
+        "tipos_tickets": TIPOS_TICKETS,
+        "status_possiveis": STATUS_TICKETS,
+        "prioridades": PRIORIDADES,
+        "canais_atendimento": CANAIS
     }
+
+def salvar_dados(dados_dashboard, caminho, compacto=False):
+    """Grava a estrutura completa do dashboard em um único arquivo JSON
+    
+    Indentado por padrão ou compacto; comprimido se `caminho` terminar em
+    .gz ou .zst (ver serializacao_json). Tickets em um TicketsCompactos são
+    convertidos e gravados em lotes, sem montar a lista completa de dicts.
+    """
+    tickets = dados_dashboard.get("tickets")
+    if isinstance(tickets, TicketsCompactos):
+        salvar_json_em_blocos(dados_dashboard, caminho, indentar=not compacto,
+                              blocos={"tickets": tickets.blocos()})
+    else:
+        salvar_json(dados_dashboard, caminho, indentar=not compacto)
+
+def gravar_secoes(diretorio, secoes):
+    """Grava cada seção de `secoes` ({nome: valor}) em `<diretorio>/<nome>.json`"""
+    os.makedirs(diretorio, exist_ok=True)
+    for secao, valor in secoes.items():
+        salvar_json(valor, os.path.join(diretorio, f"{secao}.json"))
+
+class EscritorSecoes:
+    """Saída adicional do gerador: um arquivo JSON por seção de primeiro nível
+    
+    Permite que os consumidores leiam só as seções de que precisam (ex.:
+    o dashboard executivo não precisa de `tickets.json`). Os tickets são
+    gravados lote a lote, um por linha dentro do array.
+    """
+    
+    def __init__(self, diretorio):
+        self.diretorio = diretorio
+        os.makedirs(diretorio, exist_ok=True)
+        self._tickets = open(os.path.join(diretorio, "tickets.json"), 'w', encoding='utf-8')
+        self._tickets.write('[')
+        self._total = 0
+    
+    def escrever_lote(self, tickets):
+        if tickets:
+            self._tickets.write(("\n" if self._total == 0 else ",\n") +
+                                ",\n".join(para_texto(t) for t in tickets))
+            self._total += len(tickets)
+    
+    def finalizar(self, agentes, metricas, metadata, configuracao):
+        self._tickets.write('\n]\n')
+        self._tickets.close()
+        gravar_secoes(self.diretorio, {"metadata": metadata, "configuracao": configuracao,
+                                       "agentes": agentes, **metricas})
+
+class EscritorNDJSON:
+    """Saída adicional do gerador: tickets em NDJSON, um JSON por linha
+    
+    Cada lote é gravado e descarregado no disco assim que produzido, então
+    consumidores podem acompanhar o arquivo (ver serializacao_json.ler_ndjson)
+    enquanto a geração continua.
+    """
+    
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._arquivo = abrir(caminho, "wt")
+    
+    def escrever_lote(self, tickets):
+        self._arquivo.writelines(para_texto(t) + "\n" for t in tickets)
+        self._arquivo.flush()
+    
+    def finalizar(self, agentes, metricas, metadata, configuracao):
+        self._arquivo.close()
+
+def gerar_em_streaming(agentes, caminho, tamanho_lote=TAMANHO_LOTE_PADRAO, workers=0, semente=SEMENTE_PADRAO,
+                       textos=None, escritores=(), escala=ESCALA_PADRAO):
+    """Gera os tickets em lotes gravando-os direto no disco
+    
+    Apenas o estado de agregação (proporcional a agentes e dias, não a
+    tickets) fica em memória. O arquivo tem as mesmas seções do modo
+    padrão, em JSON compacto (um ticket por linha); "metadata" e as
+    métricas são gravadas após o array de tickets. Com extensão .gz ou
+    .zst em `caminho`, a saída é comprimida durante a escrita.
+    Cada lote também é repassado aos `escritores` adicionais (ex.:
+    EscritorSecoes, exportar_colunar.EscritorColunar). Retorna
+    (total_tickets, metricas).
+    """
+    estado = novo_estado_agregacao()
+    total_tickets = 0
+    
+    with abrir(caminho, "wt") as f:
+        f.write('{\n"configuracao": ')
+        f.write(para_texto(montar_configuracao()))
+        f.write(',\n"agentes": ')
+        f.write(para_texto(agentes))
+        f.write(',\n"tickets": [')
+        
+        for lote in gerar_tickets_em_lotes(agentes, tamanho_lote, workers, semente, textos, escala):
+            atualizar_estado_agregacao(estado, lote)
+            for escritor in escritores:
+                escritor.escrever_lote(lote)
+            f.write(("\n" if total_tickets == 0 else ",\n") +
+                    ",\n".join(para_texto(t) for t in lote))
+            total_tickets += len(lote)
+        
+        metricas = metricas_do_estado(agentes, estado, escala.periodo)
+        metadata = montar_metadata(agentes, total_tickets, escala.periodo)
+        f.write('\n],\n"metadata": ')
+        f.write(para_texto(metadata))
+        for chave, valor in metricas.items():
+            f.write(f',\n"{chave}": ')
+            f.write(para_texto(valor))
+        f.write('\n}\n')
+    
+    for escritor in escritores:
+        escritor.finalizar(agentes, metricas, metadata, montar_configuracao())
+    
+    return total_tickets, metricas
+
+def criar_escritores(args, saidas=SAIDAS_PADRAO):
+    """Cria as saídas adicionais pedidas na linha de comando, nos caminhos de `saidas`"""
+    escritores = []
+    if args.ndjson:
+        escritores.append(EscritorNDJSON(com_compressao(saidas.tickets_ndjson, args.compressao)))
+    if args.secoes:
+        escritores.append(EscritorSecoes(saidas.secoes))
+    if args.colunar:
+        import exportar_colunar
+        escritores.append(exportar_colunar.EscritorColunar(saidas.colunar, args.colunar))
+    if args.cubo:
+        import cubo_olap
+        escritores.append(cubo_olap.EscritorCubo(saidas.cubo))
+    if args.somas_prefixo:
+        import somas_prefixo
+        escritores.append(somas_prefixo.EscritorSomasPrefixo(saidas.somas_prefixo))
+    if args.estado:
+        import atualizacao_incremental
+        escritores.append(atualizacao_incremental.EscritorEstado(
+            atualizacao_incremental.caminho_estado(saidas.arquivo)))
+    return escritores
+
+def parse_args(argv=None):
+    """Lê as opções de linha de comando
     
-    # Salvar dados
-    print("6. Salvando dados em JSON...")
-    with open('/home/ubuntu/dados_dashboard_atendimento.json', 'w', encoding='utf-8') as f:
-        json.dump(dados_dashboard, f, ensure_ascii=False, indent=2, default=str)
+    Sem abreviações (`--semen` por `--semente`): o serviço de geração reserva
+    opções pelo nome completo, e um prefixo as contornaria.
+    """
+    parser = argparse.ArgumentParser(description="Gera dados fictícios para o dashboard de atendimento",
+                                     allow_abbrev=False)
+    parser.add_argument(
+        "--backend", choices=["python", "pandas"], default="python",
+        help="backend das métricas por departamento, mensais e do resumo geral "
+             "(pandas requer numpy/pandas instalados)"
+    )
+    parser.add_argument(
+        "--streaming", action="store_true",
+        help="gera os tickets em lotes e grava direto no disco, com memória limitada"
+    )
+    parser.add_argument(
+        "--tamanho-lote", type=int, default=TAMANHO_LOTE_PADRAO,
+        help=f"tickets por lote no modo streaming e nas saídas adicionais com --tickets-compactos "
+             f"(padrão: {TAMANHO_LOTE_PADRAO})"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=0,
+        help="processos para gerar os tickets em paralelo (padrão: 0, geração sequencial); "
+             "cada dia tem sua semente, então a saída não depende do número de processos"
+    )
+    parser.add_argument(
+        "--diretorio-saida", metavar="DIR",
+        help=f"grava o JSON e as saídas adicionais em DIR, com os mesmos nomes de arquivo "
+             f"(padrão: {os.path.dirname(ARQUIVO_SAIDA)})"
+    )
+    parser.add_argument(
+        "--dias", type=int,
+        help=f"dias do período a partir de {START_DATE.strftime('%d/%m/%Y')} (padrão: {TOTAL_DAYS})"
+    )
+    parser.add_argument(
+        "--tickets-por-dia", type=int,
+        help=f"média de tickets por dia; as faixas de dias úteis e fins de semana escalam "
+             f"proporcionalmente (padrão: ~{volume_medio_diario():.0f})"
+    )
+    parser.add_argument(
+        "--agentes", type=int,
+        help=f"número de agentes, na proporção atual entre departamentos "
+             f"(padrão: {sum(DISTRIBUICAO_AGENTES.values())})"
+    )
+    parser.add_argument(
+        "--semente", type=int, default=SEMENTE_PADRAO,
+        help=f"semente base para reprodutibilidade (padrão: {SEMENTE_PADRAO})"
+    )
+    parser.add_argument(
+        "--tamanho-pool", type=int, default=TAMANHO_POOL_TEXTOS,
+        help=f"entradas em cada pool de títulos e descrições (padrão: {TAMANHO_POOL_TEXTOS})"
+    )
+    parser.add_argument(
+        "--renovacao-pool", type=int, default=RENOVACAO_POOL_DIA,
+        help="entradas de cada pool substituídas por textos novos a cada dia "
+             f"(padrão: {RENOVACAO_POOL_DIA}, pools fixos)"
+    )
+    parser.add_argument(
+        "--colunar", choices=["parquet", "arrow"],
+        help="também exporta tickets, agentes e métricas em arquivos colunares "
+             f"separados em {DIRETORIO_COLUNAR} (requer pyarrow)"
+    )
+    parser.add_argument(
+        "--secoes", action="store_true",
+        help=f"também grava cada seção em um JSON próprio em {DIRETORIO_SECOES}, "
+             "para leitura seletiva"
+    )
+    parser.add_argument(
+        "--ndjson", action="store_true",
+        help=f"também grava os tickets em {ARQUIVO_TICKETS_NDJSON}, um por linha, "
+             "à medida que cada lote é gerado"
+    )
+    parser.add_argument(
+        "--cubo", action="store_true",
+        help=f"também grava em {DIRETORIO_CUBO} um cubo pré-agregado (dia × departamento × "
+             "canal × prioridade × status), um arquivo por mês, para o dashboard Next.js"
+    )
+    parser.add_argument(
+        "--somas-prefixo", action="store_true",
+        help=f"também grava em {ARQUIVO_SOMAS_PREFIXO} as somas de prefixo diárias das medidas "
+             "(total, por departamento e por canal), para KPIs de qualquer período em O(1)"
+    )
+    parser.add_argument(
+        "--simulacao", action="store_true",
+        help="refaz o ciclo de vida dos tickets (agente, status, tempos, SLA) com uma simulação "
+             "de eventos discretos com filas por departamento, turnos e capacidade dos agentes"
+    )
+    parser.add_argument(
+        "--eventos", action="store_true",
+        help=f"com --simulacao, também grava os eventos simulados em {ARQUIVO_EVENTOS}, um por linha"
+    )
+    parser.add_argument(
+        "--estado", action="store_true",
+        help="também grava o estado de agregação ao lado do arquivo de saída, para "
+             "atualizações incrementais com atualizacao_incremental.py"
+    )
+    parser.add_argument(
+        "--tickets-compactos", action="store_true",
+        help="guarda os tickets em memória em arrays tipados (códigos de categoria, "
+             "datas em segundos, tags em máscara de bits), convertidos em dicts só na leitura"
+    )
+    parser.add_argument(
+        "--json-compacto", action="store_true",
+        help="grava o JSON sem indentação (menor e mais rápido de gravar e ler)"
+    )
+    parser.add_argument(
+        "--compressao", choices=list(COMPRESSOES),
+        help="comprime o arquivo de saída (.gz ou .zst; zstd requer o pacote zstandard)"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="registra tempo, memória e itens de cada etapa em um relatório JSON "
+             "ao lado do arquivo de saída"
+    )
+    parser.add_argument(
+        "--profile-etapa", metavar="N",
+        help=f"etapa detalhada com cProfile ou tracemalloc: {', '.join(ETAPAS_PERFIL)}, "
+             f"ou {', '.join(ETAPAS_PERFIL_STREAMING)} no modo streaming (2b requer --simulacao)"
+    )
+    parser.add_argument(
+        "--profile-modo", choices=MODOS_DETALHE, default="cprofile",
+        help="ferramenta usada em --profile-etapa (padrão: cprofile)"
+    )
+    args = parser.parse_args(argv)
+    if args.profile_etapa and not args.profile:
+        parser.error("--profile-etapa requer --profile")
+    if args.profile_etapa:
+        etapas = ETAPAS_PERFIL_STREAMING if args.streaming else ETAPAS_PERFIL
+        if args.profile_etapa not in etapas:
+            parser.error(f"--profile-etapa deve ser uma das etapas {', '.join(etapas)}"
+                         f"{' no modo --streaming' if args.streaming else ''}")
+        if args.profile_etapa == "2b" and not args.simulacao:
+            parser.error("--profile-etapa 2b requer --simulacao")
+    if any(v is not None and v < 1 for v in (args.dias, args.tickets_por_dia, args.agentes)):
+        parser.error("--dias, --tickets-por-dia e --agentes devem ser positivos")
+    if args.tamanho_pool < 1:
+        parser.error("--tamanho-pool deve ser positivo")
+    if args.renovacao_pool < 0:
+        parser.error("--renovacao-pool não pode ser negativo")
+    if args.workers < 0:
+        parser.error("--workers não pode ser negativo")
+    if args.streaming and args.tickets_compactos:
+        parser.error("--tickets-compactos não se aplica ao modo --streaming")
+    if args.streaming and args.backend != "python":
+        parser.error("--streaming só é compatível com --backend python")
+    if args.eventos and not args.simulacao:
+        parser.error("--eventos requer --simulacao")
+    if args.streaming and args.simulacao:
+        parser.error("--simulacao não se aplica ao modo --streaming")
+    if args.tamanho_lote < 1:
+        parser.error("--tamanho-lote deve ser positivo")
+    return args
+
+def main(argv=None):
+    """Gera os dados e devolve {"arquivo", "agentes", "tickets"} da execução"""
+    args = parse_args(argv)
+    escala = definir_escala(args.dias, args.tickets_por_dia, args.agentes)
+    saidas = definir_diretorio_saida(args.diretorio_saida)
+    periodo = escala.periodo
+    print("Gerando dados fictícios para dashboard de atendimento...")
+    random.seed(args.semente)
+    fake.seed_instance(args.semente)
+    
+    perfil = PerfilEtapas(args.profile, args.profile_etapa, args.profile_modo)
+    arquivo_saida = com_compressao(saidas.arquivo, args.compressao)
+    
+    # Gerar dados
+    with perfil.etapa("1. Gerando agentes...") as etapa:
+        agentes = gerar_agentes(escala)
+        textos = novo_pool_textos(fake, args.tamanho_pool, args.renovacao_pool)
+        escritores = criar_escritores(args, saidas)
+        etapa["itens"] = len(agentes)
+    
+    if args.streaming:
+        with perfil.etapa(f"2-5. Gerando tickets em lotes de {args.tamanho_lote} direto para o disco "
+                          "e atualizando métricas a cada lote...") as etapa:
+            total_tickets, metricas = gerar_em_streaming(
+                agentes, arquivo_saida, args.tamanho_lote, args.workers, args.semente, textos,
+                escritores, escala
+            )
+            etapa["itens"] = total_tickets
+        resumo_geral = metricas["resumo_geral"]
+    else:
+        with perfil.etapa(f"2. Gerando tickets{f' em {args.workers} processos' if args.workers else ''}...") as etapa:
+            # A simulação altera os tickets no lugar; a compactação fica para depois dela
+            compactar = args.tickets_compactos and not args.simulacao
+            tickets = gerar_tickets(agentes, args.workers, args.semente, textos, compactar, escala)
+            total_tickets = etapa["itens"] = len(tickets)
+        
+        if args.simulacao:
+            with perfil.etapa("2b. Simulando o ciclo de vida dos tickets (eventos discretos)...") as etapa:
+                import simulacao_eventos
+                arquivo_eventos = com_compressao(saidas.eventos, args.compressao) if args.eventos else None
+                simulacao = simulacao_eventos.simular_ciclo_de_vida(
+                    agentes, tickets, periodo, args.semente, arquivo_eventos)
+                if args.tickets_compactos:
+                    tickets = TicketsCompactos.de_tickets(tickets)
+                etapa["itens"] = simulacao["eventos"]
+            print(f"   {simulacao['eventos']} eventos em {simulacao['segundos']:.2f}s "
+                  f"({simulacao['eventos_por_segundo']} eventos/s); "
+                  f"fila no fim do período: {sum(simulacao['fila_final_por_departamento'].values())} tickets")
+        
+        with perfil.etapa("3. Calculando métricas por agente...") as etapa:
+            metricas_agentes = calcular_metricas_agentes(agentes, tickets, periodo)
+            etapa["itens"] = total_tickets
+        
+        with perfil.etapa("4. Calculando métricas por departamento...") as etapa:
+            if args.backend == "pandas":
+                import metricas_colunares
+                colunas = metricas_colunares.carregar_colunas(tickets)
+                metricas_departamentos = metricas_colunares.calcular_metricas_departamento(colunas, periodo)
+                volume_mensal = metricas_colunares.calcular_volume_mensal(colunas, periodo)
+                resumo_geral = metricas_colunares.calcular_resumo_geral(colunas, agentes)
+            else:
+                metricas_departamentos = calcular_metricas_departamento(tickets, periodo)
+                volume_mensal = None
+                resumo_geral = calcular_resumo_geral(agentes, tickets)
+            etapa["itens"] = total_tickets
+        
+        with perfil.etapa("5. Gerando dados de volume temporal...") as etapa:
+            dados_volume = gerar_dados_volume_temporal(tickets, volume_mensal, periodo)
+            etapa["itens"] = total_tickets
+        
+        # Estrutura final dos dados
+        dados_dashboard = {
+            "metadata": montar_metadata(agentes, total_tickets, periodo),
+            "configuracao": montar_configuracao(),
+            "agentes": agentes,
+            "tickets": tickets,
+            "metricas_agentes": metricas_agentes,
+            "metricas_departamentos": metricas_departamentos,
+            "dados_volume": dados_volume,
+            "resumo_geral": resumo_geral
+        }
+        
+        # Salvar dados
+        with perfil.etapa("6. Salvando dados em JSON...") as etapa:
+            salvar_dados(dados_dashboard, arquivo_saida, args.json_compacto)
+            etapa["itens"] = total_tickets
+        
+        if escritores:
+            with perfil.etapa("7. Gravando saídas adicionais (NDJSON/seções/colunar/cubo/somas de prefixo/estado)...") as etapa:
+                metricas = {secao: dados_dashboard[secao] for secao in
+                            ("metricas_agentes", "metricas_departamentos", "dados_volume", "resumo_geral")}
+                lotes = tickets.blocos(args.tamanho_lote) if args.tickets_compactos else [tickets]
+                for lote in lotes:
+                    for escritor in escritores:
+                        escritor.escrever_lote(lote)
+                for escritor in escritores:
+                    escritor.finalizar(agentes, metricas, dados_dashboard["metadata"], dados_dashboard["configuracao"])
+                etapa["itens"] = total_tickets
+    
+    if args.profile:
+        caminho = perfil.salvar(saidas.arquivo, argumentos=vars(args), total_tickets=total_tickets)
+        print(f"⏱️  Perfil por etapa salvo em {os.path.basename(caminho)}")
     
     print(f"\n✅ Dados gerados com sucesso!")
     print(f"📊 Total de agentes: {len(agentes)}")
-    print(f"🎫 Total de tickets: {len(tickets)}")
-    print(f"📅 Período: {START_DATE.strftime('%d/%m/%Y')} a {END_DATE.strftime('%d/%m/%Y')}")
-    print(f"💾 Arquivo salvo: dados_dashboard_atendimento.json")
+    print(f"🎫 Total de tickets: {total_tickets}")
+    print(f"📅 Período: {escala.inicio.strftime('%d/%m/%Y')} a {escala.fim.strftime('%d/%m/%Y')}")
+    print(f"💾 Arquivo salvo: {os.path.basename(arquivo_saida)}")
     
     # Estatísticas rápidas
     print(f"\n📈 Estatísticas rápidas:")
-    print(f"   • Taxa de resolução geral: {dados_dashboard['resumo_geral']['taxa_resolucao_geral']:.1f}%")
-    print(f"   • Satisfação média: {dados_dashboard['resumo_geral']['satisfacao_geral']:.1f}/5.0")
-    print(f"   • Tempo médio de resolução: {dados_dashboard['resumo_geral']['tempo_medio_resolucao_geral']:.0f} minutos")
-    print(f"   • Volume médio diário: {len(tickets)/TOTAL_DAYS:.0f} tickets/dia")
+    print(f"   • Taxa de resolução geral: {resumo_geral['taxa_resolucao_geral']:.1f}%")
+    print(f"   • Satisfação média: {resumo_geral['satisfacao_geral']:.1f}/5.0")
+    print(f"   • Tempo médio de resolução: {resumo_geral['tempo_medio_resolucao_geral']:.0f} minutos")
+    print(f"   • Volume médio diário: {total_tickets/total_dias(periodo):.0f} tickets/dia")
+    
+    return {"arquivo": arquivo_saida, "agentes": len(agentes), "tickets": total_tickets}
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,189 @@
+"""Backend colunar (NumPy/pandas) para as métricas agregadas do dashboard.
+
+Carrega os tickets uma única vez em colunas tipadas (categóricas para
+departamento/status/prioridade e inteiros/floats para os tempos) e calcula
+as métricas por departamento, o volume mensal e o resumo geral com
+group-bys vetorizados. Produz as mesmas estruturas de
+`gerar_dados_dashboard` e é opcional: só é importado quando o backend
+"pandas" é escolhido. O período dos dados (início, fim) é sempre recebido
+como argumento, nunca lido do gerador.
+"""
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+from gerar_dados_dashboard import (
+    DEPARTAMENTOS, STATUS_TICKETS, PRIORIDADES, STATUS_RESOLVIDOS,
+    adicionar_ao_sketch, meses_do_periodo, percentis_sketch, total_dias
+)
+from tickets_compactos import TicketsCompactos
+
+def _valores(tickets, campo):
+    """Valores de um campo em todos os tickets, na ordem"""
+    if isinstance(tickets, TicketsCompactos):
+        return tickets.coluna(campo)
+    return list(map(itemgetter(campo), tickets))
+
+def _categorica(valores, categorias):
+    """Categórica com categorias conhecidas, montada direto dos códigos"""
+    indice = {c: i for i, c in enumerate(categorias)}
+    codigos = np.fromiter(map(indice.__getitem__, valores), dtype=np.int16, count=len(valores))
+    return pd.Categorical.from_codes(codigos, categories=categorias)
+
+def _meses(tickets):
+    """Categórica do mês ("AAAA-MM") de criação de cada ticket, com os meses em ordem"""
+    if isinstance(tickets, TicketsCompactos):
+        # Datas guardadas em segundos desde 1970: o mês sai direto do array
+        segundos = np.frombuffer(tickets.colunas["data_criacao"], dtype=np.int64)
+        meses, codigos = np.unique(segundos.astype("datetime64[s]").astype("datetime64[M]"), return_inverse=True)
+        return pd.Categorical.from_codes(codigos, categories=[str(m) for m in meses])
+    meses = {}
+    codigos = np.fromiter((meses.setdefault(t["data_criacao"][:7], len(meses)) for t in tickets),
+                          dtype=np.int32, count=len(tickets))
+    return pd.Categorical.from_codes(codigos, categories=list(meses)).reorder_categories(sorted(meses))
+
+def _numerica(valores, dtype):
+    """Array numérico com None convertido em 0"""
+    return np.nan_to_num(np.array(valores, dtype=np.float64), nan=0).astype(dtype)
+
+def carregar_colunas(tickets):
+    """Converte a lista de tickets em um DataFrame colunar com tipos compactos
+
+    Cada coluna é extraída de uma vez (de um TicketsCompactos, direto dos
+    seus arrays) e convertida para o tipo final: categorias a partir dos
+    códigos, tempos e satisfação com None como 0.
+    """
+    df = pd.DataFrame({
+        "departamento": _categorica(_valores(tickets, "departamento"), list(DEPARTAMENTOS.keys())),
+        "status": _categorica(_valores(tickets, "status"), STATUS_TICKETS),
+        "prioridade": _categorica(_valores(tickets, "prioridade"), PRIORIDADES),
+        "mes": _meses(tickets),
+        "tempo_resolucao": _numerica(_valores(tickets, "tempo_resolucao_minutos"), np.int64),
+        "satisfacao": _numerica(_valores(tickets, "satisfacao_cliente"), np.float64),
+        "primeira_resposta": _numerica(_valores(tickets, "tempo_primeira_resposta_minutos"), np.int64)
+    })
+
+    # Mesmos critérios do acumulador puro-Python: tempos e satisfação só contam
+    # em tickets resolvidos e com valor preenchido
+    df["resolvido"] = df["status"].isin(STATUS_RESOLVIDOS).to_numpy()
+    df["tem_resolucao"] = df["resolvido"] & (df["tempo_resolucao"] != 0)
+    df["tem_satisfacao"] = df["resolvido"] & (df["satisfacao"] != 0)
+    df["tempo_resolucao"] = df["tempo_resolucao"].where(df["tem_resolucao"], 0)
+    df["satisfacao"] = df["satisfacao"].where(df["tem_satisfacao"], 0.0)
+    return df
+
+def _media(soma, n):
+    """Média arredondada em 2 casas (0 quando não há amostras)"""
+    return round(float(soma) / int(n), 2) if n else 0
+
+def _agregar(df, chave):
+    """Somas e contagens por grupo em uma única passada vetorizada"""
+    return df.groupby(chave, observed=False).agg(
+        total_tickets=("resolvido", "size"),
+        tickets_resolvidos=("resolvido", "sum"),
+        soma_resolucao=("tempo_resolucao", "sum"),
+        n_resolucao=("tem_resolucao", "sum"),
+        soma_satisfacao=("satisfacao", "sum"),
+        n_satisfacao=("tem_satisfacao", "sum")
+    )
+
+# Percentis de um grupo sem tempos registrados
+_SEM_PERCENTIS = (percentis_sketch({}), percentis_sketch({}))
+
+def _sketches(df, chave, coluna, filtro):
+    """Sketches de quantis de `coluna` por grupo ({grupo: sketch})
+
+    Agrupa por (grupo, valor) e conta cada valor distinto uma vez no sketch,
+    com o mesmo balde do acumulador puro-Python.
+    """
+    sketches = {}
+    contagens = df.loc[filtro, [chave, coluna]].groupby([chave, coluna], observed=True).size()
+    for (grupo, valor), n in contagens.items():
+        adicionar_ao_sketch(sketches.setdefault(grupo, {}), int(valor), n=int(n))
+    return sketches
+
+def _percentis(df, chave):
+    """Percentis de resolução e primeira resposta por grupo ({grupo: (resolução, primeira resposta)})"""
+    resolucao = _sketches(df, chave, "tempo_resolucao", df["tem_resolucao"])
+    primeira = _sketches(df, chave, "primeira_resposta", df["primeira_resposta"] != 0)
+    return {grupo: (percentis_sketch(resolucao.get(grupo, {})), percentis_sketch(primeira.get(grupo, {})))
+            for grupo in set(resolucao) | set(primeira)}
+
+def _contagem_cruzada(df, chave, coluna, categorias):
+    """Tabela chave x coluna com a contagem de tickets"""
+    tabela = pd.crosstab(df[chave], df[coluna], dropna=False)
+    return tabela.reindex(columns=categorias, fill_value=0)
+
+def calcular_metricas_departamento(df, periodo):
+    """Calcula métricas por departamento no período (início, fim) (equivalente vetorizado)"""
+    dias = total_dias(periodo)
+    agregado = _agregar(df, "departamento")
+    por_prioridade = _contagem_cruzada(df, "departamento", "prioridade", PRIORIDADES)
+    por_status = _contagem_cruzada(df, "departamento", "status", STATUS_TICKETS)
+    percentis = _percentis(df, "departamento")
+
+    metricas_dept = []
+    for dept_nome in DEPARTAMENTOS.keys():
+        linha = agregado.loc[dept_nome]
+        total_tickets = int(linha["total_tickets"])
+        if total_tickets == 0:
+            continue
+        percentis_resolucao, percentis_primeira_resposta = percentis.get(dept_nome, _SEM_PERCENTIS)
+
+        metricas_dept.append({
+            "departamento": dept_nome,
+            "codigo": DEPARTAMENTOS[dept_nome]["codigo"],
+            "total_tickets": total_tickets,
+            "tickets_resolvidos": int(linha["tickets_resolvidos"]),
+            "taxa_resolucao_pct": round(int(linha["tickets_resolvidos"]) / total_tickets * 100, 2),
+            "tempo_medio_resolucao_minutos": _media(linha["soma_resolucao"], linha["n_resolucao"]),
+            "satisfacao_media": _media(linha["soma_satisfacao"], linha["n_satisfacao"]),
+            "percentis_resolucao_minutos": percentis_resolucao,
+            "percentis_primeira_resposta_minutos": percentis_primeira_resposta,
+            "tickets_por_prioridade": {p: int(por_prioridade.at[dept_nome, p]) for p in PRIORIDADES},
+            "tickets_por_status": {s: int(por_status.at[dept_nome, s]) for s in STATUS_TICKETS},
+            "volume_diario_medio": round(total_tickets / dias, 2)
+        })
+
+    return metricas_dept
+
+def calcular_volume_mensal(df, periodo):
+    """Calcula o volume mensal de tickets no período (início, fim) (equivalente vetorizado)"""
+    agregado = _agregar(df, "mes")
+    percentis = _percentis(df, "mes")
+
+    volume_mensal = {}
+    for mes_str in meses_do_periodo(periodo):
+        if mes_str in agregado.index:
+            linha = agregado.loc[mes_str]
+        else:
+            linha = dict.fromkeys(agregado.columns, 0)
+        percentis_resolucao, percentis_primeira_resposta = percentis.get(mes_str, _SEM_PERCENTIS)
+
+        volume_mensal[mes_str] = {
+            "mes": mes_str,
+            "total_tickets": int(linha["total_tickets"]),
+            "tickets_resolvidos": int(linha["tickets_resolvidos"]),
+            "satisfacao_media": _media(linha["soma_satisfacao"], linha["n_satisfacao"]),
+            "tempo_medio_resolucao": _media(linha["soma_resolucao"], linha["n_resolucao"]),
+            "percentis_resolucao_minutos": percentis_resolucao,
+            "percentis_primeira_resposta_minutos": percentis_primeira_resposta
+        }
+
+    return volume_mensal
+
+def calcular_resumo_geral(df, agentes):
+    """Calcula o resumo geral (equivalente vetorizado)"""
+    total_tickets = len(df)
+    resolvidos = int(df["resolvido"].sum())
+
+    return {
+        "total_tickets": total_tickets,
+        "tickets_resolvidos": resolvidos,
+        "taxa_resolucao_geral": round(resolvidos / total_tickets * 100, 2) if total_tickets else 0,
+        "satisfacao_geral": _media(df["satisfacao"].sum(), df["tem_satisfacao"].sum()),
+        "tempo_medio_resolucao_geral": _media(df["tempo_resolucao"].sum(), df["tem_resolucao"].sum()),
+        "agentes_ativos": len([a for a in agentes if a["ativo"]]),
+        "departamentos_ativos": len(DEPARTAMENTOS)
+    }
@@ -0,0 +1,150 @@
+"""Instrumentação por etapa do pipeline (modo `--profile`).
+
+Cada etapa numerada de `gerar_dados_dashboard.main` roda dentro de
+`PerfilEtapas.etapa()`, que imprime a mensagem da etapa e, com o perfil
+ativo, registra tempo de parede, tempo de CPU, memória e a quantidade de
+itens produzidos. Uma etapa pode ainda ser detalhada com cProfile (funções
+mais caras) ou tracemalloc (linhas que mais alocam, com o pico da etapa).
+O relatório é gravado em JSON ao lado do arquivo de dados.
+
+Memória de cada etapa (em MB):
+    rss_mb                memória residente do processo ao fim da etapa
+    variacao_rss_mb       rss_mb menos a residente no início: o que a etapa
+                          deixou alocado (negativa se liberou memória)
+    pico_rss_processo_mb  pico do processo desde o início da execução, não
+                          da etapa; só cresce, então não mede uma etapa isolada
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows: sem pico de memória do processo
+    resource = None
+
+# Memória residente atual (Linux); fora do Linux, rss_mb fica ausente do relatório
+ARQUIVO_STATM = "/proc/self/statm"
+
+MODOS_DETALHE = ("cprofile", "tracemalloc")
+
+# Linhas do detalhamento (funções ou locais de alocação) guardadas no relatório
+LINHAS_DETALHE = 25
+
+def caminho_perfil(arquivo_dados):
+    """Caminho do relatório de perfil ao lado do arquivo de dados"""
+    return os.path.splitext(arquivo_dados)[0] + ".perfil.json"
+
+def rss_mb():
+    """Memória residente atual do processo, em MB (None fora do Linux)"""
+    try:
+        with open(ARQUIVO_STATM) as f:
+            paginas = int(f.read().split()[1])
+    except OSError:
+        return None
+    return round(paginas * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2, 1)
+
+def pico_rss_mb():
+    """Pico de memória residente do processo desde o início, em MB"""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    return round(pico / (1024 ** 2 if sys.platform == "darwin" else 1024), 1)
+
+class PerfilEtapas:
+    """Registra as medidas de cada etapa; inativo, apenas imprime as mensagens"""
+
+    def __init__(self, ativo=False, etapa_detalhada=None, modo_detalhe="cprofile"):
+        self.ativo = ativo
+        self.etapa_detalhada = etapa_detalhada
+        self.modo_detalhe = modo_detalhe
+        self.etapas = []
+        self._cprofile = None
+
+    @contextmanager
+    def etapa(self, mensagem):
+        """Executa uma etapa ("N. Descrição...") e registra suas medidas
+
+        O bloco pode preencher `registro["itens"]` com a quantidade produzida.
+        """
+        print(mensagem)
+        numero, _, descricao = mensagem.partition(". ")
+        registro = {"etapa": numero, "descricao": descricao.rstrip(".")}
+        if not self.ativo:
+            yield registro
+            return
+
+        detalhar = numero == self.etapa_detalhada
+        if detalhar and self.modo_detalhe == "tracemalloc":
+            tracemalloc.start()
+        elif detalhar:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        rss_antes = rss_mb()
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield registro
+        finally:
+            registro["duracao_s"] = round(time.perf_counter() - inicio, 4)
+            registro["cpu_s"] = round(time.process_time() - inicio_cpu, 4)
+            if rss_antes is not None:
+                registro["rss_mb"] = rss_mb()
+                registro["variacao_rss_mb"] = round(registro["rss_mb"] - rss_antes, 1)
+            registro["pico_rss_processo_mb"] = pico_rss_mb()
+            if detalhar:
+                registro[self.modo_detalhe] = self._detalhe()
+            if registro.get("itens") and registro["duracao_s"]:
+                registro["itens_por_segundo"] = round(registro["itens"] / registro["duracao_s"])
+            self.etapas.append(registro)
+
+    def _detalhe(self):
+        """Encerra o detalhamento da etapa e resume o resultado"""
+        if self.modo_detalhe == "tracemalloc":
+            atual, pico = tracemalloc.get_traced_memory()
+            fotografia = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            return {
+                "alocado_ao_final_mb": round(atual / 1024 ** 2, 2),
+                "pico_alocado_mb": round(pico / 1024 ** 2, 2),
+                "maiores_alocacoes": [
+                    {"local": str(estatistica.traceback), "mb": round(estatistica.size / 1024 ** 2, 3),
+                     "blocos": estatistica.count}
+                    for estatistica in fotografia.statistics("lineno")[:LINHAS_DETALHE]
+                ]
+            }
+
+        self._cprofile.disable()
+        saida = io.StringIO()
+        pstats.Stats(self._cprofile, stream=saida).sort_stats("cumulative").print_stats(LINHAS_DETALHE)
+        return {"funcoes_mais_caras": [linha for linha in saida.getvalue().splitlines() if linha.strip()]}
+
+    def relatorio(self, **contexto):
+        """Relatório com as medidas de todas as etapas executadas"""
+        return {
+            "data_execucao": datetime.now().isoformat(),
+            "contexto": contexto,
+            "duracao_total_s": round(sum(e["duracao_s"] for e in self.etapas), 4),
+            "pico_rss_processo_mb": pico_rss_mb(),
+            "etapas": self.etapas
+        }
+
+    def salvar(self, arquivo_dados, **contexto):
+        """Grava o relatório ao lado de `arquivo_dados` e devolve o caminho
+
+        Com cProfile, as estatísticas completas da etapa detalhada também
+        são gravadas em um arquivo .prof (para pstats/snakeviz).
+        """
+        caminho = caminho_perfil(arquivo_dados)
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(os.path.splitext(caminho)[0] + f".etapa{self.etapa_detalhada}.prof")
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(self.relatorio(**contexto), f, ensure_ascii=False, indent=2)
+        return caminho
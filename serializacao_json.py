@@ -0,0 +1,138 @@
+"""Serialização JSON rápida dos dados do dashboard.
+
+Usa orjson quando instalado (com o módulo json da biblioteca padrão como
+alternativa), grava em formato compacto ou indentado e comprime a saída
+com gzip ou zstd conforme a extensão do arquivo (.gz / .zst). zstd requer
+o pacote `zstandard`, importado só quando usado.
+"""
+import gzip
+import json
+import os
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Extensão acrescentada ao arquivo para cada compressão
+COMPRESSOES = {"gzip": ".gz", "zstd": ".zst"}
+
+# Nível de compressão gzip (o padrão 9 do módulo é lento para arquivos grandes)
+NIVEL_GZIP = 6
+
+# Segundos entre verificações de novas linhas ao acompanhar um NDJSON
+INTERVALO_SEGUIR = 0.5
+
+def para_bytes(obj, indentar=False):
+    """Codifica `obj` em JSON UTF-8 (compacto ou indentado com 2 espaços)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indentar else 0)
+    if indentar:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def para_texto(obj):
+    """Codifica `obj` em uma linha de JSON compacto"""
+    return para_bytes(obj).decode("utf-8")
+
+def de_bytes(dados):
+    """Decodifica JSON (bytes ou str)"""
+    return orjson.loads(dados) if orjson is not None else json.loads(dados)
+
+def com_compressao(caminho, compressao=None):
+    """Caminho do arquivo com a extensão da compressão escolhida"""
+    return caminho + COMPRESSOES[compressao] if compressao else caminho
+
+def abrir(caminho, modo="rb"):
+    """Abre o arquivo descomprimindo/comprimindo conforme a extensão
+
+    Aceita os modos "rb", "wb", "rt" e "wt" (texto sempre em UTF-8).
+    """
+    texto = "t" in modo
+    codificacao = {"encoding": "utf-8"} if texto else {}
+    if caminho.endswith(COMPRESSOES["gzip"]):
+        if "w" in modo:
+            return gzip.open(caminho, modo, compresslevel=NIVEL_GZIP, **codificacao)
+        return gzip.open(caminho, modo, **codificacao)
+    if caminho.endswith(COMPRESSOES["zstd"]):
+        import zstandard
+        return zstandard.open(caminho, modo, **codificacao)
+    return open(caminho, modo, **codificacao)
+
+def salvar_json(obj, caminho, indentar=False):
+    """Grava `obj` em `caminho` (comprimido se a extensão for .gz ou .zst)"""
+    with abrir(caminho, "wb") as f:
+        f.write(para_bytes(obj, indentar))
+
+def salvar_json_em_blocos(obj, caminho, indentar=False, blocos=None):
+    """Grava o dict `obj` como `salvar_json`, mas serializa as listas de `blocos`
+    ({chave: iterável de listas}) um bloco por vez
+
+    O arquivo resultante é idêntico ao de `salvar_json` com cada chave de
+    `blocos` valendo a concatenação dos seus blocos, sem que a lista
+    completa precise existir em memória.
+    """
+    blocos = blocos or {}
+    recuo = b"\n  " if indentar else b""
+    with abrir(caminho, "wb") as f:
+        f.write(b"{")
+        for i, (chave, valor) in enumerate(obj.items()):
+            f.write((b"," if i else b"") + recuo + para_bytes(chave) + (b": " if indentar else b":"))
+            if chave not in blocos:
+                f.write(para_bytes(valor, indentar).replace(b"\n", recuo))
+                continue
+            vazio = True
+            for bloco in blocos[chave]:
+                if bloco:
+                    # Conteúdo do array sem os colchetes, no nível de recuo da chave
+                    conteudo = para_bytes(bloco, indentar)[1:-2 if indentar else -1]
+                    f.write((b"[" if vazio else b",") + conteudo.replace(b"\n", recuo))
+                    vazio = False
+            f.write(b"[]" if vazio else recuo + b"]")
+        f.write(b"\n}" if indentar else b"}")
+
+def carregar_json(caminho):
+    """Lê um arquivo JSON, comprimido ou não"""
+    with abrir(caminho, "rb") as f:
+        return de_bytes(f.read())
+
+def ler_ndjson(caminho, seguir=False, intervalo=INTERVALO_SEGUIR):
+    """Itera os objetos de um arquivo NDJSON (um JSON por linha), um por vez
+
+    A memória usada não depende do tamanho do arquivo. Com `seguir=True`
+    o arquivo é acompanhado como em `tail -f`: ao chegar ao fim, espera
+    novas linhas em vez de terminar, e uma linha ainda incompleta só é
+    entregue quando o escritor termina de gravá-la. Arquivos comprimidos
+    (.gz, .zst) não podem ser seguidos: o fim de um fluxo comprimido ainda
+    em gravação não é um ponto de leitura válido, e `seguir=True` com eles
+    levanta ValueError.
+    """
+    if seguir and caminho.endswith(tuple(COMPRESSOES.values())):
+        raise ValueError(f"{caminho} é comprimido e não pode ser seguido (seguir=True); "
+                         "grave o NDJSON sem compressão para acompanhá-lo")
+    return _ler_linhas_ndjson(caminho, seguir, intervalo)
+
+def _ler_linhas_ndjson(caminho, seguir, intervalo):
+    with abrir(caminho, "rt") as f:
+        parcial = ""
+        while True:
+            linha = f.readline()
+            if linha.endswith("\n") or (linha and not seguir):
+                linha, parcial = parcial + linha, ""
+                if linha.strip():
+                    yield de_bytes(linha)
+            elif linha:
+                parcial += linha
+            elif seguir:
+                time.sleep(intervalo)
+            else:
+                break
+
+def localizar(caminho):
+    """Versão mais recente de `caminho` entre a original e as comprimidas
+
+    Devolve o próprio `caminho` quando nenhuma existe.
+    """
+    candidatos = [c for c in [caminho] + [caminho + ext for ext in COMPRESSOES.values()] if os.path.exists(c)]
+    return max(candidatos, key=os.path.getmtime) if candidatos else caminho
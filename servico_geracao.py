@@ -0,0 +1,219 @@
+"""Serviço local de geração de datasets em lote (um por tenant de teste).
+
+Recebe jobs de geração, cada um com semente, escala (dias, tickets por
+dia e agentes), diretório de saída e opções extras de
+`gerar_dados_dashboard`, e executa `gerar_dados_dashboard.main()` em um
+pool de processos. Cada job grava o JSON, as saídas adicionais e o log
+da execução no próprio diretório.
+
+Os jobs vêm de um arquivo JSON (lista) ou NDJSON, ou da entrada padrão
+com "-", e são lidos sob demanda: no máximo `--fila` jobs ficam
+pendentes, então uma fila longa (ou um produtor contínuo no CI) não
+acumula em memória. Cada job concluído é reportado assim que termina,
+com tickets/s e bytes gravados, e o resumo vai para um JSON.
+
+Uso:
+    python servico_geracao.py jobs.ndjson --workers 4 --diretorio-base datasets
+    gerar_jobs | python servico_geracao.py - --workers 8
+
+Job (uma linha NDJSON):
+    {"nome": "tenant-a", "semente": 7, "dias": 90, "tickets_por_dia": 500,
+     "agentes": 60, "opcoes": ["--json-compacto", "--secoes"]}
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from itertools import islice
+
+from serializacao_json import de_bytes
+
+# Campos aceitos em um job
+CAMPOS_JOB = {"nome", "semente", "dias", "tickets_por_dia", "agentes", "saida", "opcoes"}
+
+# Opções do gerador definidas pelos campos do job (não podem vir em "opcoes"; o
+# gerador não aceita abreviações, então comparar o nome completo basta)
+OPCOES_RESERVADAS = {"--semente", "--dias", "--tickets-por-dia", "--agentes", "--diretorio-saida"}
+
+ARQUIVO_LOG = 'geracao.log'
+ARQUIVO_RELATORIO = 'relatorio_servico.json'
+
+def ler_jobs(caminho):
+    """Itera os jobs de um arquivo JSON (lista) ou NDJSON, ou da entrada padrão com "-" """
+    if caminho == "-":
+        for linha in sys.stdin:
+            if linha.strip():
+                yield de_bytes(linha)
+        return
+    with open(caminho, 'rb') as f:
+        inicio = f.read(1)
+        while inicio.isspace():
+            inicio = f.read(1)
+        f.seek(0)
+        if inicio == b"[":
+            yield from de_bytes(f.read())
+            return
+        for linha in f:
+            if linha.strip():
+                yield de_bytes(linha)
+
+def preparar_job(job, numero, diretorio_base):
+    """Valida o job e completa nome e diretório de saída"""
+    desconhecidos = set(job) - CAMPOS_JOB
+    if desconhecidos:
+        raise ValueError(f"campos desconhecidos: {', '.join(sorted(desconhecidos))}")
+    opcoes = [str(o) for o in job.get("opcoes", [])]
+    reservadas = OPCOES_RESERVADAS.intersection(o.split("=")[0] for o in opcoes)
+    if reservadas:
+        raise ValueError(f"use os campos do job em vez de {', '.join(sorted(reservadas))}")
+    nome = job.get("nome") or f"job{numero:04d}"
+    return {**job, "nome": nome, "saida": job.get("saida") or os.path.join(diretorio_base, nome), "opcoes": opcoes}
+
+def argumentos_gerador(job):
+    """Linha de comando de gerar_dados_dashboard correspondente ao job"""
+    argv = ["--diretorio-saida", job["saida"]]
+    for campo, opcao in (("semente", "--semente"), ("dias", "--dias"),
+                         ("tickets_por_dia", "--tickets-por-dia"), ("agentes", "--agentes")):
+        if job.get(campo) is not None:
+            argv += [opcao, str(job[campo])]
+    return argv + job["opcoes"]
+
+def _tamanho_diretorio(diretorio):
+    return sum(os.path.getsize(os.path.join(raiz, nome))
+               for raiz, _, nomes in os.walk(diretorio) for nome in nomes)
+
+def executar_job(job):
+    """Executa um job em um processo do pool e devolve o resultado com a vazão"""
+    import gerar_dados_dashboard as gerador
+
+    os.makedirs(job["saida"], exist_ok=True)
+    inicio = time.perf_counter()
+    try:
+        with open(os.path.join(job["saida"], ARQUIVO_LOG), 'w', encoding='utf-8') as log, \
+                contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            execucao = gerador.main(argumentos_gerador(job))
+    except (Exception, SystemExit) as erro:
+        # argparse sai com SystemExit; a mensagem fica no log do job
+        descricao = (f"gerar_dados_dashboard saiu com código {erro.code} (ver {ARQUIVO_LOG})"
+                     if isinstance(erro, SystemExit) else repr(erro))
+        return {"nome": job["nome"], "saida": job["saida"], "status": "erro",
+                "erro": descricao, "segundos": round(time.perf_counter() - inicio, 3)}
+    segundos = time.perf_counter() - inicio
+    return {
+        "nome": job["nome"],
+        "saida": job["saida"],
+        "status": "ok",
+        "arquivo": execucao["arquivo"],
+        "agentes": execucao["agentes"],
+        "tickets": execucao["tickets"],
+        "segundos": round(segundos, 3),
+        "tickets_por_segundo": round(execucao["tickets"] / segundos) if segundos else None,
+        "bytes_gravados": _tamanho_diretorio(job["saida"])
+    }
+
+def executar_jobs(jobs, workers=None, fila=None, diretorio_base="datasets", ao_concluir=None):
+    """Executa os jobs em um pool de processos, com no máximo `fila` pendentes
+
+    Jobs inválidos ou com diretório repetido viram resultados com status
+    "erro" sem ocupar o pool. `ao_concluir(resultado)` é chamado assim que
+    cada job termina. Devolve os resultados na ordem de conclusão.
+    """
+    workers = workers or os.cpu_count() or 1
+    fila = fila or workers * 2
+    resultados = []
+    diretorios = set()
+
+    def concluir(resultado):
+        resultados.append(resultado)
+        if ao_concluir:
+            ao_concluir(resultado)
+
+    def validos():
+        for numero, job in enumerate(jobs, 1):
+            try:
+                job = preparar_job(job, numero, diretorio_base)
+                diretorio = os.path.abspath(job["saida"])
+                if diretorio in diretorios:
+                    raise ValueError(f"diretório de saída repetido: {job['saida']}")
+                diretorios.add(diretorio)
+            except (ValueError, TypeError, AttributeError) as erro:
+                nome = job.get("nome") if isinstance(job, dict) else None
+                concluir({"nome": nome or f"job{numero:04d}", "status": "erro", "erro": str(erro)})
+                continue
+            yield job
+
+    pendentes_jobs = validos()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pendentes = {executor.submit(executar_job, job) for job in islice(pendentes_jobs, fila)}
+        while pendentes:
+            prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                concluir(futuro.result())
+            for job in islice(pendentes_jobs, fila - len(pendentes)):
+                pendentes.add(executor.submit(executar_job, job))
+    return resultados
+
+def imprimir_resultado(resultado):
+    if resultado["status"] != "ok":
+        print(f"   ❌ {resultado['nome']}: {resultado['erro']}", flush=True)
+        return
+    print(f"   ✅ {resultado['nome']}: {resultado['tickets']} tickets em {resultado['segundos']:.2f}s "
+          f"({resultado['tickets_por_segundo']} tickets/s, {resultado['bytes_gravados'] / 1024 ** 2:.1f} MB) "
+          f"→ {resultado['saida']}", flush=True)
+
+def parse_args(argv=None):
+    """Lê as opções de linha de comando"""
+    parser = argparse.ArgumentParser(description="Gera vários datasets do dashboard em paralelo")
+    parser.add_argument("jobs", help="arquivo de jobs em JSON (lista) ou NDJSON; - lê da entrada padrão")
+    parser.add_argument("--workers", type=int, help="jobs executados ao mesmo tempo (padrão: número de CPUs)")
+    parser.add_argument("--fila", type=int, help="máximo de jobs pendentes no pool (padrão: 2 por worker)")
+    parser.add_argument(
+        "--diretorio-base", default="datasets",
+        help="diretório dos jobs sem \"saida\" (cada um em <base>/<nome>; padrão: datasets)"
+    )
+    parser.add_argument(
+        "--relatorio", help=f"resumo dos jobs em JSON (padrão: <diretório-base>/{ARQUIVO_RELATORIO})"
+    )
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers deve ser positivo")
+    if args.fila is not None and args.fila < 1:
+        parser.error("--fila deve ser positivo")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("Executando jobs de geração...")
+    inicio = time.perf_counter()
+    resultados = executar_jobs(ler_jobs(args.jobs), args.workers, args.fila, args.diretorio_base,
+                               ao_concluir=imprimir_resultado)
+    segundos = time.perf_counter() - inicio
+
+    concluidos = [r for r in resultados if r["status"] == "ok"]
+    total_tickets = sum(r["tickets"] for r in concluidos)
+    relatorio = {
+        "data_execucao": datetime.now().isoformat(),
+        "segundos": round(segundos, 3),
+        "jobs": len(resultados),
+        "erros": len(resultados) - len(concluidos),
+        "tickets": total_tickets,
+        "tickets_por_segundo": round(total_tickets / segundos) if segundos else None,
+        "resultados": resultados
+    }
+    caminho = args.relatorio or os.path.join(args.diretorio_base, ARQUIVO_RELATORIO)
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+    print(f"\n📦 {len(concluidos)} de {len(resultados)} jobs concluídos em {segundos:.2f}s "
+          f"({relatorio['tickets_por_segundo']} tickets/s no total)")
+    print(f"💾 Relatório: {caminho}")
+    if relatorio["erros"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
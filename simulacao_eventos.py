@@ -0,0 +1,324 @@
+"""Simulação de eventos discretos do ciclo de vida dos tickets.
+
+O gerador sorteia o status final de cada ticket pela idade e os tempos de
+primeira resposta e de resolução de forma independente, sem capacidade
+dos agentes nem filas. Aqui os tickets gerados entram como chegadas (data
+de criação, departamento, prioridade, canal...) em uma simulação com a
+fila de eventos em um heap:
+
+- cada departamento tem uma fila de espera ordenada por prioridade e
+  chegada; os agentes ativos só recebem tickets durante o seu turno
+  (TURNOS) e trabalham em até `capacidade_agente()` tickets ao mesmo
+  tempo, derivada de `meta_tickets_dia` e do tempo médio do departamento;
+- o ticket atribuído recebe a primeira resposta após uma latência e pode
+  aguardar o cliente ou terceiros (liberando o agente e voltando à fila
+  depois), ser resolvido após o tempo de trabalho, reaberto (uma vez) ou
+  fechado alguns dias depois; quem espera demais na fila sem nenhum
+  atendimento desiste e o ticket é cancelado;
+- o que não aconteceu até o fim do último dia do período define o status.
+
+Os campos de ciclo de vida (agente, status, datas e tempos, satisfação,
+reabertura, SLA) são reescritos a partir da simulação e os demais são
+mantidos, então as métricas e todas as saídas continuam no mesmo
+formato. Tickets nunca atribuídos mantêm o agente sorteado na geração.
+Os eventos (aberto, atribuido, primeira_resposta, aguardando, retomado,
+resolvido, reaberto, fechado, cancelado) podem ser gravados em NDJSON.
+"""
+import heapq
+import random
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from itertools import count
+
+import gerar_dados_dashboard as gerador
+from gerar_dados_dashboard import DEPARTAMENTOS, PRIORIDADES, STATUS_RESOLVIDOS, novo_amostrador
+from serializacao_json import abrir, para_texto
+
+# Hora de início de cada turno (turnos de 8 horas)
+TURNOS = {"Manhã": 6, "Tarde": 14, "Noite": 22}
+MINUTOS_TURNO = 8 * 60
+
+# Prazo de resolução (horas desde a criação) de cada prioridade
+SLA_RESOLUCAO_HORAS = {"Crítica": 4, "Alta": 8, "Normal": 24, "Baixa": 72}
+
+# Minutos entre a atribuição e a primeira resposta (mínimo, máximo)
+LATENCIA_PRIMEIRA_RESPOSTA = (5, 30)
+
+# Após a primeira resposta: chance de aguardar o cliente ou terceiros, por quantas horas,
+# e a parcela das esperas que é pelo cliente
+PROB_AGUARDAR = 0.2
+HORAS_AGUARDANDO = (2, 48)
+PROB_AGUARDAR_CLIENTE = 0.7
+
+# Chance de reabertura após a primeira resolução e horas até ela acontecer
+PROB_REABERTURA = 0.08
+HORAS_ATE_REABERTURA = (1, 72)
+
+# Dias entre a resolução e o fechamento
+DIAS_ATE_FECHAMENTO = (1, 7)
+
+# Tempo médio que o cliente espera na fila, sem nenhum atendimento, antes de desistir
+HORAS_PACIENCIA_MEDIA = 72
+
+# Tipos de evento da fila (a chegada vem da lista de tickets ordenada, fora do heap)
+PRIMEIRA_RESPOSTA, RETOMADA, RESOLUCAO, REABERTURA, FECHAMENTO, DESISTENCIA, TROCA_TURNO = range(7)
+
+def capacidade_agente(agente):
+    """Tickets em atendimento simultâneo de um agente
+
+    Dimensionada para que, com o tempo médio do departamento, o agente
+    conclua cerca de `meta_tickets_dia` tickets em um turno.
+    """
+    tempo_medio = DEPARTAMENTOS[agente["departamento"]]["tempo_medio_resolucao"]
+    return max(1, round(agente["meta_tickets_dia"] * tempo_medio / MINUTOS_TURNO))
+
+def turno_da_hora(hora):
+    """Turno em andamento em uma hora do dia"""
+    for nome, inicio in sorted(TURNOS.items(), key=lambda item: item[1], reverse=True):
+        if hora >= inicio:
+            return nome
+    return max(TURNOS, key=TURNOS.get)
+
+def _satisfacao(rng, tempo_resolucao, prioridade, reaberto):
+    """Nota do cliente pelo tempo de resolução em relação ao SLA"""
+    prazo = SLA_RESOLUCAO_HORAS[prioridade] * 60
+    base = 4.5 if tempo_resolucao <= prazo / 2 else 4.0 if tempo_resolucao <= prazo else 3.5
+    if reaberto:
+        base -= 0.5
+    return max(1.0, min(5.0, round(rng.uniform(base - 0.5, base + 0.5), 1)))
+
+def simular_ciclo_de_vida(agentes, tickets, periodo, semente=gerador.SEMENTE_PADRAO, arquivo_eventos=None):
+    """Simula o atendimento dos `tickets` e reescreve seus campos de ciclo de vida
+
+    `tickets` é uma lista de dicts do gerador, alterada no lugar, e
+    `periodo` o (início, fim) dos dados: a simulação vai até o fim do
+    último dia. Com
+    `arquivo_eventos`, grava os eventos em NDJSON (comprimido se terminar
+    em .gz ou .zst). Devolve as estatísticas da simulação: eventos
+    processados e por segundo, tickets por status e a fila de espera de
+    cada departamento no fim do período.
+    """
+    rng = random.Random(f"{semente}-simulacao")
+    inicio_periodo, fim_periodo = periodo
+    horizonte = ((fim_periodo + timedelta(days=1)) - inicio_periodo) // timedelta(seconds=1)
+    faixas_resolucao = novo_amostrador(agentes)["faixas_resolucao"]
+    ordem_prioridade = {p: i for i, p in enumerate(reversed(PRIORIDADES))}
+
+    # Agentes ativos, por departamento e turno
+    ativos = [a for a in agentes if a["ativo"]]
+    departamento_agente = [a["departamento"] for a in ativos]
+    turno_agente = [a["turno"] for a in ativos]
+    capacidade = [capacidade_agente(a) for a in ativos]
+    carga = [0] * len(ativos)
+    disponivel = [False] * len(ativos)
+    por_turno = {}
+    for k, a in enumerate(ativos):
+        por_turno.setdefault((a["departamento"], a["turno"]), []).append(k)
+
+    # Estado de cada ticket (tempos em segundos desde o início do período)
+    n = len(tickets)
+    chegada = [(datetime.fromisoformat(t["data_criacao"]) - inicio_periodo) // timedelta(seconds=1)
+               for t in tickets]
+    status = ["Aberto"] * n
+    agente = [-1] * n  # índice em `ativos` do agente atribuído (-1: nunca atribuído)
+    primeira_resposta = [None] * n
+    resolucao = [None] * n
+    reaberto = [False] * n
+    pausas = [0] * n
+    na_fila = [False] * n
+
+    filas = {dept: [] for dept in DEPARTAMENTOS}
+    disponiveis = {dept: deque() for dept in DEPARTAMENTOS}
+    eventos = []
+    sequencia = count()
+
+    saida = abrir(arquivo_eventos, "wb") if arquivo_eventos else None
+
+    def registrar(i, evento, agora):
+        if saida is not None:
+            k = agente[i]
+            saida.write(para_texto({
+                "ticket_id": tickets[i]["id"],
+                "evento": evento,
+                "data": (inicio_periodo + timedelta(seconds=agora)).isoformat(),
+                "agente_id": ativos[k]["id"] if k >= 0 else None,
+                "status": status[i]
+            }).encode("utf-8") + b"\n")
+
+    def agendar(instante, tipo, i):
+        heapq.heappush(eventos, (instante, next(sequencia), tipo, i))
+
+    def enfileirar(i, agora):
+        heapq.heappush(filas[tickets[i]["departamento"]], (ordem_prioridade[tickets[i]["prioridade"]], agora, i))
+        na_fila[i] = True
+
+    def tempo_trabalho(i):
+        t = tickets[i]
+        return rng.randint(*faixas_resolucao[(t["departamento"], t["prioridade"])]) * 60
+
+    def despachar(dept, agora):
+        """Atribui os tickets da fila do departamento aos agentes livres do turno"""
+        fila = filas[dept]
+        livres = disponiveis[dept]
+        while fila and livres:
+            _, _, i = heapq.heappop(fila)
+            if not na_fila[i]:
+                continue  # cancelado enquanto esperava
+            na_fila[i] = False
+            k = livres[0]
+            carga[k] += 1
+            if carga[k] >= capacidade[k]:
+                livres.popleft()
+                disponivel[k] = False
+            else:
+                livres.rotate(-1)
+            agente[i] = k
+            registrar(i, "atribuido", agora)
+            if primeira_resposta[i] is None:
+                agendar(agora + rng.randint(*LATENCIA_PRIMEIRA_RESPOSTA) * 60, PRIMEIRA_RESPOSTA, i)
+            else:
+                agendar(agora + tempo_trabalho(i), RESOLUCAO, i)
+
+    def liberar(i, agora):
+        k = agente[i]
+        carga[k] -= 1
+        if not disponivel[k] and turno_agente[k] == turno_atual:
+            disponiveis[departamento_agente[k]].append(k)
+            disponivel[k] = True
+        despachar(departamento_agente[k], agora)
+
+    def iniciar_turno(turno, agora):
+        """Troca os agentes que recebem tickets em cada departamento"""
+        for dept in DEPARTAMENTOS:
+            for k in disponiveis[dept]:
+                disponivel[k] = False
+            livres = [k for k in por_turno.get((dept, turno), []) if carga[k] < capacidade[k]]
+            for k in livres:
+                disponivel[k] = True
+            disponiveis[dept] = deque(livres)
+            despachar(dept, agora)
+
+    # Turno em andamento no início do período e próxima troca
+    turnos = sorted(TURNOS, key=TURNOS.get)
+    turno_atual = turno_da_hora(inicio_periodo.hour)
+    iniciar_turno(turno_atual, 0)
+    proximo = turnos[(turnos.index(turno_atual) + 1) % len(turnos)]
+    dias_ate = 1 if TURNOS[proximo] <= inicio_periodo.hour else 0
+    agendar((dias_ate * 24 + TURNOS[proximo] - inicio_periodo.hour) * 3600 - inicio_periodo.minute * 60,
+            TROCA_TURNO, turnos.index(proximo))
+
+    ordem_chegada = sorted(range(n), key=chegada.__getitem__)
+    proxima_chegada = 0
+    processados = 0
+    cronometro = time.perf_counter()
+
+    try:
+        while True:
+            if proxima_chegada < n and (not eventos or chegada[ordem_chegada[proxima_chegada]] <= eventos[0][0]):
+                i = ordem_chegada[proxima_chegada]
+                proxima_chegada += 1
+                agora = chegada[i]
+                if agora > horizonte:
+                    break
+                processados += 1
+                registrar(i, "aberto", agora)
+                enfileirar(i, agora)
+                agendar(agora + int(rng.expovariate(1 / HORAS_PACIENCIA_MEDIA) * 3600), DESISTENCIA, i)
+                despachar(tickets[i]["departamento"], agora)
+                continue
+
+            if not eventos:
+                break
+            agora, _, tipo, i = heapq.heappop(eventos)
+            if agora > horizonte:
+                break
+            processados += 1
+
+            if tipo == TROCA_TURNO:
+                turno_atual = turnos[i]
+                iniciar_turno(turno_atual, agora)
+                agendar(agora + MINUTOS_TURNO * 60, TROCA_TURNO, (i + 1) % len(turnos))
+            elif tipo == PRIMEIRA_RESPOSTA:
+                primeira_resposta[i] = agora
+                status[i] = "Em Andamento"
+                registrar(i, "primeira_resposta", agora)
+                if rng.random() < PROB_AGUARDAR:
+                    status[i] = "Aguardando Cliente" if rng.random() < PROB_AGUARDAR_CLIENTE else "Aguardando Terceiros"
+                    pausas[i] += 1
+                    registrar(i, "aguardando", agora)
+                    agendar(agora + rng.randint(*HORAS_AGUARDANDO) * 3600, RETOMADA, i)
+                    liberar(i, agora)
+                else:
+                    agendar(agora + tempo_trabalho(i), RESOLUCAO, i)
+            elif tipo == RETOMADA:
+                status[i] = "Em Andamento"
+                registrar(i, "retomado", agora)
+                enfileirar(i, agora)
+                despachar(tickets[i]["departamento"], agora)
+            elif tipo == RESOLUCAO:
+                resolucao[i] = agora
+                status[i] = "Resolvido"
+                registrar(i, "resolvido", agora)
+                if not reaberto[i] and rng.random() < PROB_REABERTURA:
+                    agendar(agora + rng.randint(*HORAS_ATE_REABERTURA) * 3600, REABERTURA, i)
+                else:
+                    agendar(agora + rng.randint(*DIAS_ATE_FECHAMENTO) * 86400, FECHAMENTO, i)
+                liberar(i, agora)
+            elif tipo == REABERTURA:
+                reaberto[i] = True
+                resolucao[i] = None
+                status[i] = "Em Andamento"
+                registrar(i, "reaberto", agora)
+                enfileirar(i, agora)
+                despachar(tickets[i]["departamento"], agora)
+            elif tipo == FECHAMENTO:
+                status[i] = "Fechado"
+                registrar(i, "fechado", agora)
+            elif tipo == DESISTENCIA:
+                # Só desiste quem ainda espera o primeiro atendimento
+                if na_fila[i] and primeira_resposta[i] is None:
+                    na_fila[i] = False
+                    status[i] = "Cancelado"
+                    registrar(i, "cancelado", agora)
+    finally:
+        if saida is not None:
+            saida.close()
+    segundos = time.perf_counter() - cronometro
+
+    def data(segundos_desde_inicio):
+        return (inicio_periodo + timedelta(seconds=segundos_desde_inicio)).isoformat()
+
+    for i, t in enumerate(tickets):
+        k = agente[i]
+        if k >= 0:
+            t["agente_id"] = ativos[k]["id"]
+            t["agente_nome"] = ativos[k]["nome"]
+        t["status"] = status[i]
+        t["reaberto"] = reaberto[i]
+        t["interacoes"] += pausas[i] + reaberto[i]
+
+        respondido = primeira_resposta[i] is not None
+        t["data_primeira_resposta"] = data(primeira_resposta[i]) if respondido else None
+        t["tempo_primeira_resposta_minutos"] = round((primeira_resposta[i] - chegada[i]) / 60) if respondido else None
+
+        if status[i] in STATUS_RESOLVIDOS:
+            tempo_resolucao = max(1, round((resolucao[i] - chegada[i]) / 60))
+            t["data_resolucao"] = data(resolucao[i])
+            t["tempo_resolucao_minutos"] = tempo_resolucao
+            t["satisfacao_cliente"] = _satisfacao(rng, tempo_resolucao, t["prioridade"], reaberto[i])
+            t["sla_cumprido"] = tempo_resolucao <= SLA_RESOLUCAO_HORAS[t["prioridade"]] * 60
+        else:
+            t["data_resolucao"] = None
+            t["tempo_resolucao_minutos"] = None
+            t["satisfacao_cliente"] = None
+            t["sla_cumprido"] = None
+
+    fila_final = Counter(tickets[i]["departamento"] for i in range(n) if na_fila[i])
+    return {
+        "eventos": processados,
+        "segundos": round(segundos, 3),
+        "eventos_por_segundo": round(processados / segundos) if segundos else None,
+        "tickets_por_status": dict(Counter(status)),
+        "fila_final_por_departamento": {dept: fila_final.get(dept, 0) for dept in DEPARTAMENTOS}
+    }
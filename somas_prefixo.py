@@ -0,0 +1,151 @@
+"""Somas de prefixo diárias para KPIs de qualquer intervalo de datas.
+
+Para cada dia do período guarda as medidas aditivas de `cubo_olap`
+(contagens, tickets resolvidos, somas de satisfação e de tempo de
+resolução e suas contagens...) acumuladas desde o primeiro dia, no total
+e separadas por departamento e por canal. O total de um intervalo
+[início, fim] de uma série é `s[fim + 1] - s[início]`, então qualquer KPI
+sai em O(1) por série, sem reagregar tickets. Cada série tem um elemento
+a mais que o número de dias (começa em 0), e o índice de um dia é sua
+distância em dias para `inicio`, o que permite usar o mesmo arquivo no
+dashboard (`loadPrefixSums`/`queryPrefixSums` em lib/data-utils.ts). Os
+dias são os do período dos dados (`metadata.periodo_dados`), recebido como
+argumento.
+"""
+from datetime import date
+
+from cubo_olap import DERIVADAS, MEDIDAS, medidas_ticket
+from gerar_dados_dashboard import CANAIS, DEPARTAMENTOS, chave_dia, dias_do_periodo, periodo_de_metadata
+from serializacao_json import carregar_json, salvar_json
+
+# Dimensões com séries próprias (além da série "geral") e seus valores
+DIMENSOES = {
+    "departamento": list(DEPARTAMENTOS),
+    "canal": CANAIS
+}
+
+# Casas decimais das medidas não inteiras (somas de notas com 1 casa)
+DECIMAIS = {"soma_satisfacao": 1}
+
+def _como_data(valor):
+    """Data de um "AAAA-MM-DD" (ou data/hora ISO), date ou datetime"""
+    if isinstance(valor, str):
+        return date.fromisoformat(valor[:10])
+    return valor.date() if hasattr(valor, "date") else valor
+
+class AcumuladorDiario:
+    """Medidas por dia, no total e por departamento e canal, acumuladas lote a lote"""
+
+    def __init__(self):
+        # {(dimensão, valor): {dia: medidas}}, com ("geral", None) para o total
+        self.diarios = {}
+
+    def acumular(self, tickets):
+        diarios = self.diarios
+        for t in tickets:
+            dia = chave_dia(t)
+            contribuicao = medidas_ticket(t)
+            for grupo in (("geral", None), ("departamento", t["departamento"]), ("canal", t["canal"])):
+                por_dia = diarios.setdefault(grupo, {})
+                medidas = por_dia.get(dia)
+                if medidas is None:
+                    por_dia[dia] = list(contribuicao)
+                else:
+                    for i, valor in enumerate(contribuicao):
+                        medidas[i] += valor
+
+    def somas_prefixo(self, periodo):
+        """Estrutura gravada para o período (início, fim): medidas e séries acumuladas de cada grupo"""
+        dias = [d.strftime('%Y-%m-%d') for d in dias_do_periodo(periodo)]
+        vazio = [0] * len(MEDIDAS)
+
+        def series(grupo):
+            por_dia = self.diarios.get(grupo, {})
+            acumulado = [0] * len(MEDIDAS)
+            colunas = [[0] for _ in MEDIDAS]
+            for dia in dias:
+                for i, valor in enumerate(por_dia.get(dia, vazio)):
+                    acumulado[i] += valor
+                    colunas[i].append(acumulado[i])
+            resultado = dict(zip(MEDIDAS, colunas))
+            for medida, casas in DECIMAIS.items():
+                resultado[medida] = [round(v, casas) for v in resultado[medida]]
+            return resultado
+
+        return {
+            "inicio": dias[0],
+            "fim": dias[-1],
+            "dias": len(dias),
+            "medidas": MEDIDAS,
+            "derivadas": DERIVADAS,
+            "series": {
+                "geral": series(("geral", None)),
+                **{dim: {valor: series((dim, valor)) for valor in valores}
+                   for dim, valores in DIMENSOES.items()}
+            }
+        }
+
+def calcular_somas_prefixo(tickets, periodo):
+    """Somas de prefixo diárias de uma lista (ou iterável) de tickets no período (início, fim)"""
+    acumulador = AcumuladorDiario()
+    acumulador.acumular(tickets)
+    return acumulador.somas_prefixo(periodo)
+
+class SomasPrefixo:
+    """Consultas O(1) de KPIs por intervalo de datas sobre as somas de prefixo"""
+
+    def __init__(self, dados):
+        self.dados = dados
+        self.inicio = date.fromisoformat(dados["inicio"])
+        self.n_dias = dados["dias"]
+
+    @classmethod
+    def carregar(cls, caminho):
+        return cls(carregar_json(caminho))
+
+    def _posicao(self, dia, deslocamento=0):
+        """Posição de `dia` (mais `deslocamento` dias) nas séries, limitada ao período"""
+        return min(max((_como_data(dia) - self.inicio).days + deslocamento, 0), self.n_dias)
+
+    def series(self, departamento=None, canal=None):
+        """Séries acumuladas do total, de um departamento ou de um canal ({medida: lista})"""
+        if departamento is not None and canal is not None:
+            raise ValueError("as somas de prefixo separam departamento e canal; filtre por um deles")
+        if departamento is not None:
+            return self.dados["series"]["departamento"][departamento]
+        if canal is not None:
+            return self.dados["series"]["canal"][canal]
+        return self.dados["series"]["geral"]
+
+    def consultar(self, inicio=None, fim=None, departamento=None, canal=None):
+        """Medidas e KPIs derivados de [inicio, fim] (inclusive; padrão: período inteiro)
+
+        `inicio` e `fim` são "AAAA-MM-DD", date ou datetime; datas fora do
+        período são limitadas a ele. Devolve {medida: valor} com as mesmas
+        medidas e derivadas de `cubo_olap.consultar_cubo`.
+        """
+        series = self.series(departamento, canal)
+        a = 0 if inicio is None else self._posicao(inicio)
+        b = max(a, self.n_dias if fim is None else self._posicao(fim, 1))
+        medidas = {}
+        for medida in self.dados["medidas"]:
+            serie = series[medida]
+            valor = serie[b] - serie[a]
+            medidas[medida] = round(valor, DECIMAIS[medida]) if medida in DECIMAIS else valor
+        for nome, (numerador, denominador, fator) in self.dados["derivadas"].items():
+            medidas[nome] = (round(medidas[numerador] / medidas[denominador] * fator, 2)
+                             if medidas[denominador] else 0)
+        return medidas
+
+class EscritorSomasPrefixo:
+    """Saída adicional do gerador: somas de prefixo diárias para filtros de período"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._acumulador = AcumuladorDiario()
+
+    def escrever_lote(self, tickets):
+        self._acumulador.acumular(tickets)
+
+    def finalizar(self, agentes, metricas, metadata, configuracao):
+        salvar_json(self._acumulador.somas_prefixo(periodo_de_metadata(metadata)), self.caminho)
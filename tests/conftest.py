@@ -0,0 +1,50 @@
+"""Configuração comum dos testes: módulos da raiz no path e um dataset pequeno com semente fixa"""
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import gerar_dados_dashboard as gerador  # noqa: E402
+from serializacao_json import carregar_json  # noqa: E402
+
+# Escala dos datasets de teste: poucos dias, tickets e agentes
+ESCALA_TESTE = {"dias": 20, "tickets_por_dia": 60, "agentes": 12}
+
+@pytest.fixture
+def escala():
+    """Escala do gerador para ESCALA_TESTE"""
+    return gerador.definir_escala(**ESCALA_TESTE)
+
+@pytest.fixture
+def dados(escala):
+    """Agentes e tickets gerados com a semente padrão na escala de teste"""
+    random.seed(gerador.SEMENTE_PADRAO)
+    gerador.fake.seed_instance(gerador.SEMENTE_PADRAO)
+    agentes = gerador.gerar_agentes(escala)
+    textos = gerador.novo_pool_textos(gerador.fake, tamanho=50)
+    return agentes, gerador.gerar_tickets(agentes, semente=gerador.SEMENTE_PADRAO, textos=textos, escala=escala)
+
+@pytest.fixture
+def gerar_dataset(tmp_path):
+    """Gera um dataset na escala de teste com o gerador e devolve (diretório, dados do JSON)
+
+    `gerar_dataset(*opcoes, nome="dados", script=False)`: `opcoes` vão para a
+    linha de comando do gerador, `nome` é o subdiretório de `tmp_path` e,
+    com `script`, o gerador roda como script em um processo próprio.
+    """
+    def gerar(*opcoes, nome="dados", script=False):
+        diretorio = str(tmp_path / nome)
+        argv = ["--diretorio-saida", diretorio, "--json-compacto", "--tamanho-pool", "50",
+                *(f"--{k.replace('_', '-')}={v}" for k, v in ESCALA_TESTE.items()), *opcoes]
+        if script:
+            subprocess.run([sys.executable, os.path.join(RAIZ, "gerar_dados_dashboard.py"), *argv],
+                           check=True, capture_output=True)
+        else:
+            gerador.main(argv)
+        return diretorio, carregar_json(gerador.definir_diretorio_saida(diretorio).arquivo)
+    return gerar
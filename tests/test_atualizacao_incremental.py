@@ -0,0 +1,29 @@
+"""Estado incremental: período dos dados e tickets fora dele"""
+import atualizacao_incremental
+import gerar_dados_dashboard as gerador
+from serializacao_json import salvar_json
+
+def test_periodo_dos_dados_e_ticket_fora_dele(gerar_dataset, tmp_path):
+    # Dados em um período diferente do padrão: o estado usa o dos dados
+    diretorio, dados = gerar_dataset()
+    atualizacao_incremental.main(["--diretorio-saida", diretorio, "--inicializar"])
+    caminho = atualizacao_incremental.caminho_estado(gerador.definir_diretorio_saida(diretorio).arquivo)
+
+    estado = atualizacao_incremental.EstadoIncremental(caminho)
+    assert estado.periodo == gerador.periodo_de_metadata(dados["metadata"])
+    metricas = estado.metricas()
+    estado.fechar()
+    for secao in ("metricas_agentes", "metricas_departamentos", "dados_volume"):
+        assert metricas[secao] == dados[secao], secao
+
+    novo = dict(dados["tickets"][0], id="TK-DELTA", data_criacao="2024-09-03T10:00:00")
+    lote = str(tmp_path / "lote.json")
+    salvar_json([novo], lote)
+    atualizacao_incremental.main(["--diretorio-saida", diretorio, lote])
+
+    estado = atualizacao_incremental.EstadoIncremental(caminho)
+    volume = estado.metricas()["dados_volume"]
+    assert estado.periodo[1].date().isoformat() == "2024-09-03"
+    estado.fechar()
+    assert volume["volume_diario"]["2024-09-03"]["total_tickets"] == 1
+    assert volume["volume_mensal"]["2024-09"]["total_tickets"] == 1
@@ -0,0 +1,21 @@
+"""Carga no banco sem perder colunas das métricas"""
+import json
+import sqlite3
+
+from carregar_banco import TABELAS, carregar_no_banco, registros_por_tabela
+
+def test_metricas_carregadas_com_todas_as_colunas(gerar_dataset):
+    _, dados = gerar_dataset()
+    con = sqlite3.connect(":memory:")
+    carregar_no_banco(con, "sqlite", dados)
+
+    registros = registros_por_tabela(dados)
+    for tabela in ("metricas_agentes", "metricas_departamentos", "volume_mensal"):
+        colunas = [nome for nome, _ in TABELAS[tabela]]
+        assert set(colunas) == set(registros[tabela][0]), tabela
+        linhas = con.execute(f"SELECT {', '.join(colunas)} FROM {tabela}").fetchall()
+        assert len(linhas) == len(registros[tabela])
+        carregado = dict(zip(colunas, linhas[0]))
+        for coluna in ("percentis_resolucao_minutos", "percentis_primeira_resposta_minutos"):
+            assert json.loads(carregado[coluna]) == registros[tabela][0][coluna], (tabela, coluna)
+    con.close()
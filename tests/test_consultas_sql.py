@@ -0,0 +1,12 @@
+"""Métricas por SQL iguais às do gerador, no período dos dados carregados"""
+from consultas_sql import ConsultasDashboard
+
+def test_metricas_iguais_as_do_gerador(gerar_dataset):
+    # Dados em um período diferente do padrão: as consultas usam o dos dados
+    _, dados = gerar_dataset()
+
+    consultas = ConsultasDashboard.de_dados(dados)
+    metricas = consultas.metricas()
+    consultas.fechar()
+    for secao, valor in metricas.items():
+        assert valor == dados[secao], secao
@@ -0,0 +1,21 @@
+"""Cubo OLAP consistente com os acumuladores do gerador"""
+import pytest
+
+import gerar_dados_dashboard as gerador
+from cubo_olap import DIMENSOES, MEDIDAS, CuboOLAP
+
+def test_celulas_somam_os_acumuladores(dados):
+    _, tickets = dados
+    cubo = CuboOLAP()
+    cubo.acumular(tickets)
+
+    por_departamento = {}
+    for (_, departamento, *_), medidas in cubo.celulas.items():
+        soma = por_departamento.setdefault(DIMENSOES["departamento"][departamento], [0] * len(MEDIDAS))
+        for i, valor in enumerate(medidas):
+            soma[i] += valor
+
+    grupos = gerador.agrupar_tickets(tickets, "departamento")
+    assert set(por_departamento) == set(grupos)
+    for departamento, acc in grupos.items():
+        assert por_departamento[departamento] == pytest.approx([acc[medida] for medida in MEDIDAS]), departamento
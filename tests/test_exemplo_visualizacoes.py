@@ -0,0 +1,49 @@
+"""Escolha da fonte de dados dos relatórios"""
+import os
+
+import pytest
+
+pytest.importorskip("plotly")
+
+import exemplo_visualizacoes  # noqa: E402
+from serializacao_json import salvar_json  # noqa: E402
+
+@pytest.fixture
+def fontes(tmp_path, monkeypatch):
+    """JSON único e layout por seções em um diretório temporário"""
+    arquivo = str(tmp_path / "dados.json")
+    secoes = str(tmp_path / "secoes")
+    monkeypatch.setattr(exemplo_visualizacoes, "ARQUIVO_DADOS", arquivo)
+    monkeypatch.setattr(exemplo_visualizacoes, "DIRETORIO_SECOES", secoes)
+    monkeypatch.setattr(exemplo_visualizacoes, "DIRETORIO_COLUNAR", str(tmp_path / "colunar"))
+    os.makedirs(secoes)
+    salvar_json({"metadata": {"origem": "json"}}, arquivo)
+    salvar_json({"origem": "secoes"}, os.path.join(secoes, "metadata.json"))
+    return arquivo, os.path.join(secoes, "metadata.json")
+
+def test_usa_secoes_gravadas_depois_do_json(fontes):
+    arquivo, metadata_secoes = fontes
+    os.utime(arquivo, (1000, 1000))
+    os.utime(metadata_secoes, (2000, 2000))
+    assert exemplo_visualizacoes.abrir_dados()["metadata"] == {"origem": "secoes"}
+
+def test_ignora_secoes_de_execucao_anterior(fontes):
+    arquivo, metadata_secoes = fontes
+    os.utime(metadata_secoes, (1000, 1000))
+    os.utime(arquivo, (2000, 2000))
+    assert exemplo_visualizacoes.abrir_dados()["metadata"] == {"origem": "json"}
+
+def test_colunar_completo_igual_ao_json(gerar_dataset):
+    pytest.importorskip("pyarrow")
+    diretorio, dados = gerar_dataset("--colunar", "parquet")
+    colunar = os.path.join(diretorio, os.path.basename(exemplo_visualizacoes.DIRETORIO_COLUNAR))
+
+    completos = exemplo_visualizacoes.carregar_dados_colunares(colunar, colunas=None)
+    for secao in ("metricas_agentes", "metricas_departamentos", "dados_volume", "resumo_geral"):
+        assert completos[secao] == dados[secao], secao
+    assert [a["nome"] for a in completos["agentes"]] == [a["nome"] for a in dados["agentes"]]
+
+    parciais = exemplo_visualizacoes.carregar_dados_colunares(colunar)
+    assert parciais["dados_volume"]["volume_semanal"] == dados["dados_volume"]["volume_semanal"]
+    with pytest.raises(KeyError, match="colunas=None"):
+        parciais["agentes"][0]["nome"]
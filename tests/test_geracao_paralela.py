@@ -0,0 +1,18 @@
+"""Mesmos tickets com qualquer número de processos"""
+import random
+
+import gerar_dados_dashboard as gerador
+
+def _tickets(agentes, workers, escala, renovacao=0):
+    gerador.fake.seed_instance(gerador.SEMENTE_PADRAO)
+    textos = gerador.novo_pool_textos(gerador.fake, tamanho=50, renovacao_dia=renovacao)
+    return gerador.gerar_tickets(agentes, workers, gerador.SEMENTE_PADRAO, textos, escala=escala)
+
+def test_sequencial_igual_ao_paralelo(escala):
+    random.seed(gerador.SEMENTE_PADRAO)
+    agentes = gerador.gerar_agentes(escala)
+    for renovacao in (0, 5):
+        sequencial = _tickets(agentes, 0, escala, renovacao)
+        assert sequencial
+        for workers in (1, 3):
+            assert _tickets(agentes, workers, escala, renovacao) == sequencial
@@ -0,0 +1,27 @@
+"""Validação das opções de linha de comando do gerador"""
+import pytest
+
+import gerar_dados_dashboard as gerador
+
+@pytest.mark.parametrize("opcoes", [
+    ["--profile-etapa", "3"], ["--profile-etapa", "2b", "--simulacao"],
+    ["--streaming", "--profile-etapa", "2-5"], ["--streaming", "--profile-etapa", "1"]
+])
+def test_profile_etapa_valida(opcoes):
+    assert gerador.parse_args(["--profile", *opcoes]).profile_etapa == opcoes[opcoes.index("--profile-etapa") + 1]
+
+@pytest.mark.parametrize("opcoes", [
+    ["--profile-etapa", "8"], ["--profile-etapa", "2-5"], ["--profile-etapa", "2b"],
+    ["--streaming", "--profile-etapa", "3"]
+])
+def test_profile_etapa_invalida(opcoes, capsys):
+    with pytest.raises(SystemExit):
+        gerador.parse_args(["--profile", *opcoes])
+    assert "--profile-etapa" in capsys.readouterr().err
+
+def test_ao_menos_um_agente_ativo(tmp_path):
+    # Com a semente 8, o único agente é sorteado inativo
+    execucao = gerador.main(["--agentes", "1", "--dias", "5", "--semente", "8",
+                             "--tamanho-pool", "50", "--diretorio-saida", str(tmp_path)])
+    assert execucao["agentes"] == 1
+    assert execucao["tickets"] > 0
@@ -0,0 +1,39 @@
+"""Agregações lineares: o trabalho por ticket não cresce com agentes nem com dias
+
+Conta as leituras de campos dos tickets em vez de medir tempo: uma agregação
+que percorresse os tickets uma vez por agente (ou por dia do período) faria
+mais leituras a cada agente ou dia acrescentado, mesmo sem tickets novos.
+"""
+import gerar_dados_dashboard as gerador
+from conftest import ESCALA_TESTE
+
+class TicketContado(dict):
+    """Ticket que conta as leituras `t[campo]` de todos os tickets"""
+    leituras = 0
+
+    def __getitem__(self, campo):
+        TicketContado.leituras += 1
+        return super().__getitem__(campo)
+
+def _leituras(funcao, *args):
+    TicketContado.leituras = 0
+    funcao(*args)
+    return TicketContado.leituras
+
+def test_metricas_agentes_nao_percorrem_tickets_por_agente(dados):
+    agentes, tickets = dados
+    tickets = [TicketContado(t) for t in tickets]
+    # Agentes sem tickets: só o trabalho por agente pode crescer
+    fantasmas = [dict(a, id=f"{a['id']}-F{i}") for i in range(4) for a in agentes]
+
+    leituras = _leituras(gerador.calcular_metricas_agentes, agentes, tickets)
+    assert _leituras(gerador.calcular_metricas_agentes, agentes + fantasmas, tickets) == leituras
+
+def test_volume_temporal_nao_percorre_tickets_por_dia(dados, escala):
+    _, tickets = dados
+    tickets = [TicketContado(t) for t in tickets]
+
+    leituras = _leituras(gerador.gerar_dados_volume_temporal, tickets, None, escala.periodo)
+    # Mesmo conjunto de tickets em um período 4 vezes maior (dias extras vazios)
+    periodo_longo = gerador.definir_escala(dias=ESCALA_TESTE["dias"] * 4).periodo
+    assert _leituras(gerador.gerar_dados_volume_temporal, tickets, None, periodo_longo) == leituras
@@ -0,0 +1,39 @@
+"""Paridade do backend pandas com o caminho puro-Python"""
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+import gerar_dados_dashboard as gerador  # noqa: E402
+import metricas_colunares  # noqa: E402
+from tickets_compactos import TicketsCompactos  # noqa: E402
+
+# Seções comparadas entre as execuções com cada backend
+SECOES_METRICAS = ["metricas_agentes", "metricas_departamentos", "dados_volume", "resumo_geral"]
+
+def test_funcoes_equivalentes(dados, escala):
+    agentes, tickets = dados
+    colunas = metricas_colunares.carregar_colunas(tickets)
+    periodo = escala.periodo
+
+    assert (metricas_colunares.calcular_metricas_departamento(colunas, periodo)
+            == gerador.calcular_metricas_departamento(tickets, periodo))
+    assert (metricas_colunares.calcular_volume_mensal(colunas, periodo)
+            == gerador.calcular_volume_mensal(tickets, periodo))
+    assert (metricas_colunares.calcular_resumo_geral(colunas, agentes)
+            == gerador.calcular_resumo_geral(agentes, tickets))
+
+def test_colunas_iguais_com_tickets_compactos(dados):
+    _, tickets = dados
+    pd.testing.assert_frame_equal(metricas_colunares.carregar_colunas(TicketsCompactos.de_tickets(tickets)),
+                                  metricas_colunares.carregar_colunas(tickets))
+
+@pytest.mark.parametrize("script", [False, True], ids=["main", "script"])
+def test_saida_do_gerador_igual_nos_dois_backends(gerar_dataset, script):
+    # Como script, o gerador roda como __main__ e metricas_colunares importa o módulo de novo
+    secoes = {}
+    for backend in ("python", "pandas"):
+        _, dados = gerar_dataset("--backend", backend, nome=backend, script=script)
+        secoes[backend] = {secao: dados[secao] for secao in SECOES_METRICAS}
+
+    for secao in SECOES_METRICAS:
+        assert secoes["pandas"][secao] == secoes["python"][secao], secao
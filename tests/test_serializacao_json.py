@@ -0,0 +1,13 @@
+"""Leitura de NDJSON, simples e acompanhando o arquivo"""
+import pytest
+
+from serializacao_json import abrir, ler_ndjson
+
+def test_ndjson_comprimido(tmp_path):
+    caminho = str(tmp_path / "tickets.ndjson.gz")
+    with abrir(caminho, "wt") as f:
+        f.write('{"id": 1}\n{"id": 2}\n')
+
+    assert list(ler_ndjson(caminho)) == [{"id": 1}, {"id": 2}]
+    with pytest.raises(ValueError, match="comprimido"):
+        ler_ndjson(caminho, seguir=True)
@@ -0,0 +1,16 @@
+"""Validação dos jobs do serviço de geração"""
+import pytest
+
+from servico_geracao import executar_job, preparar_job
+
+@pytest.mark.parametrize("opcoes", [["--semente=1"], ["--diretorio-saida", "outro"]])
+def test_opcoes_reservadas_recusadas(opcoes):
+    with pytest.raises(ValueError, match="campos do job"):
+        preparar_job({"opcoes": opcoes}, 1, "datasets")
+
+@pytest.mark.parametrize("opcoes", [["--semen", "1"], ["--diretorio", "outro"]])
+def test_abreviacoes_nao_contornam_as_reservadas(opcoes, tmp_path):
+    opcoes = [str(tmp_path / o) if o == "outro" else o for o in opcoes]
+    job = preparar_job({"opcoes": opcoes}, 1, str(tmp_path))
+    assert executar_job(job)["status"] == "erro"
+    assert not (tmp_path / "outro").exists()
@@ -0,0 +1,17 @@
+"""Simulação de eventos restrita ao período recebido"""
+from datetime import timedelta
+
+from serializacao_json import ler_ndjson
+from simulacao_eventos import simular_ciclo_de_vida
+
+def test_eventos_dentro_do_periodo(dados, escala, tmp_path):
+    agentes, tickets = dados
+    # Período da escala de teste, mais curto que o padrão: a simulação usa o recebido
+    periodo = escala.periodo
+
+    arquivo = str(tmp_path / "eventos.ndjson")
+    simular_ciclo_de_vida(agentes, tickets, periodo, arquivo_eventos=arquivo)
+    datas = [evento["data"] for evento in ler_ndjson(arquivo)]
+
+    assert datas
+    assert max(datas) < (periodo[1] + timedelta(days=1)).isoformat()
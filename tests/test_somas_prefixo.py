@@ -0,0 +1,20 @@
+"""Somas de prefixo no período dos dados"""
+import gerar_dados_dashboard as gerador
+from serializacao_json import carregar_json
+from somas_prefixo import EscritorSomasPrefixo, SomasPrefixo
+
+def test_periodo_vem_do_metadata(dados, escala, tmp_path):
+    agentes, tickets = dados
+    # Período da escala de teste, diferente do padrão: o arquivo segue o dos dados
+    metadata = gerador.montar_metadata(agentes, len(tickets), escala.periodo)
+
+    caminho = str(tmp_path / "somas.json")
+    escritor = EscritorSomasPrefixo(caminho)
+    escritor.escrever_lote(tickets)
+    escritor.finalizar(agentes, {}, metadata, {})
+
+    somas = carregar_json(caminho)
+    inicio, fim = gerador.periodo_de_metadata(metadata)
+    assert (somas["inicio"], somas["fim"]) == (inicio.strftime("%Y-%m-%d"), fim.strftime("%Y-%m-%d"))
+    assert somas["dias"] == len(list(gerador.dias_do_periodo((inicio, fim))))
+    assert SomasPrefixo(somas).consultar()["total_tickets"] == len(tickets)
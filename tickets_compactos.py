@@ -0,0 +1,217 @@
+"""Armazenamento compacto dos tickets em colunas tipadas.
+
+Cada ticket gerado é um dict de 25 chaves com strings repetidas
+(departamento, agente, status, canal...) e uma lista de tags. Aqui os
+tickets ficam em arrays da biblioteca padrão, um por campo:
+
+- campos textuais viram códigos de categoria (array de 1, 2 ou 4 bytes,
+  alargado automaticamente conforme o vocabulário cresce);
+- datas ISO viram segundos desde 1970 (inteiro de 8 bytes);
+- inteiros, floats e booleanos opcionais usam sentinelas para None;
+- as tags viram um código da combinação (em ordem), com a máscara de bits
+  de cada combinação em uma tabela à parte;
+- `id` é derivado de `numero_ticket` ("TKT000123").
+
+Os dicts no formato original só são montados ao ler (`store[i]`, iteração
+ou `blocos()`), então o restante do pipeline continua recebendo tickets
+como antes.
+"""
+import math
+import sys
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+
+# Campos do ticket, na ordem do gerador, e como cada um é armazenado
+COLUNAS = {
+    "id": "id",
+    "numero_ticket": "inteiro",
+    "titulo": "categoria",
+    "descricao": "categoria",
+    "tipo": "categoria",
+    "categoria": "categoria",
+    "subcategoria": "categoria",
+    "prioridade": "categoria",
+    "status": "categoria",
+    "canal": "categoria",
+    "cliente_id": "categoria",
+    "cliente_nome": "categoria",
+    "agente_id": "categoria",
+    "agente_nome": "categoria",
+    "departamento": "categoria",
+    "data_criacao": "data",
+    "data_primeira_resposta": "data",
+    "data_resolucao": "data",
+    "tempo_resolucao_minutos": "inteiro",
+    "tempo_primeira_resposta_minutos": "inteiro",
+    "satisfacao_cliente": "real",
+    "tags": "tags",
+    "interacoes": "inteiro",
+    "reaberto": "booleano",
+    "sla_cumprido": "booleano"
+}
+
+# Tipo do array de cada forma de armazenamento (categorias começam em 1 byte)
+TIPOS_ARRAY = {"inteiro": "q", "data": "q", "real": "d", "booleano": "b", "categoria": "B", "tags": "B"}
+
+# Tipos dos códigos de categoria, do menor ao maior, e quantos valores cada um comporta
+ALARGAMENTOS = (("B", 2 ** 8), ("H", 2 ** 16), ("L", 2 ** 32))
+
+# Sentinelas de None nos arrays numéricos
+NULO_INTEIRO = -2 ** 63
+NULO_BOOLEANO = -1
+
+EPOCA = datetime(1970, 1, 1)
+UM_SEGUNDO = timedelta(seconds=1)
+
+# Tickets decodificados por vez ao iterar (limita os dicts vivos ao mesmo tempo)
+TAMANHO_BLOCO = 1000
+
+# Campos de cada forma de armazenamento
+CAMPOS_POR_TIPO = {tipo: tuple(c for c, t in COLUNAS.items() if t == tipo) for tipo in set(COLUNAS.values())}
+
+def _formatar_id(numero):
+    return f"TKT{numero:06d}"
+
+class TicketsCompactos(Sequence):
+    """Sequência de tickets guardada em arrays tipados, convertida em dicts sob demanda"""
+
+    __slots__ = ("colunas", "valores", "codigos", "mascaras_tags", "_bits_tags")
+
+    def __init__(self):
+        self.colunas = {campo: array(TIPOS_ARRAY[tipo]) for campo, tipo in COLUNAS.items() if tipo != "id"}
+        # Vocabulário de cada campo categórico: código -> valor e valor -> código
+        self.valores = {campo: [] for campo, tipo in COLUNAS.items() if tipo in ("categoria", "tags")}
+        self.codigos = {campo: {} for campo in self.valores}
+        # Máscara de bits de cada combinação de tags e bit de cada tag
+        self.mascaras_tags = []
+        self._bits_tags = {}
+
+    @classmethod
+    def de_tickets(cls, tickets):
+        """Cria o armazenamento a partir de um iterável de tickets (dicts)"""
+        compactos = cls()
+        compactos.estender(tickets)
+        return compactos
+
+    def _codigo(self, campo, valor):
+        codigos = self.codigos[campo]
+        codigo = codigos.get(valor)
+        if codigo is None:
+            codigo = codigos[valor] = len(self.valores[campo])
+            self.valores[campo].append(valor)
+            coluna = self.colunas[campo]
+            for tipo, limite in ALARGAMENTOS:
+                if codigo < limite:
+                    break
+            if coluna.typecode != tipo:
+                self.colunas[campo] = array(tipo, coluna)
+            if campo == "tags":
+                self.mascaras_tags.append(sum(1 << self._bits_tags.setdefault(tag, len(self._bits_tags))
+                                              for tag in valor))
+        return codigo
+
+    def adicionar(self, t):
+        """Acrescenta um ticket"""
+        if t["id"] != _formatar_id(t["numero_ticket"]):
+            raise ValueError(f"id {t['id']!r} não corresponde ao numero_ticket {t['numero_ticket']}")
+        colunas = self.colunas
+        for campo in CAMPOS_POR_TIPO["categoria"]:
+            codigo = self.codigos[campo].get(t[campo])
+            if codigo is None:
+                codigo = self._codigo(campo, t[campo])
+            colunas[campo].append(codigo)
+        codigo = self._codigo("tags", tuple(t["tags"]))
+        colunas["tags"].append(codigo)
+        for campo in CAMPOS_POR_TIPO["data"]:
+            valor = t[campo]
+            colunas[campo].append(NULO_INTEIRO if valor is None else
+                                  (datetime.fromisoformat(valor) - EPOCA) // UM_SEGUNDO)
+        for campo in CAMPOS_POR_TIPO["inteiro"]:
+            valor = t[campo]
+            colunas[campo].append(NULO_INTEIRO if valor is None else valor)
+        for campo in CAMPOS_POR_TIPO["real"]:
+            valor = t[campo]
+            colunas[campo].append(math.nan if valor is None else valor)
+        for campo in CAMPOS_POR_TIPO["booleano"]:
+            valor = t[campo]
+            colunas[campo].append(NULO_BOOLEANO if valor is None else valor)
+
+    def estender(self, tickets):
+        for t in tickets:
+            self.adicionar(t)
+
+    def __len__(self):
+        return len(self.colunas["numero_ticket"])
+
+    def _decodificar(self, campo, valores):
+        """Converte os valores armazenados de um campo de volta ao formato original"""
+        tipo = COLUNAS[campo]
+        if tipo == "id":
+            return [_formatar_id(n) for n in valores]
+        if tipo == "categoria":
+            vocabulario = self.valores[campo]
+            return [vocabulario[c] for c in valores]
+        if tipo == "tags":
+            vocabulario = self.valores[campo]
+            return [list(vocabulario[c]) for c in valores]
+        if tipo == "data":
+            return [None if s == NULO_INTEIRO else (EPOCA + s * UM_SEGUNDO).isoformat() for s in valores]
+        if tipo == "inteiro":
+            return [None if v == NULO_INTEIRO else v for v in valores]
+        if tipo == "real":
+            return [None if math.isnan(v) else v for v in valores]
+        return [None if v == NULO_BOOLEANO else bool(v) for v in valores]
+
+    def _intervalo(self, inicio, fim):
+        """Tickets de `inicio` a `fim` (exclusive) como lista de dicts"""
+        colunas = [
+            self._decodificar(campo, self.colunas["numero_ticket" if tipo == "id" else campo][inicio:fim])
+            for campo, tipo in COLUNAS.items()
+        ]
+        campos = list(COLUNAS)
+        return [dict(zip(campos, linha)) for linha in zip(*colunas)]
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fim, passo = indice.indices(len(self))
+            if passo != 1:
+                return [self[i] for i in range(inicio, fim, passo)]
+            return self._intervalo(inicio, fim)
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice de ticket fora do intervalo")
+        return self._intervalo(indice, indice + 1)[0]
+
+    def blocos(self, tamanho=TAMANHO_BLOCO):
+        """Itera os tickets em listas de até `tamanho` dicts"""
+        for inicio in range(0, len(self), tamanho):
+            yield self._intervalo(inicio, inicio + tamanho)
+
+    def __iter__(self):
+        for bloco in self.blocos():
+            yield from bloco
+
+    def coluna(self, campo):
+        """Valores de um campo em todos os tickets, no formato original, sem montar os dicts"""
+        return self._decodificar(campo, self.colunas["numero_ticket" if COLUNAS[campo] == "id" else campo])
+
+    def mascara_tags(self, indice):
+        """Máscara de bits das tags do ticket (bit de cada tag em `bits_tags()`)"""
+        return self.mascaras_tags[self.colunas["tags"][indice]]
+
+    def bits_tags(self):
+        """Posição do bit de cada tag já vista ({tag: bit})"""
+        return dict(self._bits_tags)
+
+    def tamanho_bytes(self):
+        """Memória ocupada pelos arrays e vocabulários, em bytes"""
+        total = sum(sys.getsizeof(coluna) for coluna in self.colunas.values())
+        for campo, valores in self.valores.items():
+            total += sys.getsizeof(valores) + sys.getsizeof(self.codigos[campo])
+            total += sum(sys.getsizeof(v) for v in valores)
+        return total + sys.getsizeof(self.mascaras_tags)
+
+    def bytes_por_ticket(self):
+        return self.tamanho_bytes() / len(self) if len(self) else 0